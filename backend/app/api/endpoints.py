@@ -1,41 +1,380 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse, Response, PlainTextResponse, JSONResponse
+from pydantic import ValidationError
+from bisect import bisect_right
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from app.models.schemas import (
     FullAnalysisRequest, 
     FullAnalysisResponse, 
+    FullAnalysisBatchItem,
+    FullAnalysisBatchResponse,
     DemoResponse,
+    MatchRequest,
+    MatchResponse,
     StoreQueryRequest,
     Scheme,
+    SchemeMatch,
     ProfileData
 )
-from app.services.profile_extraction import extract_profile, generate_profile_summary
-from app.services.scheme_matching import match_schemes
-from app.services.benefits_summary import generate_benefits_summary, generate_speakable_text
+from app.services.profile_extraction import FILLER_RE, extract_profile, generate_profile_summary, normalize_profile
+from app.services.query_scanner import canonical_query
+from app.services.scheme_matching import (
+    match_schemes, rematch_schemes, changed_factors, match_cache_key, get_catalog, catalog_registry,
+)
+from app.services.catalog_registry import CatalogSnapshot
+from app.core.config import settings
+from app.services.benefits_summary import generate_benefits_summary
 from app.db.supabase import supabase_client
+from app.db.query_log import query_log_writer, query_spool
+from app.core.metrics import (
+    render_prometheus,
+    REQUESTS_BY_LANGUAGE,
+    REQUESTS_BY_SOURCE,
+    EXTRACT_LATENCY,
+    MATCH_LATENCY,
+    BENEFITS_LATENCY,
+    VALIDATION_LATENCY,
+    SERIALIZATION_LATENCY
+)
+from app.core.singleflight import SingleFlight
+from app.core.cache import LRUCache
+from app.services import profile_extraction
+import json
 import uuid
 import time
 from datetime import datetime
-from app.services.scheme_matching import _DB_STATUS, _CACHED_SCHEMES
+from app.services.scheme_matching import get_factor_cache_stats, get_match_cache_stats
 
 router = APIRouter()
 
+ENGINE_DATA_SOURCE = "Government scheme database and eligibility engine"
+UNKNOWN_PROFILE_SUMMARY = "We need more information about your occupation."
+FOLLOW_UP_QUESTION = "Are you a student, farmer, business owner, or senior citizen?"
+
+# Shared by all batch requests, so concurrent batches stay within BATCH_MAX_WORKERS threads
+_batch_executor = ThreadPoolExecutor(max_workers=settings.BATCH_MAX_WORKERS, thread_name_prefix="batch-analysis")
+
+# Identical /full-analysis requests that arrive while one is being computed share its result
+_analysis_flight = SingleFlight()
+
+# Serialized /full-analysis bodies, split around processing_time_ms: (before, after, schemes for logging)
+_RESPONSE_CACHE = LRUCache(settings.RESPONSE_CACHE_SIZE)
+catalog_registry.on_swap(lambda snapshot: _RESPONSE_CACHE.clear())
+_TIME_FIELD = b'"processing_time_ms":'
+
+# Benefits summaries keyed by catalog version and the (name, confidence) of each matched scheme
+_SUMMARY_CACHE = LRUCache(settings.SUMMARY_CACHE_SIZE)
+catalog_registry.on_swap(lambda snapshot: _SUMMARY_CACHE.clear())
+
+SPEAKABLE_TEMPLATES = {
+    "en": "Based on your profile, I found {count} government schemes you may be eligible for.",
+    "hi": "आपकी प्रोफ़ाइल के आधार पर, मुझे {count} सरकारी योजनाएं मिली हैं जिनके लिए आप पात्र हो सकते हैं।",
+    "ta": "உங்கள் சுயவிவரத்தின் அடிப்படையில், நீங்கள் தகுதிபெறக்கூடிய {count} அரசுத் திட்டங்களை நான் கண்டறிந்துள்ளேன்.",
+    "te": "మీ ప్రొఫైల్ ఆధారంగా, మీరు అర్హత సాధించే {count} ప్రభుత్వ పథకాలను నేను కనుగొన్నాను.",
+}
+UNKNOWN_PROFILE_SPEAKABLE = "I couldn't find exact matches yet. Please tell me about your situation so I can help, or are you a student, farmer, business owner, or senior citizen?"
+
 @router.get("/health")
 def root():
     return {
         "status": "ok",
-        "database": _DB_STATUS,
-        "cache_loaded": len(_CACHED_SCHEMES) > 0,
+        "database": catalog_registry.status,
+        "cache_loaded": len(catalog_registry.current().schemes) > 0,
+        "catalog": catalog_registry.stats(),
+        "match_cache": get_match_cache_stats(),
+        "factor_cache": get_factor_cache_stats(),
+        "extraction_cache": profile_extraction.get_extraction_cache_stats(),
+        "query_log": query_log_writer.stats(),
         "timestamp": datetime.utcnow().isoformat()
     }
 
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, request counters and cache sizes."""
+    match_cache = get_match_cache_stats()
+    factor_cache = get_factor_cache_stats()
+    extraction_cache = profile_extraction.get_extraction_cache_stats()
+    coalescing = _analysis_flight.stats()
+    response_cache = _RESPONSE_CACHE.stats()
+    summary_cache = _SUMMARY_CACHE.stats()
+    catalog = catalog_registry.current()
+    gauges = {
+        "vaanisetu_cache_entries": ("cache", {
+            "profile_extraction": extraction_cache["size"],
+            "match_schemes": match_cache["size"],
+            "match_factors": factor_cache["size"],
+            "full_analysis_responses": response_cache["size"],
+            "benefits_summaries": summary_cache["size"],
+            "scheme_candidates": catalog.index.cache_info().currsize,
+            "occupation_keywords": profile_extraction.OCCUPATION_INDEX.lookup.cache_info().currsize,
+            "category_keywords": profile_extraction.CATEGORY_INDEX.lookup.cache_info().currsize,
+            "state_keywords": profile_extraction.STATE_INDEX.lookup.cache_info().currsize,
+        }),
+        "vaanisetu_cache_hit_ratio": ("cache", {
+            "profile_extraction": extraction_cache["hit_ratio"],
+            "match_schemes": match_cache["hit_ratio"],
+            "match_factors": factor_cache["hit_ratio"],
+            "full_analysis_responses": response_cache["hit_ratio"],
+            "benefits_summaries": summary_cache["hit_ratio"],
+        }),
+        "vaanisetu_spelling_table_tokens": ("index", {name: len(index.table) for name, index in profile_extraction.INDEXES.items()}),
+        "vaanisetu_coalesced_hit_ratio": coalescing["hit_ratio"],
+        "vaanisetu_coalesced_in_flight": coalescing["in_flight"],
+        "vaanisetu_catalog_schemes": len(catalog.schemes),
+        "vaanisetu_catalog_version": catalog.version,
+        "vaanisetu_query_log_queue_depth": query_log_writer.stats()["queue_depth"],
+    }
+    counters = {
+        "vaanisetu_coalesced_requests_total": ("role", {"leader": coalescing["leaders"], "follower": coalescing["followers"]}),
+    }
+    return PlainTextResponse(render_prometheus(gauges, counters), media_type="text/plain; version=0.0.4")
+
+# catalog version -> (ids, rows, full JSON body) for /schemes, rebuilt when the version changes
+_scheme_listings: Dict[int, Tuple[List[str], List[Dict[str, Any]], bytes]] = {}
+
+def _scheme_listing(catalog: CatalogSnapshot) -> Tuple[List[str], List[Dict[str, Any]], bytes]:
+    """Catalog rows shaped as Scheme and sorted by id, which is the pagination key."""
+    listing = _scheme_listings.get(catalog.version)
+    if listing is None:
+        rows = []
+        for raw in catalog.raw:
+            try:
+                rows.append(Scheme.model_validate(raw).model_dump(mode="json"))
+            except ValidationError as e:
+                print(f"Skipping invalid scheme {raw.get('name')!r} in /schemes: {e}")
+        rows.sort(key=lambda row: row["id"])
+        body = json.dumps(rows, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        listing = ([row["id"] for row in rows], rows, body)
+        _scheme_listings.clear()
+        _scheme_listings[catalog.version] = listing
+    return listing
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
 @router.get("/schemes", response_model=List[Scheme])
-def get_schemes():
-    """Returns scheme list from Supabase."""
-    try:
-        response = supabase_client.table("schemes").select("*").execute()
-        return response.data
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def get_schemes(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    fields: Optional[str] = None
+):
+    """
+    Returns the scheme list from the in-memory catalog, ordered by id.
+    The ETag changes only when the catalog content does; send it back in If-None-Match
+    to get an empty 304. With `limit`, the next page starts after the id given in
+    `cursor`, and is advertised in the Link / X-Next-Cursor headers. `fields` is a
+    comma separated projection (id is always included).
+    """
+    catalog = get_catalog()
+    etag = f'"{catalog.content_hash[:20]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+        
+    ids, rows, body = _scheme_listing(catalog)
+    if cursor is None and limit is None and fields is None:
+        return Response(content=body, media_type="application/json", headers=headers)
+        
+    start = bisect_right(ids, cursor) if cursor else 0
+    end = start + limit if limit else len(rows)
+    page = rows[start:end]
+    if end < len(rows) and page:
+        next_cursor = page[-1]["id"]
+        headers["X-Next-Cursor"] = next_cursor
+        next_query = {"cursor": next_cursor, "limit": limit}
+        if fields:
+            next_query["fields"] = fields
+        headers["Link"] = f'<{request.url.replace_query_params(**next_query)}>; rel="next"'
+        
+    if fields:
+        wanted = ["id"] + [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+        unknown = [f for f in wanted if f not in Scheme.model_fields]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        page = [{f: row[f] for f in wanted} for row in page]
+    return JSONResponse(content=page, headers=headers)
+
+def _is_query_too_short(query: str) -> bool:
+    return not query or not query.strip() or len(query.strip()) < 3
+
+def _empty_query_response() -> FullAnalysisResponse:
+    # Never crash on empty query as per requirements, friendly fallback
+    return FullAnalysisResponse(
+        profile=ProfileData(),
+        profile_summary="We need a little more information.",
+        schemes=[],
+        benefits_summary="Please describe your situation so we can help.",
+        speakable_text="Please tell me about your situation so I can help.",
+        processing_time_ms=0,
+        data_source=ENGINE_DATA_SOURCE
+    )
+
+def _extract(request: FullAnalysisRequest) -> Dict[str, Any]:
+    started = time.perf_counter()
+    profile_dict = extract_profile(request.query)
+    EXTRACT_LATENCY.observe(time.perf_counter() - started)
+    if request.state_hint and not profile_dict.get("state"):
+        profile_dict["state"] = request.state_hint
+    return profile_dict
+
+def _match(profile_dict: Dict[str, Any], catalog: Optional[CatalogSnapshot] = None,
+           matcher: Callable[..., List[SchemeMatch]] = match_schemes):
+    """
+    Returns (schemes, is_unknown_profile). Unknown profiles are limited to 3 general
+    schemes with any High confidence hits downgraded.
+    """
+    started = time.perf_counter()
+    schemes = matcher(profile_dict, catalog)
+    MATCH_LATENCY.observe(time.perf_counter() - started)
+    
+    is_unknown_profile = profile_dict.get("occupation") == "unknown" and profile_dict.get("category") == "general"
+    if is_unknown_profile:
+        # Filter schemes down to max 3 general ones and downgrade any High confidence hits
+        filtered_schemes = []
+        for s in schemes:
+            if "general" in s.target_groups or s.scheme_type in ["general", "insurance"]:
+                if s.confidence == "High":
+                    s.confidence = "Medium"
+                    s.eligibilityScore = "medium"
+                filtered_schemes.append(s)
+            if len(filtered_schemes) >= 3:
+                break
+        schemes = filtered_schemes
+    return schemes, is_unknown_profile
+
+@lru_cache(maxsize=256)
+def _speakable_for(language: str, count: int, is_unknown_profile: bool) -> str:
+    if count == 0 or is_unknown_profile:
+        return UNKNOWN_PROFILE_SPEAKABLE
+    return SPEAKABLE_TEMPLATES.get(language, SPEAKABLE_TEMPLATES["en"]).format(count=count)
+
+def _speakable_text(language: str, schemes: List[SchemeMatch], is_unknown_profile: bool) -> str:
+    # Only the scheme count matters, so the text is memoized per (language, count)
+    return _speakable_for(language, len(schemes), is_unknown_profile)
+
+def _query_log_rows(query: str, profile_dict: Dict[str, Any], schemes: List[SchemeMatch]):
+    """Returns the user_queries row and its analysis_results rows."""
+    query_id = str(uuid.uuid4())
+    query_row = {
+        "id": query_id,
+        "query_text": query,
+        "detected_occupation": profile_dict.get("occupation"),
+        "detected_income": profile_dict.get("income"),
+        "detected_state": profile_dict.get("state"),
+        "detected_age": profile_dict.get("age"),
+    }
+    result_rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "query_id": query_id,
+            "scheme_name": s.name,
+            "score": s.score,
+            "reason": s.reason,
+        }
+        for s in schemes
+    ]
+    return query_row, result_rows
+
+def _log_query(query: str, profile_dict: Dict[str, Any], schemes: List[SchemeMatch]) -> None:
+    # Store query & results asynchronously (batched by the background query log writer,
+    # spooled to local disk while Supabase is unavailable)
+    query_log_writer.enqueue(*_query_log_rows(query, profile_dict, schemes))
+
+def _benefits_summary(schemes: List[SchemeMatch], catalog: CatalogSnapshot) -> str:
+    started = time.perf_counter()
+    # Within one catalog version a scheme's position fixes its name, benefit text and
+    # classification (names alone are not unique across Supabase rows)
+    positions = tuple(s._catalog_position for s in schemes)
+    key = (catalog.version, positions, tuple(s.confidence for s in schemes))
+    benefits = None if None in positions else _SUMMARY_CACHE.get(key)
+    if benefits is None:
+        benefits = generate_benefits_summary(schemes, catalog.index.summary_classes)
+        if None not in positions:
+            _SUMMARY_CACHE.put(key, benefits)
+    BENEFITS_LATENCY.observe(time.perf_counter() - started)
+    return benefits
+
+def _coalesce_key(request: FullAnalysisRequest, catalog: CatalogSnapshot) -> Tuple[str, str, Optional[str], int]:
+    # Extraction reads only the canonical query text, and so does everything matching takes
+    # from raw_query (the training keywords survive canonicalization unchanged)
+    return canonical_query(request.query, FILLER_RE), request.language, request.state_hint, catalog.version
+
+def _response_cache_key(catalog: CatalogSnapshot, language: str, profile_dict: Dict[str, Any]):
+    # The match key bands income, but the response echoes the exact profile
+    return match_cache_key(profile_dict, catalog), language, tuple(profile_dict.get(f) for f in ProfileData.model_fields)
+
+def _split_body(body: bytes) -> Tuple[bytes, bytes]:
+    """Splits a serialized FullAnalysisResponse around the processing_time_ms value."""
+    start = body.index(_TIME_FIELD) + len(_TIME_FIELD)
+    return body[:start], body[body.index(b",", start):]
+
+def _respond(request: FullAnalysisRequest, catalog: CatalogSnapshot):
+    """
+    Extraction, then the response bytes for its profile: from the response cache, else
+    analyzed and serialized. Returns (profile_dict, (head, tail, schemes)).
+    """
+    profile_dict = _extract(request)
+    cache_key = _response_cache_key(catalog, request.language, profile_dict)
+    cached = _RESPONSE_CACHE.get(cache_key)
+    if cached is None:
+        response, _, schemes = _analyze(request, catalog, profile_dict)
+        started = time.perf_counter()
+        head, tail = _split_body(response.model_dump_json().encode("utf-8"))
+        SERIALIZATION_LATENCY.observe(time.perf_counter() - started)
+        cached = (head, tail, schemes)
+        _RESPONSE_CACHE.put(cache_key, cached)
+    return profile_dict, cached
+
+def _record_request(language: str, data_source: str) -> None:
+    REQUESTS_BY_LANGUAGE.inc(language)
+    REQUESTS_BY_SOURCE.inc(data_source)
+
+def _analyze(request: FullAnalysisRequest, catalog: Optional[CatalogSnapshot] = None,
+             profile_dict: Optional[Dict[str, Any]] = None,
+             matcher: Callable[..., List[SchemeMatch]] = match_schemes) -> Tuple[FullAnalysisResponse, Dict[str, Any], List[SchemeMatch]]:
+    """Runs extraction (unless `profile_dict` is given), matching and text generation for one query."""
+    start_time = time.time()
+    
+    catalog = catalog or get_catalog()
+    
+    # 1. Profile Extraction
+    if profile_dict is None:
+        profile_dict = _extract(request)
+    profile_summary = generate_profile_summary(profile_dict)
+    profile_data = ProfileData(**profile_dict)
+    
+    # 2. Scheme Matching
+    schemes, is_unknown_profile = _match(profile_dict, catalog, matcher)
+    follow_up_question = None
+    if is_unknown_profile:
+        profile_summary = UNKNOWN_PROFILE_SUMMARY
+        follow_up_question = FOLLOW_UP_QUESTION
+    
+    # 3. Benefits & Text
+    benefits = _benefits_summary(schemes, catalog)
+    speakable = _speakable_text(request.language, schemes, is_unknown_profile)
+
+    proc_time = int((time.time() - start_time) * 1000)
+    
+    started = time.perf_counter()
+    response = FullAnalysisResponse(
+        profile=profile_data,
+        profile_summary=profile_summary,
+        schemes=schemes,
+        benefits_summary=benefits,
+        speakable_text=speakable,
+        processing_time_ms=proc_time,
+        data_source=ENGINE_DATA_SOURCE,
+        follow_up_question=follow_up_question
+    )
+    VALIDATION_LATENCY.observe(time.perf_counter() - started)
+    return response, profile_dict, schemes
 
 @router.post("/full-analysis", response_model=FullAnalysisResponse)
 def full_analysis(request: FullAnalysisRequest, demo: bool = False):
@@ -49,108 +388,41 @@ def full_analysis(request: FullAnalysisRequest, demo: bool = False):
     """
     if demo:
         print(f"Demo mode activated! Returning safe fallback for query: {request.query}")
-        return get_demo_response()
-
-    if not request.query or not request.query.strip() or len(request.query.strip()) < 3:
-        # Never crash on empty query as per requirements, friendly fallback
-        return FullAnalysisResponse(
-            profile=ProfileData(),
-            profile_summary="We need a little more information.",
-            schemes=[],
-            benefits_summary="Please describe your situation so we can help.",
-            speakable_text="Please tell me about your situation so I can help.",
-            processing_time_ms=0,
-            data_source="Government scheme database and eligibility engine"
-        )
+        response = get_demo_response()
+        _record_request(request.language, response.data_source)
+        return response
+
+    if _is_query_too_short(request.query):
+        response = _empty_query_response()
+        _record_request(request.language, response.data_source)
+        return response
         
-    start_time = time.time()
     try:
-        # 1. Profile Extraction
-        profile_dict = extract_profile(request.query)
-        if request.state_hint and not profile_dict.get("state"):
-            profile_dict["state"] = request.state_hint
-            
-        profile_summary = generate_profile_summary(profile_dict)
-        profile_data = ProfileData(**profile_dict)
-        
-        # 2. Scheme Matching
-        schemes = match_schemes(profile_dict)
-        
-        is_unknown_profile = profile_dict.get("occupation") == "unknown" and profile_dict.get("category") == "general"
-        follow_up_question = None
-        
-        if is_unknown_profile:
-            profile_summary = "We need more information about your occupation."
-            follow_up_question = "Are you a student, farmer, business owner, or senior citizen?"
-            
-            # Filter schemes down to max 3 general ones and downgrade any High confidence hits
-            filtered_schemes = []
-            for s in schemes:
-                if "general" in s.target_groups or s.scheme_type in ["general", "insurance"]:
-                    if s.confidence == "High":
-                        s.confidence = "Medium"
-                        s.eligibilityScore = "medium"
-                    filtered_schemes.append(s)
-                if len(filtered_schemes) >= 3:
-                    break
-            schemes = filtered_schemes
+        start_time = time.time()
+        catalog = get_catalog()
+        # Concurrent requests with the same canonical text share one extraction and analysis;
+        # the same profile, language and catalog as an earlier request reuses its bytes
+        (profile_dict, (head, tail, schemes)), shared = _analysis_flight.do(
+            _coalesce_key(request, catalog), lambda: _respond(request, catalog)
+        )
+        if shared:
+            profile_dict = {**profile_dict, "raw_query": request.query}
+        _record_request(request.language, ENGINE_DATA_SOURCE)
         
         # Lightweight logging
         print(f"[Query]: {request.query}")
         print(f"[Extracted Profile]: {profile_dict}")
         print(f"[Matched Schemes Count]: {len(schemes)}")
+        if shared:
+            print("[Coalesced]: served from a concurrent identical request")
         
-        # 3. Benefits & Text
-        benefits = generate_benefits_summary(schemes)
+        # 4. Store query & results (one row per request, even when coalesced or cached)
+        _log_query(request.query, profile_dict, schemes)
         
-        speakable_map = {
-            "en": f"Based on your profile, I found {len(schemes)} government schemes you may be eligible for.",
-            "hi": f"आपकी प्रोफ़ाइल के आधार पर, मुझे {len(schemes)} सरकारी योजनाएं मिली हैं जिनके लिए आप पात्र हो सकते हैं।",
-            "ta": f"உங்கள் சுயவிவரத்தின் அடிப்படையில், நீங்கள் தகுதிபெறக்கூடிய {len(schemes)} அரசுத் திட்டங்களை நான் கண்டறிந்துள்ளேன்.",
-            "te": f"మీ ప్రొఫైల్ ఆధారంగా, మీరు అర్హత సాధించే {len(schemes)} ప్రభుత్వ పథకాలను నేను కనుగొన్నాను."
-        }
-        speakable = speakable_map.get(request.language, speakable_map["en"])
-        if len(schemes) == 0 or is_unknown_profile:
-            speakable = "I couldn't find exact matches yet. Please tell me about your situation so I can help, or are you a student, farmer, business owner, or senior citizen?"
-
+        # Serialized here rather than by FastAPI so the step shows up in /metrics and the
+        # bytes can be cached; only processing_time_ms differs between requests
         proc_time = int((time.time() - start_time) * 1000)
-        
-        response = FullAnalysisResponse(
-            profile=profile_data,
-            profile_summary=profile_summary,
-            schemes=schemes,
-            benefits_summary=benefits,
-            speakable_text=speakable,
-            processing_time_ms=proc_time,
-            data_source="Government scheme database and eligibility engine",
-            follow_up_question=follow_up_question
-        )
-        
-        # 4. Store query & results asynchronously (doing synchronously here for simplicity)
-        try:
-            if supabase_client:
-                query_id = str(uuid.uuid4())
-                supabase_client.table("user_queries").insert({
-                    "id": query_id,
-                    "query_text": request.query,
-                    "detected_occupation": profile_dict.get("occupation"),
-                    "detected_income": profile_dict.get("income"),
-                    "detected_state": profile_dict.get("state"),
-                    "detected_age": profile_dict.get("age"),
-                }).execute()
-                
-                for s in schemes:
-                    supabase_client.table("analysis_results").insert({
-                        "id": str(uuid.uuid4()),
-                        "query_id": query_id,
-                        "scheme_name": s.name,
-                        "score": s.score,
-                        "reason": s.reason,
-                    }).execute()
-        except Exception as store_err:
-             print(f"Non-fatal error storing to DB: {store_err}") # Log error cleanly
-             
-        return response
+        return Response(content=head + str(proc_time).encode() + tail, media_type="application/json")
         
     except Exception as e:
         import traceback
@@ -159,26 +431,178 @@ def full_analysis(request: FullAnalysisRequest, demo: bool = False):
         # Return helpful fallback only if explicitly asked, otherwise we need to see the error natively
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/match", response_model=MatchResponse)
+def match(request: MatchRequest):
+    """
+    Re-matches a profile the user corrected (EditProfilePanel) without running text
+    extraction. Incomes may be numbers or bands ("₹1–2 lakh"), ages numbers or text
+    ("25 years"); anything else is answered with 422.
+
+    Diff mode (`previous` set) scores through the per-factor column cache, which
+    /full-analysis requests on the Python engine also fill, so after an edit only the
+    factors whose fields changed are scored again. `previous` itself is only used to
+    report those factors in `changed_factors`.
+    """
+    query = request.query or ""
+    try:
+        profile_dict = normalize_profile(request.profile.model_dump(), query)
+        previous_dict = None if request.previous is None else normalize_profile(request.previous.model_dump(), query)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+        
+    try:
+        catalog = get_catalog()
+        analysis_request = FullAnalysisRequest(query=query, language=request.language)
+        changed = None
+        if previous_dict is None:
+            response, _, _ = _analyze(analysis_request, catalog, profile_dict)
+        else:
+            changed = changed_factors(profile_dict, previous_dict)
+            response, _, _ = _analyze(analysis_request, catalog, profile_dict, rematch_schemes)
+        _record_request(request.language, ENGINE_DATA_SOURCE)
+        print(f"[Re-match]: {profile_dict} (changed: {changed if changed is not None else 'full'})")
+        return MatchResponse(**dict(response), changed_factors=changed)
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"Error re-matching profile: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/full-analysis/batch", response_model=FullAnalysisBatchResponse)
+def full_analysis_batch(requests: List[FullAnalysisRequest]):
+    """
+    Bulk intake for CSC kiosks: runs /full-analysis for each query on a bounded thread pool.
+    All items share one catalog snapshot and the match cache, results come back in request
+    order with per-item errors, and the whole batch is logged with one bulk insert.
+    """
+    if len(requests) > settings.BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch too large: at most {settings.BATCH_MAX_ITEMS} queries per request")
+        
+    start_time = time.time()
+    catalog = get_catalog()
+    
+    def run(request: FullAnalysisRequest):
+        if _is_query_too_short(request.query):
+            return _empty_query_response(), None, []
+        return _analyze(request, catalog)
+        
+    futures = [_batch_executor.submit(run, r) for r in requests]
+    
+    results = []
+    query_rows = []
+    result_rows = []
+    for i, (request, future) in enumerate(zip(requests, futures)):
+        try:
+            response, profile_dict, schemes = future.result()
+        except Exception as e:
+            print(f"Error processing batch item {i}: {e}")
+            results.append(FullAnalysisBatchItem(index=i, error=str(e)))
+            continue
+        results.append(FullAnalysisBatchItem(index=i, result=response))
+        _record_request(request.language, response.data_source)
+        if profile_dict is not None:
+            query_row, rows = _query_log_rows(request.query, profile_dict, schemes)
+            query_rows.append(query_row)
+            result_rows.extend(rows)
+            
+    print(f"[Batch]: {len(requests)} queries, {sum(1 for r in results if r.error)} errors")
+    query_log_writer.enqueue_many(query_rows, result_rows)
+    
+    return FullAnalysisBatchResponse(
+        results=results,
+        processing_time_ms=int((time.time() - start_time) * 1000)
+    )
+
+def _ndjson(event: str, **payload) -> str:
+    return json.dumps({"event": event, **payload}, ensure_ascii=False) + "\n"
+
+def _stream_response(response: FullAnalysisResponse):
+    """Replays an already built response as stream events."""
+    yield _ndjson("profile", profile=response.profile.model_dump(mode="json"), profile_summary=response.profile_summary)
+    yield _ndjson("speech", speakable_text=response.speakable_text, follow_up_question=response.follow_up_question, profile_summary=None, scheme_count=len(response.schemes))
+    for scheme in response.schemes:
+        yield _ndjson("scheme", scheme=scheme.model_dump(mode="json"))
+    yield _ndjson("summary", benefits_summary=response.benefits_summary)
+    yield _ndjson("done", processing_time_ms=response.processing_time_ms, data_source=response.data_source)
+
+def _stream_analysis(request: FullAnalysisRequest):
+    start_time = time.time()
+    try:
+        # 1. Profile is sent as soon as extraction finishes
+        catalog = get_catalog()
+        profile_dict = _extract(request)
+        profile_data = ProfileData(**profile_dict)
+        yield _ndjson("profile", profile=profile_data.model_dump(mode="json"), profile_summary=generate_profile_summary(profile_dict))
+        
+        # 2. Speech text needs the scheme count, so it follows matching, before any scheme is serialized
+        schemes, is_unknown_profile = _match(profile_dict, catalog)
+        yield _ndjson(
+            "speech",
+            speakable_text=_speakable_text(request.language, schemes, is_unknown_profile),
+            follow_up_question=FOLLOW_UP_QUESTION if is_unknown_profile else None,
+            profile_summary=UNKNOWN_PROFILE_SUMMARY if is_unknown_profile else None,
+            scheme_count=len(schemes)
+        )
+        
+        # 3. Each scheme, then the benefits summary
+        for scheme in schemes:
+            yield _ndjson("scheme", scheme=scheme.model_dump(mode="json"))
+        yield _ndjson("summary", benefits_summary=_benefits_summary(schemes, catalog))
+        yield _ndjson(
+            "done",
+            processing_time_ms=int((time.time() - start_time) * 1000),
+            data_source=ENGINE_DATA_SOURCE
+        )
+        _record_request(request.language, ENGINE_DATA_SOURCE)
+        
+        _log_query(request.query, profile_dict, schemes)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        print(f"Error streaming query: {e}")
+        yield _ndjson("error", detail=str(e))
+
+@router.post("/full-analysis/stream")
+def full_analysis_stream(request: FullAnalysisRequest, demo: bool = False):
+    """
+    Streaming variant of /full-analysis for voice clients (newline-delimited JSON).
+    Events, in order: profile, speech, scheme (one per match), summary, done.
+    "speech" carries a replacement profile_summary when the profile is too vague to match.
+    An "error" event replaces the remaining events if processing fails.
+    """
+    if demo:
+        events = _stream_response(get_demo_response())
+    elif _is_query_too_short(request.query):
+        events = _stream_response(_empty_query_response())
+    else:
+        events = _stream_analysis(request)
+    return StreamingResponse(events, media_type="application/x-ndjson")
+
 @router.post("/store-query")
 def store_query(request: StoreQueryRequest):
-    """Stores a raw query specifically."""
+    """Stores a raw query specifically. Falls back to the local spool if Supabase is unavailable."""
+    query_id = str(uuid.uuid4())
+    data = {
+        "id": query_id,
+        "query_text": request.query_text,
+        "detected_occupation": request.detected_occupation,
+        "detected_income": request.detected_income,
+        "detected_state": request.detected_state,
+        "detected_age": request.detected_age
+    }
     try:
-        if not supabase_client:
-            return {"message": "Query logged locally", "id": str(uuid.uuid4())}
-            
-        query_id = str(uuid.uuid4())
-        data = {
-            "id": query_id,
-            "query_text": request.query_text,
-            "detected_occupation": request.detected_occupation,
-            "detected_income": request.detected_income,
-            "detected_state": request.detected_state,
-            "detected_age": request.detected_age
-        }
-        res = supabase_client.table("user_queries").insert(data).execute()
-        return res.data
+        if supabase_client:
+            res = supabase_client.table("user_queries").insert(data).execute()
+            return res.data
+    except Exception as e:
+        print(f"Non-fatal error storing query to DB, spooling locally: {e}")
+        
+    try:
+        query_spool.append([data], [])
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return {"message": "Query logged locally", "id": query_id}
 
 @router.get("/demo-response", response_model=DemoResponse)
 def get_demo_response():
@@ -241,5 +665,5 @@ def get_demo_response():
         benefits_summary="Good news! We found 3 schemes tailored to you including PM Kisan Samman Nidhi and PMFBY.",
         speakable_text="You qualify for the PM Kisan Samman Nidhi scheme and 2 others. Read below for instructions on how to apply.",
         processing_time_ms=10,
-        data_source="Government scheme database and eligibility engine"
+        data_source=ENGINE_DATA_SOURCE
     )
@@ -10,6 +10,60 @@ class Settings(BaseSettings):
     SUPABASE_ANON_KEY: Optional[str] = None
     SUPABASE_SERVICE_ROLE_KEY: Optional[str] = None
 
+    # Scheme matching backend: "python" (per-scheme loop) or "numpy" (columnar, vectorized;
+    # faster from about 10k schemes, see scripts/bench_columnar_engine.py)
+    MATCHING_ENGINE: str = "python"
+
+    # Read spoken numbers in queries ("fifty thousand", "2 lakh", "pachas hazaar") and convert
+    # monthly incomes to yearly ones; False keeps digit-only extraction
+    SPOKEN_NUMBERS: bool = True
+
+    # Token -> canonical keyword/state table preloaded into profile extraction (relative to the
+    # backend directory; built from logged queries by scripts/build_spelling_table.py, optional)
+    SPELLING_TABLE_PATH: str = "data/spelling_table.json"
+
+    # Comma-separated words dropped from queries before profile extraction (voice fillers)
+    EXTRACTION_FILLER_WORDS: str = "um,umm,uh,uhh,hmm,hm,er,erm,ah,please,ji,haan,accha,acha,matlab,basically,actually"
+
+    # Compiled catalog artifact memory-mapped at startup instead of parsing the fallback JSON
+    # (relative to the backend directory; built by scripts/compile_catalog.py, skipped if missing or stale)
+    CATALOG_ARTIFACT_PATH: str = "data/fallback_schemes.bin"
+
+    # Seconds between background catalog refreshes from Supabase (0 refreshes only once at startup)
+    CATALOG_REFRESH_INTERVAL: float = 300.0
+
+    # Max number of canonical query texts kept in the extract_profile result cache (0 disables it)
+    EXTRACTION_CACHE_SIZE: int = 4096
+
+    # Max number of profile signatures kept in the match_schemes result cache (0 disables it)
+    MATCH_CACHE_SIZE: int = 1024
+
+    # Max number of per-factor score columns kept for the Python engine (one pointer per candidate
+    # scheme each; 0 disables it)
+    FACTOR_CACHE_SIZE: int = 256
+
+    # Max number of serialized /full-analysis responses kept per profile and language (0 disables it)
+    RESPONSE_CACHE_SIZE: int = 1024
+
+    # Max number of benefits summaries kept per result list (scheme positions and confidences, 0 disables it)
+    SUMMARY_CACHE_SIZE: int = 1024
+
+    # Background Supabase logging: upload a batch after this many queries or seconds
+    # (the queue limit only applies when there is no spool; rows beyond it are dropped)
+    QUERY_LOG_FLUSH_SIZE: int = 50
+    QUERY_LOG_FLUSH_INTERVAL: float = 1.0
+    QUERY_LOG_MAX_QUEUE: int = 10000
+
+    # Local write-ahead spool every logged query goes through (relative to the backend directory);
+    # failed uploads are retried every QUERY_SPOOL_REPLAY_INTERVAL seconds
+    QUERY_SPOOL_DIR: str = "data/spool"
+    QUERY_SPOOL_SEGMENT_BYTES: int = 1_000_000
+    QUERY_SPOOL_REPLAY_INTERVAL: float = 30.0
+
+    # /full-analysis/batch: max queries per call and worker threads shared by all batches
+    BATCH_MAX_ITEMS: int = 500
+    BATCH_MAX_WORKERS: int = 4
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,131 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+# Latency buckets in seconds (upper bounds), tuned for a sub-second API
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+STAGES = (
+    "extract_profile",
+    "match_schemes",
+    "generate_benefits_summary",
+    "response_validation",
+    "serialization",
+    "db_storage",
+)
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram. All storage is preallocated, so `observe`
+    only bisects and increments existing slots on the request path.
+
+    Updates are not locked: a lock costs more than the update itself, and the
+    GIL only lets a concurrent increment get lost in rare thread switches,
+    which is acceptable for monitoring data.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts: List[int] = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        return list(self.counts), self.total
+
+
+class Counter:
+    """
+    Counter keyed by a single label value. Unlocked, like Histogram.
+
+    Allowed label values get their slot up front, so `inc` is a single dict
+    update; only a value outside the set takes the slower path.
+    """
+
+    def __init__(self, allowed: Iterable[str] = (), other: str = "other"):
+        # Restricting values keeps user-supplied labels from growing the series set
+        self.allowed = frozenset(allowed)
+        self.other = other
+        self.values: Dict[str, int] = dict.fromkeys(sorted(self.allowed), 0)
+
+    def inc(self, label: str) -> None:
+        try:
+            self.values[label] += 1
+        except KeyError:
+            self._add(label)
+
+    def _add(self, label: str) -> None:
+        if self.allowed:
+            label = self.other
+        self.values[label] = self.values.get(label, 0) + 1
+
+    def snapshot(self) -> Dict[str, int]:
+        return dict(self.values)
+
+
+STAGE_LATENCY: Dict[str, Histogram] = {stage: Histogram() for stage in STAGES}
+REQUESTS_BY_LANGUAGE = Counter(allowed=("en", "hi", "ta", "te"))
+REQUESTS_BY_SOURCE = Counter()
+
+# Bound once so the request path skips the dict lookup
+EXTRACT_LATENCY = STAGE_LATENCY["extract_profile"]
+MATCH_LATENCY = STAGE_LATENCY["match_schemes"]
+BENEFITS_LATENCY = STAGE_LATENCY["generate_benefits_summary"]
+VALIDATION_LATENCY = STAGE_LATENCY["response_validation"]
+SERIALIZATION_LATENCY = STAGE_LATENCY["serialization"]
+DB_STORAGE_LATENCY = STAGE_LATENCY["db_storage"]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(gauges: Dict[str, Union[float, Tuple[str, Dict[str, float]]]],
+                      counters: Optional[Dict[str, Tuple[str, Dict[str, int]]]] = None) -> str:
+    """
+    Renders all metrics in the Prometheus text exposition format.
+    `gauges` maps a metric name to a reading, or to (label, {label value: reading});
+    `counters` holds totals kept by other components, as (label, {label value: total}).
+    """
+    lines = [
+        "# HELP vaanisetu_stage_latency_seconds Latency of each full-analysis stage.",
+        "# TYPE vaanisetu_stage_latency_seconds histogram",
+    ]
+    for stage, histogram in STAGE_LATENCY.items():
+        counts, total = histogram.snapshot()
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, counts):
+            cumulative += count
+            lines.append(f'vaanisetu_stage_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        cumulative += counts[-1]
+        lines.append(f'vaanisetu_stage_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {cumulative}')
+        lines.append(f'vaanisetu_stage_latency_seconds_sum{{stage="{stage}"}} {total}')
+        lines.append(f'vaanisetu_stage_latency_seconds_count{{stage="{stage}"}} {cumulative}')
+
+    for name, label, counter, help_text in (
+        ("vaanisetu_requests_by_language_total", "language", REQUESTS_BY_LANGUAGE, "Full-analysis requests by language."),
+        ("vaanisetu_requests_by_data_source_total", "data_source", REQUESTS_BY_SOURCE, "Full-analysis responses by data_source."),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for value, count in sorted(counter.snapshot().items()):
+            lines.append(f'{name}{{{label}="{_escape(value)}"}} {count}')
+
+    for name, (label, totals) in (counters or {}).items():
+        lines.append(f"# TYPE {name} counter")
+        for value, count in totals.items():
+            lines.append(f'{name}{{{label}="{_escape(value)}"}} {count}')
+
+    for name, gauge in gauges.items():
+        lines.append(f"# TYPE {name} gauge")
+        if not isinstance(gauge, tuple):
+            lines.append(f"{name} {gauge}")
+            continue
+        label, readings = gauge
+        for value, reading in readings.items():
+            lines.append(f'{name}{{{label}="{_escape(value)}"}} {reading}')
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,252 @@
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from app.core.config import settings
+from app.db.supabase import supabase_client
+from app.db.spool import QuerySpool
+from app.core.metrics import DB_STORAGE_LATENCY
+
+_STOP = object()
+
+
+class QueryLogWriter:
+    """
+    Moves `user_queries` / `analysis_results` logging off the request path.
+
+    With a `spool`, the spool is the write-ahead log: `enqueue` appends the rows to
+    the active segment (flushed to the OS) before it returns, so an acknowledged row
+    survives a crash. A background thread closes a batch whenever `flush_size`
+    queries are waiting or `flush_interval` seconds have passed since the oldest
+    one: it seals (and fsyncs) the segment and uploads the sealed segments with one
+    bulk upsert per table. A segment is deleted only after Supabase accepted it;
+    after a failure uploads are retried every `replay_interval` seconds, and batches
+    in between are just fsynced. Without a Supabase client rows stay in the spool.
+
+    Without a spool, rows wait in an in-memory queue of `max_queue` items and are
+    written with one bulk insert per table per batch; rows that fail are counted
+    and lost.
+    """
+
+    def __init__(self, client=None, flush_size: int = 50, flush_interval: float = 1.0, max_queue: int = 10000,
+                 spool: Optional[QuerySpool] = None, replay_interval: float = 30.0):
+        self.client = client
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool = spool
+        self.replay_interval = replay_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        # Spool path: queries appended since the last batch, and when the first of them was
+        self._wake = threading.Event()
+        self._pending_lock = threading.Lock()
+        self._pending = 0
+        self._first_at = 0.0
+        self._retry_at = 0.0
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self._last_replay = 0.0
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        if self.spool:
+            self.spool.recover()
+        self._stopping.clear()
+        target = self._run_spooled if self.spool else self._run
+        self._thread = threading.Thread(target=target, name="query-log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Flushes everything still pending and stops the worker. If the worker is still
+        busy after `timeout` seconds it is left to finish on its own, and the spool is
+        only sealed once it has exited (a later `stop()` or the next `recover()`).
+        """
+        if not self._thread:
+            return
+        self._stopping.set()
+        self._wake.set()
+        try:
+            # Wakes a worker waiting on an empty queue; a full one never waits
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"Query log writer still flushing after {timeout}s; leaving the spool segment open")
+            return
+        self._thread = None
+        if self.spool:
+            self.spool.seal()
+
+    def enqueue(self, query_row: Dict[str, Any], result_rows: List[Dict[str, Any]]) -> bool:
+        """Logs one query with its analysis results. Never waits on the network; returns False if dropped."""
+        return self.enqueue_many([query_row], result_rows)
+
+    def enqueue_many(self, query_rows: List[Dict[str, Any]], result_rows: List[Dict[str, Any]]) -> bool:
+        """Logs several queries as one item, so they are written in the same bulk insert."""
+        if not query_rows:
+            return True
+        if self.spool:
+            try:
+                self.spool.append(query_rows, result_rows)
+            except OSError as e:
+                print(f"Could not spool {len(query_rows)} queries: {e}")
+                self.dropped += len(query_rows)
+                return False
+            self.enqueued += len(query_rows)
+            with self._pending_lock:
+                if not self._pending:
+                    self._first_at = time.monotonic()
+                    self._wake.set()  # Starts the flush_interval timer
+                self._pending += len(query_rows)
+                if self._pending >= self.flush_size:
+                    self._wake.set()
+            return True
+        try:
+            self._queue.put_nowait((query_rows, result_rows))
+        except queue.Full:
+            self.dropped += len(query_rows)
+            return False
+        self.enqueued += len(query_rows)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": bool(self._thread and self._thread.is_alive()),
+            "queue_depth": self._pending if self.spool else self._queue.qsize(),
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "spool": self.spool.stats() if self.spool else None,
+        }
+
+    # Spool path
+
+    def _run_spooled(self) -> None:
+        if self.client:
+            # Rows left by an earlier run
+            self._upload()
+        while True:
+            with self._pending_lock:
+                pending, first_at = self._pending, self._first_at
+            timeout = max(0.0, first_at + self.flush_interval - time.monotonic()) if pending else self.replay_interval
+            if pending < self.flush_size:
+                self._wake.wait(timeout)
+            self._wake.clear()
+            stopping = self._stopping.is_set()
+
+            with self._pending_lock:
+                pending = self._pending
+                due = pending and (pending >= self.flush_size or time.monotonic() - self._first_at >= self.flush_interval)
+                if due or stopping:
+                    self._pending = 0
+            if due or stopping:
+                self._flush_spool(force=stopping)
+            elif self.client and time.monotonic() - self._last_replay >= self.replay_interval:
+                # Segments left by failed uploads, /store-query or other processes
+                self._upload()
+            if stopping:
+                return
+
+    def _flush_spool(self, force: bool = False) -> None:
+        """Closes the current batch: seals and uploads it, or only fsyncs it while uploads are backing off."""
+        if self.client and (force or time.monotonic() >= self._retry_at):
+            self.spool.seal()
+            self._upload()
+        else:
+            self.spool.sync()
+
+    def _upload(self) -> None:
+        self._last_replay = time.monotonic()
+        failures = self.spool.replay_failures
+        started = time.perf_counter()
+        uploaded = self.spool.replay(self.client)
+        if uploaded:
+            DB_STORAGE_LATENCY.observe(time.perf_counter() - started)
+            self.written += uploaded
+            self.batches += 1
+        if self.spool.replay_failures != failures:
+            self._retry_at = time.monotonic() + self.replay_interval
+
+    # In-memory path
+
+    def _run(self) -> None:
+        batch = []
+        pending = 0
+        first_at = 0.0
+        while True:
+            timeout = max(0.0, first_at + self.flush_interval - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP or self._stopping.is_set():
+                if item is not None and item is not _STOP:
+                    batch.append(item)
+                self._flush(batch + self._drain())
+                return
+            if item is not None:
+                if not batch:
+                    first_at = time.monotonic()
+                batch.append(item)
+                pending += len(item[0])
+
+            if batch and (pending >= self.flush_size or time.monotonic() - first_at >= self.flush_interval):
+                self._flush(batch)
+                batch = []
+                pending = 0
+
+    def _drain(self) -> list:
+        items = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                return items
+            if item is not _STOP:
+                items.append(item)
+
+    def _flush(self, batch) -> None:
+        if not batch:
+            return
+        query_rows = [q for queries, _ in batch for q in queries]
+        result_rows = [r for _, results in batch for r in results]
+        if not self.client:
+            self.failed += len(query_rows)
+            return
+        try:
+            started = time.perf_counter()
+            # Queries first: analysis_results references user_queries.id
+            self.client.table("user_queries").insert(query_rows).execute()
+            if result_rows:
+                self.client.table("analysis_results").insert(result_rows).execute()
+            DB_STORAGE_LATENCY.observe(time.perf_counter() - started)
+            self.written += len(query_rows)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(query_rows)
+            print(f"Non-fatal error storing {len(query_rows)} queries to DB: {e}")
+
+
+SPOOL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), settings.QUERY_SPOOL_DIR)
+
+query_spool = QuerySpool(SPOOL_DIR, segment_bytes=settings.QUERY_SPOOL_SEGMENT_BYTES)
+
+query_log_writer = QueryLogWriter(
+    supabase_client,
+    flush_size=settings.QUERY_LOG_FLUSH_SIZE,
+    flush_interval=settings.QUERY_LOG_FLUSH_INTERVAL,
+    max_queue=settings.QUERY_LOG_MAX_QUEUE,
+    spool=query_spool,
+    replay_interval=settings.QUERY_SPOOL_REPLAY_INTERVAL,
+)
@@ -0,0 +1,195 @@
+import glob
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+ACTIVE_SUFFIX = ".active"
+SEALED_SUFFIX = ".jsonl"
+REPLAYING_SUFFIX = ".replaying"
+
+
+def _lock(f) -> bool:
+    """Takes a non-blocking exclusive flock on an open file; False if another holder has it."""
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _pid_alive(pid: int) -> bool:
+    # PIDs are reused across restarts (often our own, e.g. 1 in a container), so a
+    # segment named after this process can only be ours if we still hold it open.
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class QuerySpool:
+    """
+    Durable local spool (write-ahead log) for `user_queries` / `analysis_results` rows
+    on their way to Supabase.
+
+    Rows are appended as JSON lines to an append-only segment file owned by this process
+    (`segment-<time_ns>-<pid>.active`, flock-ed while open) and flushed to the OS, which
+    costs a write syscall instead of a network round trip and survives a process crash.
+    `sync()` and sealing also fsync, so rows survive a machine crash from then on.
+    Segments are sealed (`.jsonl`) when they grow past `segment_bytes` or when a replay
+    starts, and a replayer claims sealed segments by renaming and locking them, uploads
+    them in bulk and deletes them only once every upsert succeeded. Segments nobody holds
+    a lock on were left behind by crashed processes and are recovered on startup, so rows
+    survive restarts.
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = 1_000_000):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Optional[str] = None
+        self.spooled = 0
+        self.replayed = 0
+        self.corrupt_lines = 0
+        self.replay_failures = 0
+
+    # Writing
+
+    def append(self, query_rows: List[Dict[str, Any]], result_rows: List[Dict[str, Any]]) -> None:
+        line = json.dumps({"user_queries": query_rows, "analysis_results": result_rows}, default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._path = os.path.join(self.directory, f"segment-{time.time_ns()}-{os.getpid()}{ACTIVE_SUFFIX}")
+                self._file = open(self._path, "a", encoding="utf-8")
+                _lock(self._file)
+            self._file.write(line)
+            self._file.flush()
+            self.spooled += len(query_rows)
+            if self._file.tell() >= self.segment_bytes:
+                self._seal_locked()
+
+    def sync(self) -> None:
+        """Forces the rows appended so far to disk."""
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+
+    def seal(self) -> None:
+        with self._lock:
+            self._seal_locked()
+
+    def _seal_locked(self) -> None:
+        if self._file is None:
+            return
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._path, self._path[:-len(ACTIVE_SUFFIX)] + SEALED_SUFFIX)
+        self._file = None
+        self._path = None
+
+    # Recovery
+
+    def recover(self) -> None:
+        """
+        Re-queues segments no running writer or replayer holds. Without flock (Windows)
+        this falls back to checking whether the PID in the name is still running.
+        """
+        for suffix in (ACTIVE_SUFFIX, REPLAYING_SUFFIX):
+            for path in glob.glob(os.path.join(self.directory, f"segment-*{suffix}")):
+                if path == self._path:
+                    continue
+                if fcntl is None:
+                    try:
+                        pid = int(os.path.basename(path)[:-len(suffix)].rsplit("-", 1)[1])
+                    except (IndexError, ValueError):
+                        continue
+                    if not _pid_alive(pid):
+                        os.replace(path, path[:-len(suffix)] + SEALED_SUFFIX)
+                    continue
+                try:
+                    f = open(path, "rb")
+                except FileNotFoundError:
+                    continue  # Sealed or finished meanwhile
+                with f:
+                    if _lock(f):
+                        os.replace(path, path[:-len(suffix)] + SEALED_SUFFIX)
+
+    # Replay
+
+    def pending_segments(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, f"segment-*{SEALED_SUFFIX}")))
+
+    def _read(self, path: str) -> Iterator[Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]]:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash
+                    self.corrupt_lines += 1
+                    continue
+                yield record.get("user_queries", []), record.get("analysis_results", [])
+
+    def replay(self, client, chunk_size: int = 500) -> int:
+        """
+        Uploads every sealed segment with bulk upserts (safe to retry) and deletes it.
+        Stops at the first failure and leaves the remaining segments for the next attempt.
+        Returns the number of query rows uploaded.
+        """
+        if not client:
+            return 0
+        self.seal()
+        uploaded = 0
+        for path in self.pending_segments():
+            claimed = path[:-len(SEALED_SUFFIX)].rsplit("-", 1)[0] + f"-{os.getpid()}{REPLAYING_SUFFIX}"
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue  # Claimed by another worker
+            holder = open(claimed, "rb")
+            _lock(holder)
+            try:
+                query_rows: List[Dict[str, Any]] = []
+                result_rows: List[Dict[str, Any]] = []
+                for queries, results in self._read(claimed):
+                    query_rows.extend(queries)
+                    result_rows.extend(results)
+                for i in range(0, len(query_rows), chunk_size):
+                    client.table("user_queries").upsert(query_rows[i:i + chunk_size]).execute()
+                for i in range(0, len(result_rows), chunk_size):
+                    client.table("analysis_results").upsert(result_rows[i:i + chunk_size]).execute()
+            except Exception as e:
+                os.replace(claimed, path)
+                self.replay_failures += 1
+                print(f"Spool replay failed, will retry later: {e}")
+                break
+            finally:
+                holder.close()
+            os.remove(claimed)
+            uploaded += len(query_rows)
+            self.replayed += len(query_rows)
+        return uploaded
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "spooled": self.spooled,
+            "replayed": self.replayed,
+            "pending_segments": len(self.pending_segments()) + (1 if self._file is not None else 0),
+            "corrupt_lines": self.corrupt_lines,
+            "replay_failures": self.replay_failures,
+        }
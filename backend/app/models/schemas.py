@@ -42,7 +42,16 @@ class ProfileData(BaseModel):
     gender: Optional[str] = None
     category: Optional[str] = None
 
-from pydantic import BaseModel, root_validator
+# Re-matching a profile the user corrected, without text extraction
+class MatchRequest(BaseModel):
+    profile: ProfileData
+    language: Optional[str] = "en"
+    # Text of the original query, if any (explicit training requests change student results)
+    query: Optional[str] = None
+    # Diff mode: the profile the current results were computed for
+    previous: Optional[ProfileData] = None
+
+from pydantic import BaseModel, PrivateAttr, root_validator
 class SchemeMatch(BaseModel):
     name: str
     score: int
@@ -59,6 +68,8 @@ class SchemeMatch(BaseModel):
     official_url: Optional[str] = None
     sample_form_url: Optional[str] = None
     recommendation_level: str = "primary"
+    # Position of the scheme in the catalog snapshot it was matched from (not serialized)
+    _catalog_position: Optional[int] = PrivateAttr(default=None)
 
     @root_validator(pre=True)
     def trim_strings(cls, values):
@@ -80,3 +91,16 @@ class FullAnalysisResponse(BaseModel):
 
 class DemoResponse(FullAnalysisResponse):
     pass
+
+class MatchResponse(FullAnalysisResponse):
+    # Diff mode only: the scoring factors that read an edited field
+    changed_factors: Optional[List[str]] = None
+
+class FullAnalysisBatchItem(BaseModel):
+    index: int
+    result: Optional[FullAnalysisResponse] = None
+    error: Optional[str] = None
+
+class FullAnalysisBatchResponse(BaseModel):
+    results: List[FullAnalysisBatchItem]
+    processing_time_ms: Optional[int] = None
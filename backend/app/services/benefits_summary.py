@@ -1,9 +1,11 @@
-from typing import List
+from typing import Dict, List, Optional
 from app.models.schemas import SchemeMatch
+from app.services.catalog import SummaryClass, summary_classification
 
-def generate_benefits_summary(schemes: List[SchemeMatch]) -> str:
+def generate_benefits_summary(schemes: List[SchemeMatch], classes: Optional[Dict[str, SummaryClass]] = None) -> str:
     """
     Generates a summary text describing potential overall benefits from matched schemes.
+    `classes` maps scheme names to their precomputed summary classification (SchemeIndex.summary_classes).
     """
     if not schemes:
         return "We couldn't find any specific schemes matching your profile at the moment."
@@ -21,38 +23,22 @@ def generate_benefits_summary(schemes: List[SchemeMatch]) -> str:
     has_financial = False
     
     for s in schemes:
-        # Some mock schemes may not have scheme_type natively resolved in SchemeMatch, so we deduce if missing
-        s_name = str(getattr(s, "name", "")).lower()
-        targets_raw = getattr(s, "target_groups", []) or []
-        targets = [str(t).lower() for t in targets_raw if t]
-        
-        # Determine fallback scheme_type
-        stype = getattr(s, "scheme_type", None)
-        if not stype:
-             if "farmer" in targets or "kisan" in s_name or "krishi" in s_name or "fasal" in s_name:
-                 stype = "farmer_support"
-             elif "scholarship" in s_name or "education" in s_name or "vidya" in s_name:
-                 stype = "education"
-             elif "health" in s_name or "ayushman" in s_name or "medical" in s_name:
-                 stype = "health"
-             elif "training" in s_name or "kaushalya" in s_name or "skill" in s_name:
-                 stype = "training"
-             elif "bima" in s_name or "insurance" in s_name:
-                 stype = "insurance"
-             else:
-                 stype = "financial_support"
+        # Classification comes from the catalog index when given, else it is deduced from the name
+        summary_class = classes.get(s.name) if classes else None
+        if summary_class is None:
+            summary_class = summary_classification(s.name, s.target_groups)
+        stype, is_health, is_insurance = summary_class
                  
-        conf = getattr(s, "confidence", "Low")
-        if conf in ["High", "Medium", "high", "medium"]:
+        if s.confidence in ["High", "Medium", "high", "medium"]:
             type_counts[stype] = type_counts.get(stype, 0) + 1
             
-            if "health" in stype or "ayushman" in s_name or "medical" in s_name or "vandana" in s_name:
+            if is_health:
                 has_health = True
                 
             if stype == "training":
                 has_high_training = True
                 
-            if stype == "insurance" or "bima" in s_name:
+            if is_insurance:
                 has_insurance = True
                 
             if stype in ["financial_support", "pension"]:
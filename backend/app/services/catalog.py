@@ -0,0 +1,215 @@
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.scheme_text import income_reason, static_simple_reason
+
+NATIONAL_STATE_TAGS = ("all", "national", "india", "central")
+# scheme_type values the matcher understands; scripts/compile_catalog.py rejects others
+SCHEME_TYPES = frozenset((
+    "education", "training", "farmer_support", "financial_support", "housing", "health",
+    "pension", "women_specific", "insurance", "general", "employment", "business",
+))
+
+
+def _intern_lower(values) -> Tuple[str, ...]:
+    return tuple(sys.intern(str(v).lower()) for v in values if v)
+
+
+def _estimate_value(benefit_text: str) -> Optional[str]:
+    if "Rs" in benefit_text or "lakh" in benefit_text or "₹" in benefit_text:
+        # Simple heuristic
+        return benefit_text.split('.')[0]
+    return None
+
+
+# (scheme type, mentions health, mentions insurance) as generate_benefits_summary groups schemes
+SummaryClass = Tuple[str, bool, bool]
+
+
+def summary_classification(name: Any, target_groups) -> SummaryClass:
+    """
+    Benefits summary grouping, deduced from the scheme name and target groups
+    (match results do not carry the catalog scheme_type).
+    """
+    s_name = str(name or "").lower()
+    targets = [str(t).lower() for t in target_groups or [] if t]
+    if "farmer" in targets or "kisan" in s_name or "krishi" in s_name or "fasal" in s_name:
+        stype = "farmer_support"
+    elif "scholarship" in s_name or "education" in s_name or "vidya" in s_name:
+        stype = "education"
+    elif "health" in s_name or "ayushman" in s_name or "medical" in s_name:
+        stype = "health"
+    elif "training" in s_name or "kaushalya" in s_name or "skill" in s_name:
+        stype = "training"
+    elif "bima" in s_name or "insurance" in s_name:
+        stype = "insurance"
+    else:
+        stype = "financial_support"
+    is_health = "health" in stype or "ayushman" in s_name or "medical" in s_name or "vandana" in s_name
+    is_insurance = stype == "insurance" or "bima" in s_name
+    return stype, is_health, is_insurance
+
+
+class CompiledScheme:
+    """
+    Immutable, pre-normalized scheme record built once when the catalog loads.
+
+    All per-scheme normalization that used to run on every request (lowercasing,
+    name based scheme_type overrides, national/state flags) is resolved here, so
+    the scoring loop only does set lookups and integer arithmetic. The same goes
+    for the ranking flags and the scheme-only parts of the match text.
+    """
+    __slots__ = (
+        "position", "name", "scheme_type", "target_groups", "target_set",
+        "has_occupations", "occupations", "occupation_all",
+        "income_limit", "min_age", "max_age",
+        "states", "is_national",
+        "documents", "benefit_summary", "apply_steps", "estimated_value",
+        "official_url", "sample_form_url",
+        "is_general", "base_priority", "always_secondary", "simple_reason", "income_reason",
+        "summary_class",
+    )
+
+    def __init__(self, scheme: Dict[str, Any], position: int = 0):
+        _set = object.__setattr__
+        # Index in the compiled catalog; names are not unique across Supabase rows
+        _set(self, "position", position)
+        _set(self, "name", scheme.get("name", "Unknown Scheme"))
+
+        # Hardcode explicit type classification to override any stale DB tags
+        raw_name = scheme.get("name")
+        scheme_name_lower = str(raw_name).lower() if raw_name else ""
+        scheme_type = scheme.get("scheme_type", "general")
+        if "bima" in scheme_name_lower or "insurance" in scheme_name_lower:
+            scheme_type = "insurance"
+        elif "pension" in scheme_name_lower:
+            scheme_type = "pension"
+        _set(self, "scheme_type", sys.intern(scheme_type) if isinstance(scheme_type, str) else scheme_type)
+
+        target_groups = tuple(sys.intern(t) if isinstance(t, str) else t for t in (scheme.get("target_groups") or []))
+        _set(self, "target_groups", target_groups)
+        _set(self, "target_set", frozenset(target_groups))
+
+        occupations = frozenset(_intern_lower(scheme.get("eligible_occupations") or []))
+        _set(self, "has_occupations", bool(scheme.get("eligible_occupations")))
+        _set(self, "occupations", occupations)
+        _set(self, "occupation_all", "all" in occupations)
+
+        _set(self, "income_limit", scheme.get("income_limit"))
+        _set(self, "min_age", scheme.get("min_age"))
+        _set(self, "max_age", scheme.get("max_age"))
+
+        states = frozenset(_intern_lower(scheme.get("states") or ["all"]))
+        _set(self, "states", states)
+        _set(self, "is_national", any(ns in states for ns in NATIONAL_STATE_TAGS))
+
+        benefit_summary = scheme.get("benefit_summary", "")
+        _set(self, "documents", tuple(scheme.get("documents") or ()))
+        _set(self, "benefit_summary", benefit_summary)
+        _set(self, "apply_steps", tuple(scheme.get("apply_steps") or ()))
+        _set(self, "estimated_value", _estimate_value(benefit_summary or ""))
+        _set(self, "official_url", scheme.get("official_url"))
+        _set(self, "sample_form_url", scheme.get("sample_form_url", None))
+
+        # Ranking: sort priority before the state-specific override, and the name based
+        # "always secondary" rule for insurance, training and general schemes
+        is_general = "general" in target_groups or scheme_type in ("insurance", "general")
+        _set(self, "is_general", is_general)
+        if is_general:
+            base_priority = 4
+        elif scheme_type == "education":
+            base_priority = 1
+        elif scheme_type == "training":
+            base_priority = 3
+        else:
+            base_priority = 2
+        _set(self, "base_priority", base_priority)
+        _set(self, "always_secondary", "general" in target_groups or any(
+            word in scheme_name_lower for word in ("insurance", "training", "kaushalya")))
+
+        # Match text: None when the simple reason depends on the matched factors
+        _set(self, "simple_reason", static_simple_reason(scheme_type, is_general))
+        _set(self, "income_reason", income_reason(self.income_limit))
+        _set(self, "summary_class", summary_classification(self.name, target_groups))
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"CompiledScheme is immutable (tried to set '{key}')")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"CompiledScheme is immutable (tried to delete '{key}')")
+
+    def __repr__(self):
+        return f"CompiledScheme(name={self.name!r}, scheme_type={self.scheme_type!r})"
+
+
+def compile_schemes(schemes: List[Dict[str, Any]]) -> Tuple[CompiledScheme, ...]:
+    """
+    Compiles raw Supabase / fallback JSON scheme dicts into CompiledScheme records.
+    """
+    return tuple(CompiledScheme(s, pos) for pos, s in enumerate(schemes))
+
+
+class SchemeIndex:
+    """
+    Inverted index over a compiled catalog, keyed by target group, state and the
+    national flag. `candidates` returns only the schemes that can pass the hard
+    filters in `match_schemes` (category, women-specific and state), in catalog
+    order, so per-request cost grows with the number of eligible schemes rather
+    than the catalog size.
+
+    `version` increases every time the catalog is reloaded.
+    """
+
+    def __init__(self, schemes: Tuple[CompiledScheme, ...], version: int = 0):
+        self.schemes = schemes
+        self.version = version
+        by_target: Dict[str, set] = {}
+        by_state: Dict[str, set] = {}
+        national = set()
+        women_specific = set()
+        for pos, scheme in enumerate(schemes):
+            for target in scheme.target_set:
+                by_target.setdefault(target, set()).add(pos)
+            if scheme.is_national:
+                national.add(pos)
+            else:
+                for state in scheme.states:
+                    by_state.setdefault(state, set()).add(pos)
+            if scheme.scheme_type == "women_specific":
+                women_specific.add(pos)
+
+        self._by_target = {k: frozenset(v) for k, v in by_target.items()}
+        self._by_state = {k: frozenset(v) for k, v in by_state.items()}
+        self._national = frozenset(national)
+        self._women_specific = frozenset(women_specific)
+        # Distinct income limits, used to band user incomes for the match cache
+        self.income_limits = tuple(sorted({s.income_limit for s in schemes if s.income_limit}))
+        # Scheme name -> summary classification, for generate_benefits_summary. Names whose
+        # schemes classify differently are left out and get classified per request.
+        summary_classes: Dict[str, Optional[SummaryClass]] = {}
+        for scheme in schemes:
+            known = summary_classes.setdefault(scheme.name, scheme.summary_class)
+            if known is not None and known != scheme.summary_class:
+                summary_classes[scheme.name] = None
+        self.summary_classes = {k: v for k, v in summary_classes.items() if v is not None}
+        self._lookup = lru_cache(maxsize=1024)(self._build_candidates)
+
+    def _build_candidates(self, category: Any, state: Optional[str], women_eligible: bool) -> Tuple[CompiledScheme, ...]:
+        empty = frozenset()
+        targeted = self._by_target.get(category, empty) | self._by_target.get("general", empty)
+        located = self._national
+        if state:
+            located = located | self._by_state.get(state, empty)
+        positions = targeted & located
+        if not women_eligible:
+            positions = positions - self._women_specific
+        return tuple(self.schemes[pos] for pos in sorted(positions))
+
+    def candidates(self, category: Any, state: Optional[str], women_eligible: bool) -> Tuple[CompiledScheme, ...]:
+        """
+        `state` is the lowercased user state, or None when it is unknown.
+        """
+        return self._lookup(category, state, women_eligible)
+
+    def cache_info(self):
+        return self._lookup.cache_info()
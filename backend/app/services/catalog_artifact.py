@@ -0,0 +1,281 @@
+import gc
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from app.models.schemas import SchemeBase
+from app.services.catalog import compile_schemes
+from app.services.catalog_registry import content_hash
+
+# Compiled catalog artifact: a read-only binary image of the scheme rows that the service
+# memory-maps at startup instead of parsing JSON. The numpy engine scores straight on the
+# mapped columns, so with MATCHING_ENGINE=numpy uvicorn workers share those pages through
+# the OS cache. The scheme rows themselves are still materialized per process.
+#
+# Layout (little-endian, every section 8-byte aligned):
+#   header    magic, row count, string count, catalog content hash, source file digest
+#   sections  (offset, length) table, then the sections listed in SECTIONS
+#
+# Strings live once in a string table and are referenced by u32 index (NO_STRING for None),
+# numbers are i64 columns (NO_INT for None) and list fields point into a shared u32 pool.
+# Everything the numpy engine reads is also stored in the form it scores on: target
+# groups, states, occupations and scheme types as per-row uint64 bitsets over their
+# vocabularies, and one column per ENGINE_COLUMNS entry.
+
+MAGIC = b"VSCATLG\x03"
+STRING_FIELDS = ("id", "name", "official_url", "sample_form_url", "category", "benefit_summary", "scheme_type")
+INT_FIELDS = ("income_limit", "min_age", "max_age")
+LIST_FIELDS = ("eligible_occupations", "states", "documents", "apply_steps", "target_groups")
+FIELDS = STRING_FIELDS + INT_FIELDS + LIST_FIELDS
+# Bitset name -> the (normalized) values of a compiled scheme it records
+BITSETS = {
+    "targets": lambda scheme: scheme.target_set,
+    "states": lambda scheme: scheme.states,
+    "occupations": lambda scheme: scheme.occupations,
+    "scheme_types": lambda scheme: (scheme.scheme_type,),
+}
+# CompiledScheme attribute -> array typecode; missing limits are stored as 0, matching
+# the truthiness checks of the Python engine
+ENGINE_COLUMNS = {
+    "income_limit": "d", "min_age": "d", "max_age": "d", "base_priority": "q",
+    "has_occupations": "B", "occupation_all": "B", "is_national": "B",
+}
+SECTIONS = (
+    ("string_offsets", "strings", "presence", "string_columns", "int_columns", "list_index", "list_pool")
+    + tuple(f"{name}_{part}" for name in BITSETS for part in ("vocab", "bits"))
+    + tuple(f"engine_{name}" for name in ENGINE_COLUMNS)
+)
+
+NO_STRING = 0xFFFFFFFF
+NO_INT = -(1 << 63)
+
+_HEADER = struct.Struct("<8sII32s32s")
+_SECTION = struct.Struct("<QQ")
+
+
+def _check_byteorder() -> None:
+    # Columns are written and cast with the native layout
+    if sys.byteorder != "little":
+        raise RuntimeError("Catalog artifacts are only supported on little-endian platforms")
+
+
+def file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def validate_rows(rows: List[Dict[str, Any]]) -> None:
+    """Raises ValueError listing every row that does not validate against SchemeBase or the artifact fields."""
+    errors = []
+    for pos, row in enumerate(rows):
+        label = f"#{pos} {row.get('name')!r}"
+        try:
+            SchemeBase.model_validate(row)
+        except ValidationError as e:
+            errors.append(f"{label}: {e.error_count()} schema error(s): {e.errors()[0]['loc']} {e.errors()[0]['msg']}")
+            continue
+        unknown = set(row) - set(FIELDS)
+        if unknown:
+            errors.append(f"{label}: unsupported field(s) {sorted(unknown)}")
+        for field in STRING_FIELDS:
+            if row.get(field) is not None and not isinstance(row[field], str):
+                errors.append(f"{label}: {field} must be a string")
+        for field in INT_FIELDS:
+            value = row.get(field)
+            if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+                errors.append(f"{label}: {field} must be an integer")
+        for field in LIST_FIELDS:
+            value = row.get(field)
+            if value is not None and not all(isinstance(v, str) for v in value):
+                errors.append(f"{label}: {field} must be a list of strings")
+    if errors:
+        raise ValueError(f"{len(errors)} invalid scheme(s):\n  " + "\n  ".join(errors))
+
+
+def build_artifact(rows: List[Dict[str, Any]], source_digest: str = "") -> bytes:
+    """
+    Validates `rows` and encodes them. The output only depends on the rows and the
+    digest, so rebuilding an unchanged catalog yields identical bytes.
+    """
+    _check_byteorder()
+    validate_rows(rows)
+
+    strings: Dict[str, int] = {}
+
+    def ref(value: Optional[str]) -> int:
+        if value is None:
+            return NO_STRING
+        return strings.setdefault(value, len(strings))
+
+    presence = array("I")
+    string_columns = array("I")
+    int_columns = array("q")
+    list_index = array("I")
+    list_pool = array("I")
+    for row in rows:
+        mask = 0
+        for bit, field in enumerate(FIELDS):
+            if field in row:
+                mask |= 1 << bit
+        presence.append(mask)
+        string_columns.extend(ref(row.get(field)) for field in STRING_FIELDS)
+        int_columns.extend(NO_INT if row.get(field) is None else row[field] for field in INT_FIELDS)
+        for field in LIST_FIELDS:
+            values = row.get(field)
+            if values is None:
+                list_index.extend((NO_STRING, 0))
+            else:
+                list_index.extend((len(list_pool), len(values)))
+                list_pool.extend(ref(v) for v in values)
+
+    sections: Dict[str, bytes] = {}
+    compiled = compile_schemes(rows)
+    for name, values_of in BITSETS.items():
+        # Vocabulary in first-seen order; sets are sorted so the bytes are deterministic
+        vocab: Dict[Optional[str], int] = {}
+        for scheme in compiled:
+            for value in sorted(values_of(scheme)):
+                vocab.setdefault(value, len(vocab))
+        words = max(1, (len(vocab) + 63) // 64)
+        bits = array("Q", bytes(8 * words * len(compiled)))
+        for pos, scheme in enumerate(compiled):
+            for value in values_of(scheme):
+                bit = vocab[value]
+                bits[pos * words + bit // 64] |= 1 << (bit % 64)
+        sections[f"{name}_vocab"] = array("I", (ref(v) for v in vocab)).tobytes()
+        sections[f"{name}_bits"] = bits.tobytes()
+    for attr, typecode in ENGINE_COLUMNS.items():
+        sections[f"engine_{attr}"] = array(typecode, (getattr(scheme, attr) or 0 for scheme in compiled)).tobytes()
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0])
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    sections["string_offsets"] = offsets.tobytes()
+    sections["strings"] = b"".join(encoded)
+    sections["presence"] = presence.tobytes()
+    sections["string_columns"] = string_columns.tobytes()
+    sections["int_columns"] = int_columns.tobytes()
+    sections["list_index"] = list_index.tobytes()
+    sections["list_pool"] = list_pool.tobytes()
+
+    header = _HEADER.pack(
+        MAGIC, len(rows), len(strings),
+        bytes.fromhex(content_hash(rows)), bytes.fromhex(source_digest) if source_digest else bytes(32),
+    )
+    offset = len(header) + _SECTION.size * len(SECTIONS)
+    table = []
+    body = []
+    for name in SECTIONS:
+        data = sections[name]
+        padding = -offset % 8
+        body.append(bytes(padding))
+        offset += padding
+        table.append(_SECTION.pack(offset, len(data)))
+        body.append(data)
+        offset += len(data)
+    return header + b"".join(table) + b"".join(body)
+
+
+def write_artifact(rows: List[Dict[str, Any]], path: str, source_digest: str = "") -> str:
+    """Builds and writes the artifact atomically. Returns the catalog content hash."""
+    data = build_artifact(rows, source_digest)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return content_hash(rows)
+
+
+class CatalogArtifact:
+    """
+    A memory-mapped catalog artifact. Columns are memoryviews over the mapping, so
+    nothing is copied until `rows()` materializes the scheme dicts, and each distinct
+    string is decoded once and shared by every row that uses it.
+    """
+
+    def __init__(self, path: str):
+        _check_byteorder()
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, count, string_count, digest, source = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog artifact (or was built by another format version)")
+        self.count = count
+        self.content_hash = digest.hex()
+        self.source_digest = source.hex() if any(source) else ""
+        self._sections: Dict[str, memoryview] = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = _SECTION.unpack_from(view, _HEADER.size + i * _SECTION.size)
+            self._sections[name] = view[offset:offset + length]
+
+        offsets = self._sections["string_offsets"].cast("I")
+        blob = self._sections["strings"]
+        self._strings = [
+            sys.intern(str(blob[offsets[i]:offsets[i + 1]], "utf-8")) for i in range(string_count)
+        ]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """The scheme rows, equal to the ones the artifact was built from."""
+        # Decoding allocates a few containers per field and no cycles, so the collections
+        # the allocations would trigger find nothing and only add time
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._decode_rows()
+        finally:
+            if enabled:
+                gc.enable()
+
+    def _decode_rows(self) -> List[Dict[str, Any]]:
+        strings = self._strings + [None]  # NO_STRING is remapped to the trailing None
+        none_ref = len(strings) - 1
+        n_str, n_int, n_list = len(STRING_FIELDS), len(INT_FIELDS), len(LIST_FIELDS)
+
+        # Decode field by field (one strided slice per column), then zip the rows together
+        string_columns = self._sections["string_columns"].cast("I").tolist()
+        int_columns = self._sections["int_columns"].cast("q").tolist()
+        list_index = self._sections["list_index"].cast("I").tolist()
+        list_pool = [strings[i] for i in self._sections["list_pool"].cast("I").tolist()]
+        columns = []
+        for j in range(n_str):
+            columns.append([strings[none_ref if i == NO_STRING else i] for i in string_columns[j::n_str]])
+        for j in range(n_int):
+            columns.append([None if v == NO_INT else v for v in int_columns[j::n_int]])
+        for j in range(n_list):
+            starts = list_index[2 * j::2 * n_list]
+            lengths = list_index[2 * j + 1::2 * n_list]
+            columns.append([None if start == NO_STRING else list_pool[start:start + length]
+                            for start, length in zip(starts, lengths)])
+
+        rows = [dict(zip(FIELDS, values)) for values in zip(*columns)]
+        # Drop the fields a row did not have (as opposed to having them set to None)
+        full = (1 << len(FIELDS)) - 1
+        for row, mask in zip(rows, self._sections["presence"].cast("I").tolist()):
+            if mask != full:
+                for bit, field in enumerate(FIELDS):
+                    if not mask >> bit & 1:
+                        del row[field]
+        return rows
+
+    def bitset(self, name: str) -> Tuple[Dict[Optional[str], int], memoryview, int]:
+        """(value -> bit, packed uint64 words row by row, words per row) for one of BITSETS."""
+        vocab = {
+            None if ref == NO_STRING else self._strings[ref]: bit
+            for bit, ref in enumerate(self._sections[f"{name}_vocab"].cast("I"))
+        }
+        words = max(1, (len(vocab) + 63) // 64)
+        return vocab, self._sections[f"{name}_bits"], words
+
+    def engine_column(self, name: str) -> memoryview:
+        """One of ENGINE_COLUMNS, a view over the mapping with its typecode as format."""
+        return self._sections[f"engine_{name}"].cast(ENGINE_COLUMNS[name])
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from app.services.catalog import SchemeIndex, compile_schemes
+
+
+def content_hash(schemes: List[Dict[str, Any]]) -> str:
+    """SHA-256 of the catalog rows. Row order is part of the content: it decides ranking ties."""
+    payload = json.dumps(schemes, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CatalogSnapshot:
+    """
+    One immutable version of the scheme catalog: the raw rows plus everything derived
+    from them (compiled records, the candidate index and, for the numpy engine, the
+    columnar copy). A request that holds a snapshot sees one consistent catalog even
+    if a newer version is swapped in meanwhile. Snapshots loaded from a catalog artifact
+    keep its memory map, which the columnar copy reads all of its columns from.
+    """
+    __slots__ = ("version", "content_hash", "source", "loaded_at", "raw", "schemes", "index", "columnar", "artifact")
+
+    def __init__(self, raw: List[Dict[str, Any]], version: int, source: str,
+                 digest: Optional[str] = None, columnar: bool = False, artifact: Optional[Any] = None):
+        _set = object.__setattr__
+        schemes = compile_schemes(raw)
+        _set(self, "version", version)
+        _set(self, "content_hash", digest or content_hash(raw))
+        _set(self, "source", source)
+        _set(self, "loaded_at", time.time())
+        _set(self, "raw", tuple(raw))
+        _set(self, "schemes", schemes)
+        _set(self, "index", SchemeIndex(schemes, version=version))
+        _set(self, "artifact", artifact)
+        if columnar:
+            from app.services.columnar import ColumnarCatalog
+            _set(self, "columnar", ColumnarCatalog(schemes, artifact))
+        else:
+            _set(self, "columnar", None)
+
+    def with_source(self, source: str) -> "CatalogSnapshot":
+        """The same version, content and derived data, recorded as coming from `source`."""
+        copy = object.__new__(CatalogSnapshot)
+        for slot in self.__slots__:
+            object.__setattr__(copy, slot, getattr(self, slot))
+        object.__setattr__(copy, "source", source)
+        return copy
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"CatalogSnapshot is immutable (tried to set '{key}')")
+
+    def __repr__(self):
+        return f"CatalogSnapshot(version={self.version}, source={self.source!r}, schemes={len(self.schemes)}, hash={self.content_hash[:12]})"
+
+
+class CatalogRegistry:
+    """
+    Holds the current CatalogSnapshot and swaps in new ones atomically.
+
+    `current()` is a single attribute read, so readers never lock. `install` only
+    builds a new version when the content hash differs from the current one; derived
+    caches subscribe with `on_swap` and are reset only when the version changes.
+    `start_refresh` polls a fetch function (Supabase) in a background thread.
+
+    `status` describes the snapshot being served: "connected" when it came from
+    Supabase, "fallback" for the local catalog and "disconnected" before any load.
+    """
+
+    def __init__(self, columnar: bool = False):
+        self.columnar = columnar
+        self._snapshot = CatalogSnapshot([], version=0, source="empty")
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[CatalogSnapshot], None]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.refreshes = 0
+        self.unchanged = 0
+        self.failures = 0
+        self.last_refresh_at: Optional[float] = None
+
+    def current(self) -> CatalogSnapshot:
+        return self._snapshot
+
+    @property
+    def status(self) -> str:
+        source = self._snapshot.source
+        if source == "empty":
+            return "disconnected"
+        return "connected" if source == "supabase" else "fallback"
+
+    def on_swap(self, listener: Callable[[CatalogSnapshot], None]) -> None:
+        self._listeners.append(listener)
+
+    def install(self, raw: List[Dict[str, Any]], source: str, artifact: Optional[Any] = None) -> bool:
+        """
+        Swaps in `raw` as a new version. Returns False if the content is unchanged.
+        With a CatalogArtifact, `raw` are its rows and its stored hash is used.
+        """
+        digest = artifact.content_hash if artifact is not None else content_hash(raw)
+        with self._lock:
+            current = self._snapshot
+            if digest == current.content_hash and current.version:
+                self.unchanged += 1
+                if source != current.source:
+                    # e.g. Supabase serving what the local catalog already holds: caches stay valid
+                    self._snapshot = current.with_source(source)
+                return False
+            snapshot = CatalogSnapshot(raw, version=current.version + 1, source=source, digest=digest,
+                                       columnar=self.columnar, artifact=artifact)
+            self._snapshot = snapshot
+        for listener in self._listeners:
+            listener(snapshot)
+        print(f"Catalog version {snapshot.version} swapped in ({len(snapshot.schemes)} schemes from {source}, hash {digest[:12]}).")
+        return True
+
+    def refresh(self, fetch: Callable[[], List[Dict[str, Any]]], source: str = "supabase") -> bool:
+        """
+        Fetches and installs a catalog. The current snapshot stays in place if the fetch
+        fails or the rows cannot be compiled; neither raises.
+        """
+        self.refreshes += 1
+        self.last_refresh_at = time.time()
+        try:
+            return self.install(fetch(), source)
+        except Exception as e:
+            self.failures += 1
+            print(f"Catalog refresh from {source} failed, keeping version {self._snapshot.version}: {e}")
+            return False
+
+    def start_refresh(self, fetch: Callable[[], List[Dict[str, Any]]], interval: float) -> None:
+        """Refreshes once right away, then every `interval` seconds (never again if interval <= 0)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def run():
+            while True:
+                self.refresh(fetch)
+                if interval <= 0 or self._stop.wait(interval):
+                    return
+
+        self._thread = threading.Thread(target=run, name="catalog-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "content_hash": snapshot.content_hash,
+            "source": snapshot.source,
+            "schemes": len(snapshot.schemes),
+            "loaded_at": snapshot.loaded_at,
+            "refreshes": self.refreshes,
+            "unchanged": self.unchanged,
+            "failures": self.failures,
+        }
@@ -0,0 +1,218 @@
+import numpy as np
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.services.catalog import CompiledScheme
+
+# Category -> scheme_type -> (bonus points, is_primary), mirrors the priority scoring in match_schemes
+CATEGORY_TYPE_BONUS: Dict[str, Dict[str, Tuple[int, bool]]] = {
+    "student": {"education": (25, True), "financial_support": (15, False), "training": (5, False)},
+    "farmer": {"farmer_support": (25, True)},
+    "business": {"financial_support": (25, True), "business": (25, True)},
+    "women": {"women_specific": (25, True)},
+    "senior": {"pension": (25, True)},
+    "worker": {"financial_support": (25, True), "training": (25, True), "employment": (25, True)},
+}
+STUDENT_PENALTY_TYPES = ("insurance", "general", "pension")
+# Category -> scheme_type whose schemes get the confidence floor (score 75) in _rank_scored
+CORE_MATCH_TYPES = {"student": "education", "farmer": "farmer_support", "senior": "pension"}
+# Upper bound on any score: 40 + 25 (category) + 30 + 30 + 20 + 30 (state)
+MAX_SCORE = 256
+# Ranked rows ordered in the first chunk; each further chunk is 4x larger
+RANK_CHUNK = 32
+
+
+class BitColumn:
+    """
+    Packs a set-valued column into uint64 words, one bit per distinct value.
+    """
+
+    def __init__(self, rows: List[Iterable[str]]):
+        vocab: Dict[str, int] = {}
+        for values in rows:
+            for v in values:
+                vocab.setdefault(v, len(vocab))
+        self.vocab = vocab
+        words = max(1, (len(vocab) + 63) // 64)
+        self.bits = np.zeros((len(rows), words), dtype=np.uint64)
+        for row, values in enumerate(rows):
+            for v in values:
+                bit = vocab[v]
+                self.bits[row, bit // 64] |= np.uint64(1 << (bit % 64))
+
+    @classmethod
+    def from_packed(cls, vocab: Dict[str, int], buffer, words: int) -> "BitColumn":
+        """Wraps already packed words (e.g. a memory-mapped catalog artifact) without copying."""
+        column = cls.__new__(cls)
+        column.vocab = vocab
+        column.bits = np.frombuffer(buffer, dtype=np.uint64).reshape(-1, words)
+        return column
+
+    def contains(self, value: Any) -> np.ndarray:
+        bit = self.vocab.get(value)
+        if bit is None:
+            return np.zeros(len(self.bits), dtype=bool)
+        return (self.bits[:, bit // 64] & np.uint64(1 << (bit % 64))) != 0
+
+
+class ColumnarCatalog:
+    """
+    Column-oriented copy of a compiled catalog for the vectorized matching engine.
+    Missing numeric limits are stored as 0, matching the truthiness checks of the Python loop.
+    With a catalog artifact nothing is copied: every column is a view over its memory map,
+    which uvicorn workers share through the OS cache.
+    """
+
+    def __init__(self, schemes: Tuple[CompiledScheme, ...], artifact: Optional[Any] = None):
+        self.schemes = schemes
+        if artifact is not None:
+            self.targets = BitColumn.from_packed(*artifact.bitset("targets"))
+            self.states = BitColumn.from_packed(*artifact.bitset("states"))
+            self.occupations = BitColumn.from_packed(*artifact.bitset("occupations"))
+            self.scheme_types = BitColumn.from_packed(*artifact.bitset("scheme_types"))
+            def column(name: str) -> np.ndarray:
+                view = artifact.engine_column(name)
+                return np.frombuffer(view, dtype=view.format)
+
+            self.income_limit = column("income_limit")
+            self.min_age = column("min_age")
+            self.max_age = column("max_age")
+            self.base_priority = column("base_priority")
+            self.has_occupations = column("has_occupations").view(bool)
+            self.occupation_all = column("occupation_all").view(bool)
+            self.is_national = column("is_national").view(bool)
+        else:
+            self.targets = BitColumn([s.target_set for s in schemes])
+            self.states = BitColumn([s.states for s in schemes])
+            self.occupations = BitColumn([s.occupations for s in schemes])
+            self.scheme_types = BitColumn([(s.scheme_type,) for s in schemes])
+            self.income_limit = np.array([s.income_limit or 0 for s in schemes], dtype=np.float64)
+            self.min_age = np.array([s.min_age or 0 for s in schemes], dtype=np.float64)
+            self.max_age = np.array([s.max_age or 0 for s in schemes], dtype=np.float64)
+            self.base_priority = np.array([s.base_priority for s in schemes], dtype=np.int64)
+            self.has_occupations = np.array([s.has_occupations for s in schemes], dtype=bool)
+            self.occupation_all = np.array([s.occupation_all for s in schemes], dtype=bool)
+            self.is_national = np.array([s.is_national for s in schemes], dtype=bool)
+        self.women_specific = self.scheme_types.contains("women_specific")
+
+    def rank(self, profile: Dict[str, Any]) -> Iterator[Tuple[CompiledScheme, int, List[str], bool, bool, int]]:
+        """
+        Vectorized 40-30-20-10 scoring and ranking over the whole catalog. Yields
+        (scheme, score, matched_factors, is_primary, is_core_match, sort_priority) for every
+        scheme the Python engine keeps, with the core-match score floor applied, in the order
+        _rank_scored sorts them into: sort priority, then score descending, then catalog
+        position. Rows are ordered chunk by chunk, so a caller that stops after the first
+        matches never pays for sorting the rest or building their factor lists.
+        """
+        n = len(self.schemes)
+        none = np.zeros(n, dtype=bool)
+
+        user_cat = profile.get("category", "general")
+        user_gender = (profile.get("gender") or "unknown").lower()
+        occ_lower = str(profile["occupation"]).lower() if profile.get("occupation") else None
+        raw_state = profile.get("state")
+        user_state = str(raw_state).lower() if raw_state else ""
+        has_user_state = bool(user_state) and user_state != "unknown"
+        user_income = profile.get("income")
+        if not isinstance(user_income, (int, float)):
+            user_income = None
+        user_age = profile.get("age")
+
+        # Hard filters: category / general, women-specific and state
+        targeted = self.targets.contains(user_cat)
+        general = self.targets.contains("general")
+        keep = targeted | general
+        if user_gender != "female" and user_cat != "women":
+            keep &= ~self.women_specific
+        if has_user_state:
+            keep &= self.is_national | self.states.contains(user_state)
+        else:
+            keep &= self.is_national
+
+        # 1. Category
+        direct = targeted if user_cat != "general" else none
+        score = np.where(direct, 40, np.where(general, 20, 0)).astype(np.int64)
+        is_primary = none.copy()
+        for scheme_type, (bonus, primary) in CATEGORY_TYPE_BONUS.get(user_cat, {}).items():
+            hit = direct & self.scheme_types.contains(scheme_type)
+            score += bonus * hit
+            if primary:
+                is_primary |= hit
+        if user_cat == "student":
+            for scheme_type in STUDENT_PENALTY_TYPES:
+                score -= 20 * self.scheme_types.contains(scheme_type)
+
+        # 2. Occupation
+        occ_hit = self.has_occupations & self.occupations.contains(occ_lower) if occ_lower is not None else none
+        occ_general = ~occ_hit & (self.occupation_all | ~self.has_occupations)
+        score += 30 * occ_hit + 10 * occ_general
+
+        # 3. Income
+        no_limit = self.income_limit == 0
+        income_hit = ~no_limit & (user_income <= self.income_limit) if user_income else none
+        score += 30 * (income_hit | no_limit)
+
+        # 4. Age
+        if user_age:
+            age_ok = ~(((self.min_age != 0) & (user_age < self.min_age)) |
+                       ((self.max_age != 0) & (user_age > self.max_age)))
+        else:
+            age_ok = ~none
+        score += 20 * age_ok
+
+        # 5. State
+        state_specific = ~self.is_national if has_user_state else none
+        score += np.where(state_specific, 30, 10)
+
+        # Minimum Score Filter: 40
+        rows = np.flatnonzero(keep & (score >= 40))
+        if not len(rows):
+            return
+
+        # Ranking: core matches are floored at 75, state schemes sort first
+        core_type = CORE_MATCH_TYPES.get(user_cat)
+        is_core = self.scheme_types.contains(core_type) if core_type else none
+        final = np.where(is_core, np.maximum(score, 75), score)
+        priority = np.where(state_specific, -1, self.base_priority)
+        # One unique int64 per row: priority, then score descending (scores stay below
+        # MAX_SCORE), then position
+        keys = (priority[rows] * MAX_SCORE - final[rows]) * n + rows
+
+        category_factor = f"Category ({user_cat.capitalize()})" if user_cat != "general" and user_cat in self.targets.vocab else None
+        chunk = RANK_CHUNK
+        while len(rows):
+            if len(rows) > chunk:
+                split = np.argpartition(keys, chunk)
+                head, rest = split[:chunk], split[chunk:]
+            else:
+                head, rest = np.arange(len(rows)), None
+            head = head[np.argsort(keys[head])]
+            positions = rows[head]
+            columns = zip(
+                positions.tolist(), final[positions].tolist(), priority[positions].tolist(),
+                is_primary[positions].tolist(), is_core[positions].tolist(),
+                direct[positions].tolist(), general[positions].tolist(),
+                occ_hit[positions].tolist(), occ_general[positions].tolist(),
+                income_hit[positions].tolist(), no_limit[positions].tolist(),
+                age_ok[positions].tolist(), state_specific[positions].tolist(),
+            )
+            for pos, s, prio, primary, core, cat_direct, cat_general, occ, occ_gen, inc, inc_open, age, state in columns:
+                factors = []
+                if cat_direct:
+                    factors.append(category_factor)
+                elif cat_general:
+                    factors.append("Category (General)")
+                if occ:
+                    factors.append("Occupation")
+                elif occ_gen:
+                    factors.append("Occupation (General)")
+                if inc:
+                    factors.append("Income Level")
+                elif inc_open:
+                    factors.append("Income (No Limit)")
+                if age and user_age:
+                    factors.append("Age")
+                factors.append("State" if state else "Location (All India)")
+                yield self.schemes[pos], s, factors, primary, core, prio
+            if rest is None:
+                return
+            rows, keys = rows[rest], keys[rest]
+            chunk *= 4
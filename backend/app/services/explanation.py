@@ -1,46 +1,47 @@
 from typing import Dict, Any, List
+from app.services.catalog import CompiledScheme
+from app.services.scheme_text import (
+    EXPLANATION_DEFAULT, EXPLANATION_PREFIX, REASON_AGE, REASON_INCOME_UNKNOWN,
+    REASON_OCCUPATION, REASON_STATE,
+)
 
-def generate_explanation(profile: Dict[str, Any], scheme: Dict[str, Any], matched_factors: List[str]) -> str:
+def generate_explanation(profile: Dict[str, Any], scheme: CompiledScheme, matched_factors: List[str]) -> str:
     """
     Generates a simple, rural-friendly explanation text of why they match.
+    Scheme-only sentences (the income limit) are precomputed on the compiled scheme;
+    only profile values are filled in here.
     """
     reasons = []
-    
+
     # Check occupation
     if "Occupation" in matched_factors and profile.get("occupation"):
-        reasons.append(f"you are a {profile['occupation']}")
-        
+        reasons.append(REASON_OCCUPATION.format(occupation=profile['occupation']))
+
     # Check income
     if "Income Level" in matched_factors or "Income (No Limit)" in matched_factors:
         if profile.get("income"):
-            limit = scheme.get('income_limit')
-            if limit:
-                reasons.append(f"your income is below the ₹{limit} limit")
-            else:
-                reasons.append(f"your income meets the requirements")
+            reasons.append(scheme.income_reason)
         else:
-            reasons.append("you meet the financial requirements")
-            
+            reasons.append(REASON_INCOME_UNKNOWN)
+
     # Check age
     if "Age" in matched_factors and profile.get("age"):
-        reasons.append(f"your age ({profile['age']}) is eligible")
-        
-    # Check state
+        reasons.append(REASON_AGE.format(age=profile['age']))
+
+    # Check state (no need to mention it for "Location (All India)")
     if "State" in matched_factors and profile.get("state"):
-        reasons.append(f"you live in {profile['state'].title()}")
-    elif "Location (All India)" in matched_factors:
-         pass # No need to mention it if it's general
-         
+        reasons.append(REASON_STATE.format(state=profile['state'].title()))
+
     if not reasons:
-        return "You appear to be eligible based on the available scheme guidelines."
-        
-    explanation = "You likely qualify because "
-    
+        return EXPLANATION_DEFAULT
+
+    explanation = EXPLANATION_PREFIX
+
     if len(reasons) == 1:
         explanation += reasons[0] + "."
     elif len(reasons) == 2:
         explanation += reasons[0] + " and " + reasons[1] + "."
     else:
         explanation += ", ".join(reasons[:-1]) + ", and " + reasons[-1] + "."
-        
+
     return explanation
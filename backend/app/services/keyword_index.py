@@ -0,0 +1,170 @@
+import difflib
+import hashlib
+import json
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Upper bound on distinct tokens / n-grams remembered per index
+TOKEN_CACHE_SIZE = 8192
+
+
+class _Keyword:
+    __slots__ = ("text", "label_idx", "length", "bag")
+
+    def __init__(self, text: str, label_idx: int):
+        self.text = text
+        self.label_idx = label_idx
+        self.length = len(text)
+        self.bag = Counter(text)
+
+
+class FuzzyKeywordIndex:
+    """
+    Typo-tolerant keyword lookup built once at import time.
+
+    Keywords are bucketed by word count and character length, so a token is only
+    compared against keywords whose length can still reach the cutoff. Remaining
+    candidates are pruned with a character-bag bound before running the exact
+    difflib ratio, and every token's hits are memoized, so repeated words across
+    requests resolve with a single cache lookup. Tokens already seen in traffic can
+    be preloaded from a spelling table (see `load_table`), so known misspellings skip
+    the fuzzy scan even on a cold cache.
+
+    Results are identical to the difflib scans in `profile_extraction`
+    (`fuzzy_match` and `fuzzy_match_state`) for the same threshold.
+    """
+
+    def __init__(self, vocabulary: Dict[str, List[str]], threshold: float):
+        self.threshold = threshold
+        self.labels: List[str] = list(vocabulary.keys())
+        self._keywords: List[Tuple[str, ...]] = [tuple(kws) for kws in vocabulary.values()]
+
+        # word count -> character length -> keywords
+        self._buckets: Dict[int, Dict[int, List[_Keyword]]] = {}
+        for idx, kws in enumerate(self._keywords):
+            for kw in kws:
+                by_len = self._buckets.setdefault(len(kw.split()), {})
+                by_len.setdefault(len(kw), []).append(_Keyword(kw, idx))
+        self.word_counts = sorted(self._buckets)
+
+        self.lookup = lru_cache(maxsize=TOKEN_CACHE_SIZE)(self._scan)
+        # n-gram -> hits, precomputed offline by scripts/build_spelling_table.py
+        self.table: Dict[str, Tuple[Tuple[int, float, float], ...]] = {}
+
+    def fingerprint(self) -> str:
+        """Identifies the vocabulary and threshold, so a spelling table built for another one is not used."""
+        data = json.dumps([self.threshold, self.labels, self._keywords])
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def hits(self, text: str) -> Tuple[Tuple[int, float, float], ...]:
+        hits = self.table.get(text)
+        if hits is None:
+            hits = self.lookup(text)
+        return hits
+
+    def export_table(self, texts: List[str]) -> Dict[str, List[list]]:
+        """{text: [[label, score, reverse_ratio], ...]} for `texts` (an empty list when nothing matches)."""
+        return {text: [[self.labels[idx], score, reverse] for idx, score, reverse in self.lookup(text)] for text in texts}
+
+    def load_table(self, table: Dict[str, List[list]]) -> None:
+        """Installs a table produced by `export_table` for this vocabulary."""
+        label_idx = {label: idx for idx, label in enumerate(self.labels)}
+        self.table = {
+            text: tuple((label_idx[label], score, reverse) for label, score, reverse in hits)
+            for text, hits in table.items()
+        }
+
+    def _scan(self, text: str) -> Tuple[Tuple[int, float, float], ...]:
+        """
+        Returns (label_idx, score, reverse_ratio) for every keyword with the same word
+        count as `text` whose ratio reaches the threshold. `score` uses the argument
+        order of the original difflib code (token first for single words, keyword first
+        for n-grams) and `reverse_ratio` is the ratio with the keyword first.
+        """
+        by_len = self._buckets.get(text.count(" ") + 1)
+        if not by_len:
+            return ()
+
+        threshold = self.threshold
+        text_len = len(text)
+        text_bag = None
+        hits = []
+        for kw_len, entries in by_len.items():
+            # Length bound: ratio can never exceed 2 * min(len) / total (difflib's real_quick_ratio)
+            if 2.0 * min(text_len, kw_len) / (text_len + kw_len) < threshold:
+                continue
+            if text_bag is None:
+                text_bag = Counter(text)
+            for kw in entries:
+                # Character-bag bound (difflib's quick_ratio)
+                common = sum(min(count, kw.bag[ch]) for ch, count in text_bag.items())
+                if 2.0 * common / (text_len + kw_len) < threshold:
+                    continue
+                reverse_ratio = difflib.SequenceMatcher(None, kw.text, text).ratio()
+                if " " in text:
+                    score = reverse_ratio
+                else:
+                    score = difflib.SequenceMatcher(None, text, kw.text).ratio()
+                if score >= threshold:
+                    hits.append((kw.label_idx, score, reverse_ratio))
+        return tuple(hits)
+
+    def _ngrams(self, query_words: List[str], word_count: int, ngrams: Optional[Dict[int, List[str]]]):
+        if ngrams is not None:
+            # Shared across indexes by the caller (see query_scanner.QueryFeatures.ngrams)
+            return ngrams[word_count]
+        return [" ".join(query_words[i:i + word_count]) for i in range(len(query_words) - word_count + 1)]
+
+    def first_match(self, query_str: str, query_words: List[str],
+                    ngrams: Optional[Dict[int, List[str]]] = None) -> Optional[str]:
+        """
+        Returns the first label (in vocabulary order) for which `fuzzy_match` would succeed.
+        `ngrams` optionally maps a word count to the query's precomputed n-grams.
+        """
+        matched = set()
+        for idx, kws in enumerate(self._keywords):
+            if any(kw in query_str for kw in kws):
+                matched.add(idx)
+
+        for word_count in self.word_counts:
+            for ngram in self._ngrams(query_words, word_count, ngrams):
+                for label_idx, _, _ in self.hits(ngram):
+                    matched.add(label_idx)
+
+        if not matched:
+            return None
+        return self.labels[min(matched)]
+
+    def closest(self, query_words: List[str], ngrams: Optional[Dict[int, List[str]]] = None) -> Optional[str]:
+        """
+        Returns the best scoring label, following `fuzzy_match_state` tie-breaking rules.
+        """
+        # Single-word keywords: difflib.get_close_matches keeps the highest (score, word) pair
+        single_best: Dict[int, Tuple[float, str, float]] = {}
+        # Multi-word keywords: ratios in n-gram order
+        multi_hits: Dict[int, List[float]] = {}
+
+        for word_count in self.word_counts:
+            for ngram in self._ngrams(query_words, word_count, ngrams):
+                for label_idx, score, reverse_ratio in self.hits(ngram):
+                    if word_count == 1:
+                        current = single_best.get(label_idx)
+                        if current is None or (score, ngram) > current[:2]:
+                            single_best[label_idx] = (score, ngram, reverse_ratio)
+                    else:
+                        multi_hits.setdefault(label_idx, []).append(reverse_ratio)
+
+        best_match = None
+        best_ratio = 0.0
+        for idx in sorted(set(single_best) | set(multi_hits)):
+            if idx in single_best:
+                ratio = single_best[idx][2]
+                if ratio > best_ratio:
+                    best_ratio = ratio
+                    best_match = self.labels[idx]
+            for ratio in multi_hits.get(idx, ()):
+                if ratio > best_ratio:
+                    best_ratio = ratio
+                    best_match = self.labels[idx]
+        return best_match
@@ -1,6 +1,16 @@
-import re
 import difflib
-from typing import Dict, Any, List
+import json
+import math
+import os
+import re
+from typing import Dict, Any, List, Optional, Tuple
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.keyword_index import FuzzyKeywordIndex
+from app.services.query_scanner import (
+    FEMALE_MARKERS, LOW_INCOME_MARKERS, MALE_MARKERS, QueryFeatures, canonical_query, filler_pattern,
+)
+from app.services.spoken_numbers import income_multiplier, normalize_numbers, parse_income
 
 # Simple keyword mappings for demo purposes
 OCCUPATION_KEYWORDS = {
@@ -49,14 +59,129 @@ def fuzzy_match(query_words: List[str], keywords: List[str], threshold: float =
                     return True
     return False
 
-def extract_profile(query: str) -> Dict[str, Any]:
+def fuzzy_match_state(query_words: List[str], threshold: float = 0.86) -> Optional[str]:
+    """
+    Reference difflib scan for the closest state. `extract_profile` uses STATE_INDEX instead.
+    """
+    best_match = None
+    best_ratio = 0.0
+    for state in STATE_KEYWORDS:
+        state_len = len(state.split())
+        if state_len == 1:
+            matches = difflib.get_close_matches(state, query_words, n=1, cutoff=threshold)
+            if matches:
+                ratio = difflib.SequenceMatcher(None, state, matches[0]).ratio()
+                if ratio > best_ratio:
+                    best_ratio = ratio
+                    best_match = state
+        else:
+            for i in range(len(query_words) - state_len + 1):
+                ngram = " ".join(query_words[i:i+state_len])
+                ratio = difflib.SequenceMatcher(None, state, ngram).ratio()
+                if ratio >= threshold and ratio > best_ratio:
+                    best_ratio = ratio
+                    best_match = state
+    return best_match
+
+# Precompiled indexes, built once at import time (same results as the difflib scans above)
+OCCUPATION_INDEX = FuzzyKeywordIndex(OCCUPATION_KEYWORDS, threshold=0.8)
+CATEGORY_INDEX = FuzzyKeywordIndex(CATEGORY_KEYWORDS, threshold=0.8)
+STATE_INDEX = FuzzyKeywordIndex({state: [state] for state in STATE_KEYWORDS}, threshold=0.86)
+# Section names in the spelling table
+INDEXES = {"occupation": OCCUPATION_INDEX, "category": CATEGORY_INDEX, "state": STATE_INDEX}
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SPELLING_TABLE_PATH = os.path.join(BACKEND_DIR, settings.SPELLING_TABLE_PATH)
+
+def load_spelling_table(path: str = SPELLING_TABLE_PATH) -> int:
+    """
+    Preloads the keyword indexes with the token -> canonical table built offline from
+    logged queries (scripts/build_spelling_table.py), so known misspellings resolve with
+    one dict lookup. Sections built for a different vocabulary are skipped. Returns the
+    number of tokens loaded.
+    """
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sections = json.load(f).get("indexes", {})
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"Ignoring unreadable spelling table {path}: {e}")
+        return 0
+    loaded = 0
+    for name, index in INDEXES.items():
+        section = sections.get(name)
+        if not section:
+            continue
+        if section.get("fingerprint") != index.fingerprint():
+            print(f"Ignoring stale {name} spelling table in {path}: the vocabulary changed, rebuild it with scripts/build_spelling_table.py")
+            continue
+        index.load_table(section["tokens"])
+        loaded += len(index.table)
+    return loaded
+
+if load_spelling_table():
+    print(f"Loaded spelling table: {', '.join(f'{len(index.table)} {name}' for name, index in INDEXES.items())} tokens")
+
+# Exact state matching: first word -> (state, its words), in catalog order
+STATE_ORDER = {state: pos for pos, state in enumerate(STATE_KEYWORDS)}
+STATES_BY_FIRST_WORD: Dict[str, List[Tuple[str, List[str]]]] = {}
+for _state in STATE_KEYWORDS:
+    STATES_BY_FIRST_WORD.setdefault(_state.split()[0], []).append((_state, _state.split()))
+
+def _exact_state(features: QueryFeatures) -> Optional[str]:
+    """The first STATE_KEYWORDS entry that appears as whole, single-spaced words in the query."""
+    words = features.words
+    best_match = None
+    for pos, word in enumerate(words):
+        for state, state_words in STATES_BY_FIRST_WORD.get(word, ()):
+            if best_match is not None and STATE_ORDER[state] >= STATE_ORDER[best_match]:
+                continue
+            size = len(state_words)
+            if words[pos:pos + size] == state_words and features.exact_phrase(size, pos):
+                best_match = state
+    return best_match
+
+# Voice transcripts of the same request differ in case, punctuation and fillers; they
+# share one canonical text and so one cached profile (without raw_query)
+FILLER_RE = filler_pattern(settings.EXTRACTION_FILLER_WORDS.split(","))
+_EXTRACTION_CACHE = LRUCache(settings.EXTRACTION_CACHE_SIZE)
+
+def get_extraction_cache_stats() -> Dict[str, Any]:
+    return _EXTRACTION_CACHE.stats()
+
+def extract_profile(query: str, spoken_numbers: Optional[bool] = None) -> Dict[str, Any]:
     """
     Extracts profile attributes from text.
+
+    Extraction reads the canonical query text (canonical_query), so the result only
+    depends on it and is cached by it. With `spoken_numbers` (default
+    settings.SPOKEN_NUMBERS) number words count as digits and monthly incomes are
+    converted to yearly ones. Returns a new dict on every call.
+    """
+    if spoken_numbers is None:
+        spoken_numbers = settings.SPOKEN_NUMBERS
+    text = canonical_query(query, FILLER_RE)
+    key = (text, spoken_numbers)
+    profile = _EXTRACTION_CACHE.get(key)
+    if profile is None:
+        profile = _extract_canonical(text, spoken_numbers)
+        _EXTRACTION_CACHE.put(key, profile)
+    return {**profile, "raw_query": query}
+
+def _extract_canonical(text: str, spoken_numbers: bool) -> Dict[str, Any]:
+    """
+    The profile for a canonical query text, without raw_query.
+
+    The text is tokenized once (QueryFeatures); every step below reads that walk's
+    words, n-grams, digit runs and marker positions, so the cost stays linear in the
+    query length even for long transcripts.
     """
-    # Clean Input Normalization
-    query_lower = query.lower()
-    query_clean = re.sub(r'[^\w\s]', '', query_lower).strip()
-    query_words = query_clean.split()
+    # Canonical text is stripped, but gender markers (" woman", " man") start with a space:
+    # pad it back so a marker at the start still counts ("um woman farmer" -> "woman farmer")
+    features = QueryFeatures(" " + text, spoken_numbers)
+    query_words = features.words
+    query_str = features.query_str
     
     profile: Dict[str, Any] = {
         "occupation": None,
@@ -65,85 +190,47 @@ def extract_profile(query: str) -> Dict[str, Any]:
         "age": None,
         "gender": None,
         "category": "general",
-        "raw_query": query
     }
     
     # 1. Extract Occupation
-    for occ, keywords in OCCUPATION_KEYWORDS.items():
-        if fuzzy_match(query_words, keywords):
-            profile["occupation"] = occ
-            break
+    profile["occupation"] = OCCUPATION_INDEX.first_match(query_str, query_words, features.ngrams)
             
     # 2. Extract State (Strict Match > 86% Fuzzy Match)
-    best_match = None
-    best_ratio = 0.0
-
-    # Pass 1: Exact matches
-    for state in STATE_KEYWORDS:
-        if state == query_clean or f" {state} " in f" {query_clean} ":
-            best_match = state
-            best_ratio = 1.0
-            break
-            
-    # Pass 2: Fuzzy matching (only if no exact match, limit to >85%)
-    if not best_match:
-        for state in STATE_KEYWORDS:
-            state_len = len(state.split())
-            if state_len == 1:
-                matches = difflib.get_close_matches(state, query_words, n=1, cutoff=0.86)
-                if matches:
-                    ratio = difflib.SequenceMatcher(None, state, matches[0]).ratio()
-                    if ratio > best_ratio:
-                        best_ratio = ratio
-                        best_match = state
-            else:
-                for i in range(len(query_words) - state_len + 1):
-                    ngram = " ".join(query_words[i:i+state_len])
-                    ratio = difflib.SequenceMatcher(None, state, ngram).ratio()
-                    if ratio >= 0.86 and ratio > best_ratio:
-                        best_ratio = ratio
-                        best_match = state
-                        
+    # Pass 1: Exact matches, Pass 2: Fuzzy matching (only if no exact match, limit to >85%)
+    best_match = _exact_state(features) or STATE_INDEX.closest(query_words, features.ngrams)
     if best_match:
         profile["state"] = best_match
             
-    # 3. Extract Income (Basic Regex for numbers followed by income keywords)
-    # Looks for things like "income is 50000" or "50k income"
-    income_match = re.search(r'income.*?(\d{1,2}(?:,\d{3})+|\d+k|\d{2,})', query_lower)
-    if not income_match:
-        income_match = re.search(r'(\d{1,2}(?:,\d{3})+|\d+k|\d{2,}).*?income', query_lower)
-        
-    if income_match:
-        val_str = income_match.group(1).replace(',', '')
+    # 3. Extract Income (numbers after "income", else before it: "income is 50000" or "50k income")
+    income_span = features.find_income()
+    if income_span:
+        val_str = features.text[income_span[0]:income_span[1]].replace(',', '')
         if 'k' in val_str:
             val = int(val_str.replace('k', '')) * 1000
         else:
             val = int(val_str)
+        if spoken_numbers:
+            # Scheme income limits are yearly: "15000 per month" / "mahine ka 15000" -> 180000
+            val *= income_multiplier(features.text, *income_span)
         profile["income"] = val
     else:
         # Fallback keyword checks for income
-        if "low income" in query_lower or "poor" in query_lower:
+        if features.has_any(LOW_INCOME_MARKERS):
             profile["income"] = 50000 # Dummy value indicating low income
 
     # 4. Extract Age (Look for "X years old" or "age X")
-    age_match = re.search(r'(\d{1,3})\s*years?\s*old', query_lower)
-    if not age_match:
-        age_match = re.search(r'age.*?\b(\d{1,3})\b', query_lower)
-    if age_match:
-         profile["age"] = int(age_match.group(1))
+    age_str = features.find_age()
+    if age_str:
+         profile["age"] = int(age_str)
 
     # 5. Extract Gender
-    if any(word in query_lower for word in [" woman", "female", "girl", "widow", "lady", "aurat"]):
+    if features.has_any(FEMALE_MARKERS):
         profile["gender"] = "female"
-    elif any(word in query_lower for word in [" man", "male", "boy", "aadmi"]):
+    elif features.has_any(MALE_MARKERS):
         profile["gender"] = "male"
 
     # 6. Extract Category
-    category = "general"
-    for cat, keywords in CATEGORY_KEYWORDS.items():
-        if fuzzy_match(query_words, keywords):
-            category = cat
-            break
+    category = CATEGORY_INDEX.first_match(query_str, query_words, features.ngrams) or "general"
             
     # Age-based category override
     if profile.get("age") and profile["age"] >= 60:
@@ -161,6 +248,62 @@ def extract_profile(query: str) -> Dict[str, Any]:
 
     return profile
 
+_AGE_NUMBER_RE = re.compile(r"\d+")
+
+def _profile_income(value: Any) -> Any:
+    """A typed or picked income as a yearly number, "unknown" if it has none."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, type(None))):
+        raise ValueError(f"income must be a number or text, got {value!r}")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ValueError(f"income must be a finite number, got {value!r}")
+    if isinstance(value, str):
+        value = parse_income(value)
+    return value or "unknown"
+
+def _profile_age(value: Any) -> Optional[int]:
+    """A typed age ("25", "25 years", "sixty five") as an int, None if it has none."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, type(None))):
+        raise ValueError(f"age must be a number or text, got {value!r}")
+    if isinstance(value, str):
+        numbers = _AGE_NUMBER_RE.findall(normalize_numbers(value.lower()))
+        return int(numbers[0]) if numbers else None
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"age must be a whole number, got {value!r}")
+    return None if value is None else int(value)
+
+def normalize_profile(fields: Dict[str, Any], query: str = "") -> Dict[str, Any]:
+    """
+    A profile dict shaped like extract_profile's, from fields the user filled in or
+    corrected (e.g. EditProfilePanel): occupation mapped onto the extraction vocabulary
+    ("Labourer" -> "worker"), state and gender lowercased, income bands and typed numbers
+    read as yearly incomes ("₹1–2 lakh" -> 200000) and ages as ints, the same "unknown"
+    fallbacks, and a missing category derived from the occupation and age. Raises
+    ValueError for an income or age that is not a number or text.
+    """
+    occupation = fields.get("occupation")
+    if occupation and str(occupation).lower() != "unknown":
+        words = str(occupation).lower().split()
+        occupation = OCCUPATION_INDEX.first_match(" ".join(words), words) or str(occupation).lower()
+    age = _profile_age(fields.get("age"))
+    category = fields.get("category")
+    if not category:
+        words = str(occupation).lower().split() if occupation else []
+        category = CATEGORY_INDEX.first_match(" ".join(words), words) or "general"
+        # Same age override as extract_profile
+        if isinstance(age, (int, float)) and age >= 60:
+            category = "senior"
+    state = fields.get("state")
+    gender = fields.get("gender")
+    return {
+        "occupation": occupation or "unknown",
+        "income": _profile_income(fields.get("income")),
+        "state": str(state).lower() if state else "unknown",
+        "age": age,
+        "gender": str(gender).lower() if gender else None,
+        "category": category,
+        "raw_query": query,
+    }
+
 def generate_profile_summary(profile: Dict[str, Any]) -> str:
     summary = []
     if profile.get("occupation"):
@@ -0,0 +1,224 @@
+import re
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from app.services.spoken_numbers import normalize_numbers
+
+# Literal markers extract_profile looks for in the lowercased query. No marker starts with
+# a digit and no two start with the same character sequence, so a single walk finds every
+# occurrence (including ones inside other words, as the substring checks always did).
+INCOME_MARKER = "income"
+AGE_MARKER = "age"
+LOW_INCOME_MARKERS = ("low income", "poor")
+FEMALE_MARKERS = (" woman", "female", "girl", "widow", "lady", "aurat")
+MALE_MARKERS = (" man", "male", "boy", "aadmi")
+MARKERS = (INCOME_MARKER, AGE_MARKER, "\n") + LOW_INCOME_MARKERS + FEMALE_MARKERS + MALE_MARKERS
+
+# Digit runs are consumed whole; everywhere else a zero-width lookahead reports a marker start
+_SCAN_RE = re.compile(r"(\d+)|(?=(" + "|".join(re.escape(m) for m in MARKERS) + "))")
+_PUNCTUATION_RE = re.compile(r"[^\w\s]")
+_WORD_RE = re.compile(r"\S+")
+
+# Canonical query text: punctuation becomes a space, except "," and "." inside numbers ("50,000", "1.5")
+_CANONICAL_PUNCTUATION_RE = re.compile(r"[^\w\s.,]|(?<!\d)[.,]|[.,](?!\d)")
+_HORIZONTAL_SPACE_RE = re.compile(r"[^\S\n]+")
+_LINE_BREAK_RE = re.compile(r" ?\n\s*")
+
+
+def filler_pattern(words: Iterable[str]) -> Optional[Pattern[str]]:
+    """Regex matching any of `words` as a whole word, or None if there are none."""
+    words = sorted({w.strip().lower() for w in words if w.strip()}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile(r"(?<!\S)(?:" + "|".join(re.escape(w) for w in words) + r")(?!\S)")
+
+
+def canonical_query(query: str, fillers: Optional[Pattern[str]] = None) -> str:
+    """
+    The text extract_profile reads: lowercased, punctuation turned into spaces (keeping
+    "," and "." between digits), `fillers` dropped and whitespace collapsed. Line breaks
+    are kept, since the income and age rules work per line.
+    """
+    text = _CANONICAL_PUNCTUATION_RE.sub(" ", query.lower())
+    if fillers is not None:
+        text = fillers.sub(" ", text)
+    text = _HORIZONTAL_SPACE_RE.sub(" ", text)
+    return _LINE_BREAK_RE.sub("\n", text).strip()
+
+
+def _is_word_char(ch: str) -> bool:
+    # Same definition as the regex \w for str patterns
+    return ch.isalnum() or ch == "_"
+
+
+class _NGrams(dict):
+    """word count -> space-joined n-grams of the query words, built on first use."""
+
+    def __init__(self, words: List[str]):
+        super().__init__()
+        self.words = words
+
+    def __missing__(self, size: int) -> List[str]:
+        words = self.words
+        grams = [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+        self[size] = grams
+        return grams
+
+
+class QueryFeatures:
+    """
+    Everything extract_profile reads from a query, collected in one tokenizing walk:
+    digit runs and marker positions in the lowercased text (`text`, with spoken numbers
+    rewritten as digits when `spoken_numbers` is set), and the punctuation-free words and
+    n-grams that keyword and state matching use.
+
+    The finders below reproduce the regexes extract_profile used to run, with the same
+    results, but look at each line once, so the cost stays linear in the query length.
+    """
+    __slots__ = ("text", "clean", "words", "query_str", "ngrams", "runs", "run_ends", "markers", "newlines", "_spans")
+
+    def __init__(self, query: str, spoken_numbers: bool = False):
+        lower = query.lower()
+        self.clean = _PUNCTUATION_RE.sub("", lower).strip()
+        self.words = self.clean.split()
+        self.query_str = " ".join(self.words)
+        self._spans: Optional[List[Tuple[int, int]]] = None
+        self.ngrams = _NGrams(self.words)
+
+        self.text = text = normalize_numbers(lower) if spoken_numbers else lower
+        self.runs: List[Tuple[int, int]] = []
+        self.markers: Dict[str, List[int]] = {m: [] for m in MARKERS}
+        for m in _SCAN_RE.finditer(text):
+            if m.group(1):
+                self.runs.append(m.span(1))
+            else:
+                self.markers[m.group(2)].append(m.start())
+        self.run_ends = [e for _, e in self.runs]
+        self.newlines = self.markers["\n"]
+
+    def has_any(self, markers: Tuple[str, ...]) -> bool:
+        return any(self.markers[m] for m in markers)
+
+    def _line_end(self, pos: int) -> int:
+        i = bisect_right(self.newlines, pos)
+        return self.newlines[i] if i < len(self.newlines) else len(self.text)
+
+    def _first_lines(self, positions: List[int]):
+        """The first marker position on each line, in order."""
+        line_end = -1
+        for pos in positions:
+            if pos > line_end:
+                line_end = self._line_end(pos)
+                yield pos, line_end
+
+    def _number_at(self, q: int, e: int) -> Optional[Tuple[int, int]]:
+        """
+        The span `\\d{1,2}(?:,\\d{3})+|\\d+k|\\d{2,}` matches at q, inside the digit run ending
+        at e, or None. The alternatives are tried in that order, as the regex would.
+        """
+        text = self.text
+        nxt = text[e:e + 1]
+        if nxt == "," and e - q <= 2:
+            end = e
+            while text[end:end + 1] == "," and len(text[end + 1:end + 4]) == 3 and text[end + 1:end + 4].isdecimal():
+                end += 4
+            if end > e:
+                return q, end
+        if nxt == "k":
+            return q, e + 1
+        if e - q >= 2:
+            return q, e
+        return None
+
+    def _first_number(self, start: int, stop: int) -> Optional[Tuple[int, int]]:
+        """Leftmost income-number match starting in [start, stop)."""
+        runs = self.runs
+        for i in range(bisect_right(self.run_ends, start), len(runs)):
+            s, e = runs[i]
+            if s >= stop:
+                break
+            q = max(s, start)
+            if q >= stop:
+                break
+            # If the first candidate of a run fails (a lone trailing digit), so do the rest
+            value = self._number_at(q, e)
+            if value is not None:
+                return value
+        return None
+
+    def find_income(self) -> Optional[Tuple[int, int]]:
+        """
+        The span of the number `income.*?(NUM)` captures in `text`, else of the one
+        `(NUM).*?income` captures (`.` never crosses a newline).
+        """
+        for pos, line_end in self._first_lines(self.markers[INCOME_MARKER]):
+            value = self._first_number(pos + len(INCOME_MARKER), line_end)
+            if value is not None:
+                return value
+
+        # The number has to start before the last "income" of its line
+        incomes = self.markers[INCOME_MARKER]
+        line_start = 0
+        for line_end in self.newlines + [len(self.text)]:
+            i = bisect_left(incomes, line_end)
+            if i and incomes[i - 1] >= line_start:
+                value = self._first_number(line_start, incomes[i - 1])
+                if value is not None:
+                    return value
+            line_start = line_end + 1
+        return None
+
+    def find_age(self) -> Optional[str]:
+        """The digits `(\\d{1,3})\\s*years?\\s*old` captures, else those of `age.*?\\b(\\d{1,3})\\b`."""
+        text = self.text
+        n = len(text)
+        for s, e in self.runs:
+            j = e
+            while j < n and text[j].isspace():
+                j += 1
+            if not text.startswith("year", j):
+                continue
+            j += 4
+            if text.startswith("s", j):
+                j += 1
+            while j < n and text[j].isspace():
+                j += 1
+            if text.startswith("old", j):
+                return text[max(s, e - 3):e]
+
+        runs = self.runs
+        for pos, line_end in self._first_lines(self.markers[AGE_MARKER]):
+            start = pos + len(AGE_MARKER)
+            for i in range(bisect_right(self.run_ends, start), len(runs)):
+                s, e = runs[i]
+                if s >= line_end:
+                    break
+                if s < start:
+                    continue
+                if e - s <= 3 and not _is_word_char(text[s - 1]) and (e == n or not _is_word_char(text[e])):
+                    return text[s:e]
+        return None
+
+    def exact_phrase(self, phrase_words: int, position: int) -> bool:
+        """
+        True if the `phrase_words` words starting at word `position` appear in the cleaned
+        query separated by single spaces, with a space (or the query edge) on both sides,
+        i.e. `f" {phrase} " in f" {clean} "` holds for this occurrence.
+        """
+        clean = self.clean
+        if clean == self.query_str:
+            # Only single spaces between words: every occurrence qualifies
+            return True
+        if self._spans is None:
+            self._spans = [m.span() for m in _WORD_RE.finditer(clean)]
+        spans = self._spans
+        first = spans[position][0]
+        last = spans[position + phrase_words - 1][1]
+        if first and clean[first - 1] != " ":
+            return False
+        if last < len(clean) and clean[last] != " ":
+            return False
+        for k in range(position, position + phrase_words - 1):
+            end = spans[k][1]
+            if spans[k + 1][0] != end + 1 or clean[end] != " ":
+                return False
+        return True
@@ -1,85 +1,179 @@
-from typing import List, Dict, Any
+from bisect import bisect_left
+from typing import List, Dict, Any, Hashable, Iterable, Iterator, Optional, Tuple
+from app.core.cache import LRUCache
+from app.core.config import settings
 from app.db.supabase import supabase_client
 from app.services.explanation import generate_explanation
+from app.services.scheme_text import SIMPLE_REASON_DEFAULT, SIMPLE_REASON_INCOME, SIMPLE_REASON_OCCUPATION
+from app.services.catalog import CompiledScheme, SchemeIndex
+from app.services.catalog_registry import CatalogRegistry, CatalogSnapshot
+from app.services.catalog_artifact import CatalogArtifact, file_digest
 from app.models.schemas import SchemeMatch
 
 import json
 import os
 
-_CACHED_SCHEMES = []
-_DB_STATUS = "disconnected"
+# Current catalog snapshot; the numpy engine's columnar copy is built per snapshot
+catalog_registry = CatalogRegistry(columnar=settings.MATCHING_ENGINE == "numpy")
+_MATCH_CACHE = LRUCache(settings.MATCH_CACHE_SIZE)
+# Per-factor score columns over a candidate list, keyed by the values each factor reads
+_FACTOR_CACHE = LRUCache(settings.FACTOR_CACHE_SIZE)
+# Entries are keyed by version (factor columns by its index) anyway; clearing on swap just frees the old ones
+catalog_registry.on_swap(lambda snapshot: _MATCH_CACHE.clear())
+catalog_registry.on_swap(lambda snapshot: _FACTOR_CACHE.clear())
+
+EXPLICIT_TRAINING_KEYWORDS = ["job", "employment", "skill training", "unemployment", "skill"]
+
+# (scheme, score, matched_factors, is_primary, is_state_specific)
+ScoredScheme = Tuple[CompiledScheme, int, List[str], bool, bool]
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+FALLBACK_PATH = os.path.join(BACKEND_DIR, "data", "fallback_schemes.json")
+ARTIFACT_PATH = os.path.join(BACKEND_DIR, settings.CATALOG_ARTIFACT_PATH)
+
+def _fetch_live_schemes() -> List[Dict[str, Any]]:
+    if not supabase_client:
+        raise ValueError("Supabase client not initialized")
+    return supabase_client.table("schemes").select("*").execute().data
+
+def _read_fallback_schemes() -> List[Dict[str, Any]]:
+    with open(FALLBACK_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _read_artifact() -> Optional[CatalogArtifact]:
+    """The compiled catalog artifact, or None if it is missing, unreadable or older than the fallback JSON."""
+    if not os.path.exists(ARTIFACT_PATH):
+        return None
+    try:
+        artifact = CatalogArtifact(ARTIFACT_PATH)
+    except Exception as e:
+        print(f"Ignoring unreadable catalog artifact {ARTIFACT_PATH}: {e}")
+        return None
+    if os.path.exists(FALLBACK_PATH) and artifact.source_digest != file_digest(FALLBACK_PATH):
+        print(f"Ignoring stale catalog artifact {ARTIFACT_PATH}: rebuild it with scripts/compile_catalog.py")
+        return None
+    return artifact
+
+def _install_local_catalog(source: str) -> None:
+    """Installs the memory-mapped artifact when it is current, else the parsed fallback JSON."""
+    artifact = _read_artifact()
+    if artifact is not None:
+        catalog_registry.install(artifact.rows(), source, artifact=artifact)
+    else:
+        catalog_registry.install(_read_fallback_schemes(), source)
+
+def load_local_snapshot() -> bool:
+    """
+    Loads the local fallback catalog without touching the network, so the service can
+    answer requests before Supabase has been reached. Returns False if it is unreadable.
+    """
+    try:
+        _install_local_catalog("fallback")
+    except Exception as e:
+        print(f"FAILED to load local catalog snapshot: {e}")
+        return False
+    return True
+
+def refresh_from_supabase() -> bool:
+    """Fetches the live catalog and swaps it in if its content changed."""
+    return catalog_registry.refresh(_fetch_live_schemes)
+
+def start_catalog_refresh() -> None:
+    """Refreshes from Supabase in the background now and every CATALOG_REFRESH_INTERVAL seconds."""
+    catalog_registry.start_refresh(_fetch_live_schemes, settings.CATALOG_REFRESH_INTERVAL)
 
 def load_schemes_cache():
-    global _CACHED_SCHEMES, _DB_STATUS
     try:
-        if not supabase_client:
-            raise ValueError("Supabase client not initialized")
-        response = supabase_client.table("schemes").select("*").execute()
-        _CACHED_SCHEMES = response.data
-        _DB_STATUS = "connected"
-        print("Successfully loaded schemes from Supabase.")
+        schemes = _fetch_live_schemes()
     except Exception as e:
         print(f"Error connecting to Supabase: {e}. Falling back to local schemes map.")
-        _DB_STATUS = "fallback"
-        # Try local fallback
-        fallback_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "fallback_schemes.json")
+        # Try local fallback (the compiled artifact when it is current)
         try:
-            with open(fallback_path, 'r', encoding='utf-8') as f:
-                _CACHED_SCHEMES = json.load(f)
-            print("Successfully loaded schemes from local fallback JSON.")
+            _install_local_catalog("fallback")
+            print("Successfully loaded schemes from local fallback catalog.")
         except Exception as fe:
             print(f"FAILED to load fallback JSON natively: {fe}")
-            _CACHED_SCHEMES = []
+            catalog_registry.install([], "fallback")
+        return
+    catalog_registry.install(schemes, "supabase")
+    print("Successfully loaded schemes from Supabase.")
 
-def get_cached_schemes():
-    global _CACHED_SCHEMES
-    if not _CACHED_SCHEMES:
+def get_catalog() -> CatalogSnapshot:
+    """The current catalog snapshot. Take it once per request and pass it along."""
+    snapshot = catalog_registry.current()
+    if not snapshot.schemes:
         load_schemes_cache()
-    return _CACHED_SCHEMES
+        snapshot = catalog_registry.current()
+    return snapshot
 
-def match_schemes(profile: Dict[str, Any]) -> List[SchemeMatch]:
-    """
-    Fetches schemes from memory cache and applies the 40-30-20-10 scoring logic.
-    """
-    schemes = get_cached_schemes()
-    
-    if not schemes:
-        return []
+def get_cached_schemes() -> Tuple[Dict[str, Any], ...]:
+    return get_catalog().raw
 
-    ranked = []
-    
+def get_compiled_schemes() -> Tuple[CompiledScheme, ...]:
+    return get_catalog().schemes
+
+def get_scheme_index() -> SchemeIndex:
+    return get_catalog().index
+
+def _factor_inputs(profile: Dict[str, Any]) -> Dict[str, Hashable]:
+    """The normalized profile values each scoring factor reads (see FACTOR_FIELDS)."""
+    user_cat = profile.get("category", "general")
+    user_gender = (profile.get("gender") or "unknown").lower()
+    raw_state = profile.get("state")
+    user_state = str(raw_state).lower() if raw_state else ""
+    user_income = profile.get("income")
+    if not isinstance(user_income, (int, float)):
+        user_income = None
+    return {
+        "category": (user_cat, user_gender == "female" or user_cat == "women"),
+        "occupation": str(profile["occupation"]).lower() if profile.get("occupation") else None,
+        "income": user_income,
+        "age": profile.get("age"),
+        "state": user_state if user_state and user_state != "unknown" else None,
+    }
+
+# Each factor scores a scheme list into one entry per scheme: (points, matched factor or None,
+# flag), or None where the factor's hard filter excludes the scheme. The flag is is_primary for
+# the category and is_state_specific for the state. Entries are shared tuples, so a cached
+# column costs one pointer per scheme.
+FactorColumn = List[Optional[Tuple[int, Optional[str], bool]]]
+_NO_POINTS = (0, None, False)
+_OCCUPATION = (30, "Occupation", False)
+_OCCUPATION_GENERAL = (10, "Occupation (General)", False)
+_INCOME_LEVEL = (30, "Income Level", False)
+_INCOME_NO_LIMIT = (30, "Income (No Limit)", False)
+_AGE = (20, "Age", False)
+_AGE_NOT_GIVEN = (20, None, False)
+_STATE = (30, "State", True)
+_ALL_INDIA = (10, "Location (All India)", False)
+
+def _score_category(schemes: Tuple[CompiledScheme, ...], inputs: Tuple[Any, bool]) -> FactorColumn:
+    user_cat, women_eligible = inputs
+    column: FactorColumn = []
+    outcomes: Dict[Tuple[int, Optional[str], bool], Tuple[int, Optional[str], bool]] = {}
     for scheme in schemes:
         score = 0
-        matched_factors = []
+        factor = None
         
         # 1. Strict Category / Target Group Pre-Filter (and Scoring)
-        scheme_targets = scheme.get("target_groups") or []
-        user_cat = profile.get("category", "general")
-        scheme_type = scheme.get("scheme_type", "general")
-        
-        # Hardcode explicit type classification to override any stale DB tags
-        raw_name = scheme.get("name")
-        scheme_name_lower = str(raw_name).lower() if raw_name else ""
-        if "bima" in scheme_name_lower or "insurance" in scheme_name_lower:
-            scheme_type = "insurance"
-        elif "pension" in scheme_name_lower:
-            scheme_type = "pension"
-            
-        user_gender = (profile.get("gender") or "unknown").lower()
+        scheme_targets = scheme.target_set
+        scheme_type = scheme.scheme_type
         
         # Women-Specific Filter
-        if scheme_type == "women_specific" and user_gender != "female" and user_cat != "women":
+        if scheme_type == "women_specific" and not women_eligible:
+            column.append(None)
             continue
             
         # STOP: Hard Filter - if scheme doesn't target the user's category AND isn't general, skip entirely
         if user_cat not in scheme_targets and "general" not in scheme_targets:
+            column.append(None)
             continue
             
         # Give points for direct match vs general
         is_primary = False
         if user_cat in scheme_targets and user_cat != "general":
             score += 40
-            matched_factors.append(f"Category ({user_cat.capitalize()})")
+            factor = f"Category ({user_cat.capitalize()})"
             
             # Dynamic Priority Scoring
             if user_cat == "student":
@@ -107,44 +201,54 @@ def match_schemes(profile: Dict[str, Any]) -> List[SchemeMatch]:
                 is_primary = True
         elif "general" in scheme_targets:
             score += 20  # Partial points for general schemes
-            matched_factors.append("Category (General)")
+            factor = "Category (General)"
             
         if user_cat == "student" and scheme_type in ["insurance", "general", "pension"]:
             score -= 20
-            
-        # 2. Occupation Match (30 pts)
-        if profile.get("occupation") and scheme.get("eligible_occupations"):
-            occ_lower = str(profile["occupation"]).lower()
-            eligible_occs = [str(o).lower() for o in scheme["eligible_occupations"] if o]
-            if occ_lower in eligible_occs:
-                score += 30
-                matched_factors.append("Occupation")
-            elif "all" in eligible_occs:
-                 score += 10 # Only give 10 points for a generic "all" match to prevent it dominating
-                 matched_factors.append("Occupation (General)")
-        elif not scheme.get("eligible_occupations") or "all" in [str(o).lower() for o in scheme.get("eligible_occupations", []) if o]:
+        entry = (score, factor, is_primary)
+        column.append(outcomes.setdefault(entry, entry))
+    return column
+
+def _score_occupation(schemes: Tuple[CompiledScheme, ...], occ_lower: Optional[str]) -> FactorColumn:
+    # 2. Occupation Match (30 pts)
+    column: FactorColumn = []
+    for scheme in schemes:
+        if occ_lower is not None and scheme.has_occupations:
+            if occ_lower in scheme.occupations:
+                column.append(_OCCUPATION)
+            elif scheme.occupation_all:
+                 # Only give 10 points for a generic "all" match to prevent it dominating
+                 column.append(_OCCUPATION_GENERAL)
+            else:
+                column.append(_NO_POINTS)
+        elif not scheme.has_occupations or scheme.occupation_all:
             # Give points if scheme is highly generic
-            score += 10
-            matched_factors.append("Occupation (General)")
-            
-        # 2. Income Eligibility (30 pts)
-        scheme_income_limit = scheme.get("income_limit")
+            column.append(_OCCUPATION_GENERAL)
+        else:
+            column.append(_NO_POINTS)
+    return column
+
+def _score_income(schemes: Tuple[CompiledScheme, ...], user_income: Optional[float]) -> FactorColumn:
+    # 2. Income Eligibility (30 pts)
+    column: FactorColumn = []
+    for scheme in schemes:
+        scheme_income_limit = scheme.income_limit
         if scheme_income_limit:
-            if profile.get("income") and isinstance(profile["income"], (int, float)):
-                if profile["income"] <= scheme_income_limit:
-                    score += 30
-                    matched_factors.append("Income Level")
+            if user_income and user_income <= scheme_income_limit:
+                column.append(_INCOME_LEVEL)
             else:
-                 # If income limit exists but user didn't provide income or it's unknown, give partial/no points
-                 pass
+                # If income limit exists but user didn't provide income or it's unknown, give no points
+                column.append(_NO_POINTS)
         else:
-             score += 30 # No income limit = anyone eligible
-             matched_factors.append("Income (No Limit)")
-             
-        # 3. Age Eligibility (20 pts)
-        user_age = profile.get("age")
-        min_age = scheme.get("min_age")
-        max_age = scheme.get("max_age")
+             column.append(_INCOME_NO_LIMIT) # No income limit = anyone eligible
+    return column
+
+def _score_age(schemes: Tuple[CompiledScheme, ...], user_age: Any) -> FactorColumn:
+    # 3. Age Eligibility (20 pts)
+    column: FactorColumn = []
+    for scheme in schemes:
+        min_age = scheme.min_age
+        max_age = scheme.max_age
         
         age_eligible = True
         if user_age:
@@ -152,179 +256,286 @@ def match_schemes(profile: Dict[str, Any]) -> List[SchemeMatch]:
             if max_age and user_age > max_age: age_eligible = False
             
         if age_eligible:
-            score += 20
-            if user_age:
-                 matched_factors.append("Age")
-        
-        # 4. Strict State / Region Relevance Filter (10 pts or Exclude)
-        raw_state = profile.get("state")
-        user_state = str(raw_state).lower() if raw_state else ""
-        
-        raw_scheme_states = scheme.get("states") or ["all"]
-        scheme_states = [str(s).lower() for s in raw_scheme_states if s]
-        is_national = any(ns in scheme_states for ns in ["all", "national", "india", "central"])
-        is_state_specific = False
+            column.append(_AGE if user_age else _AGE_NOT_GIVEN)
+        else:
+            column.append(_NO_POINTS)
+    return column
+
+def _score_state(schemes: Tuple[CompiledScheme, ...], user_state: Optional[str]) -> FactorColumn:
+    # 4. Strict State / Region Relevance Filter (10 pts or Exclude)
+    column: FactorColumn = []
+    for scheme in schemes:
+        is_national = scheme.is_national
         
         # If the user provided a state and the scheme is not "all" or "national" or "india", it MUST match.
-        if user_state and user_state != "unknown":
-            if not is_national and user_state not in scheme_states:
+        if user_state is not None:
+            if not is_national and user_state not in scheme.states:
                 # Failing explicit state check -> completely exclude scheme
-                continue 
-                
-            if user_state in scheme_states and not is_national:
-                score += 30  # Give a huge boost to state specific schemes
-                matched_factors.append("State")
-                is_state_specific = True
-            elif is_national:
-                score += 10
-                matched_factors.append("Location (All India)")
+                column.append(None)
+            elif not is_national:
+                column.append(_STATE)  # Give a huge boost to state specific schemes
+            else:
+                column.append(_ALL_INDIA)
+        elif not is_national:
+            # Failing explicit state check (scheme is specific but user state unknown) -> completely exclude scheme
+            column.append(None)
         else:
-            # User state unknown
-            if not is_national:
-                # Failing explicit state check (scheme is specific but user state unknown) -> completely exclude scheme
-                continue
-                
-            if is_national:
-                score += 10
-                matched_factors.append("Location (All India)")
-            
+            column.append(_ALL_INDIA)
+    return column
+
+# Profile fields each scoring factor reads, in scoring (and matched_factors) order.
+# A factor's cached column is reused until one of its fields changes.
+FACTOR_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "category": ("category", "gender"),
+    "occupation": ("occupation",),
+    "income": ("income",),
+    "age": ("age",),
+    "state": ("state",),
+}
+_FACTOR_SCORERS = {
+    "category": _score_category,
+    "occupation": _score_occupation,
+    "income": _score_income,
+    "age": _score_age,
+    "state": _score_state,
+}
+
+def _combine_factors(schemes: Tuple[CompiledScheme, ...], columns: List[FactorColumn]) -> Iterator[ScoredScheme]:
+    """Adds up the factor columns and yields every scheme no factor excludes that scores at least 40."""
+    for scheme, category, occupation, income, age, state in zip(schemes, *columns):
+        if category is None or state is None:
+            continue
+        score = category[0] + occupation[0] + income[0] + age[0] + state[0]
+        # Minimum Score Filter: 40
+        if score >= 40:
+            matched_factors = [entry[1] for entry in (category, occupation, income, age, state) if entry[1] is not None]
+            yield scheme, score, matched_factors, category[2], state[2]
+
+def _score_python(index: SchemeIndex, profile: Dict[str, Any]) -> Iterator[ScoredScheme]:
+    """
+    Default engine: scores the indexed candidates factor by factor and yields every scheme
+    that passes the hard filters with a score of at least 40. Factor columns are cached per
+    candidate list, so a profile that differs from an earlier one in a few fields only
+    scores those factors again.
+    """
+    inputs = _factor_inputs(profile)
+    user_cat, women_eligible = inputs["category"]
+    # Only schemes that can pass the category / women-specific / state hard filters
+    candidates_key = (user_cat, inputs["state"], women_eligible)
+    schemes = index.candidates(*candidates_key)
+    columns = []
+    for factor, score in _FACTOR_SCORERS.items():
+        value = inputs[factor]
+        if factor == "income":
+            # Incomes within one band between the catalog's income limits score the same (0 as no income)
+            key_value = bisect_left(index.income_limits, value) if value else None
+        else:
+            key_value = value
+        # Keyed by the index itself: stand-in indexes (benchmarks, tests) share version numbers
+        key = (index, candidates_key, factor, key_value)
+        column = _FACTOR_CACHE.get(key)
+        if column is None:
+            column = score(schemes, value)
+            _FACTOR_CACHE.put(key, column)
+        columns.append(column)
+    return _combine_factors(schemes, columns)
+
+def get_match_cache_stats() -> Dict[str, Any]:
+    return _MATCH_CACHE.stats()
+
+def get_factor_cache_stats() -> Dict[str, Any]:
+    return _FACTOR_CACHE.stats()
+
+def _profile_signature(profile: Dict[str, Any], income_limits: Tuple[int, ...]) -> Hashable:
+    """
+    Canonical key for everything match_schemes reads from a profile. Income is reduced to
+    its band between the catalog's distinct income limits; the other fields are kept as-is
+    because they are echoed in the explanation text.
+    """
+    income = profile.get("income")
+    if not income:
+        income_band = None
+    elif isinstance(income, (int, float)):
+        income_band = bisect_left(income_limits, income)
+    else:
+        income_band = "unverified"
+        
+    query_text = profile.get("raw_query", "").lower()
+    return (
+        profile.get("category", "general"),
+        profile.get("occupation"),
+        income_band,
+        profile.get("age"),
+        profile.get("state"),
+        (profile.get("gender") or "unknown").lower() == "female",
+        any(kw in query_text for kw in EXPLICIT_TRAINING_KEYWORDS),
+    )
+
+def match_cache_key(profile: Dict[str, Any], catalog: CatalogSnapshot) -> Hashable:
+    """Two profiles with the same key get the same ranked schemes from the same catalog."""
+    return catalog.version, _profile_signature(profile, catalog.index.income_limits)
+
+def changed_factors(profile: Dict[str, Any], previous: Dict[str, Any]) -> List[str]:
+    """The scoring factors (FACTOR_FIELDS order) that read a field differing between the two profiles."""
+    return [factor for factor, fields in FACTOR_FIELDS.items()
+            if any(profile.get(f) != previous.get(f) for f in fields)]
+
+def rematch_schemes(profile: Dict[str, Any], catalog: Optional[CatalogSnapshot] = None) -> List[SchemeMatch]:
+    """
+    match_schemes for profiles being edited field by field. Always scores with the Python
+    engine, whose per-factor columns are cached (including by /full-analysis requests on
+    that engine), so after an edit only the factors whose fields changed are scored again.
+    Returns the same schemes as match_schemes.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    
+    if not catalog.schemes:
+        return []
+
+    key = match_cache_key(profile, catalog)
+    matches = _MATCH_CACHE.get(key)
+    if matches is None:
+        matches = _rank_scored(profile, _score_python(catalog.index, profile))
+        _MATCH_CACHE.put(key, matches)
+    return [m.model_copy() for m in matches]
+
+def match_schemes(profile: Dict[str, Any], catalog: Optional[CatalogSnapshot] = None) -> List[SchemeMatch]:
+    """
+    Fetches schemes from memory cache and applies the 40-30-20-10 scoring logic.
+    Scores with the engine chosen by MATCHING_ENGINE. Ranked results are cached per
+    catalog version and profile signature. Pass `catalog` to match several profiles
+    against the same catalog snapshot.
+    """
+    if catalog is None:
+        catalog = get_catalog()
+    
+    if not catalog.schemes:
+        return []
+
+    key = match_cache_key(profile, catalog)
+    matches = _MATCH_CACHE.get(key)
+    if matches is None:
+        matches = _rank_schemes(catalog, profile)
+        _MATCH_CACHE.put(key, matches)
+    # Callers adjust confidence in place, so hand out copies
+    return [m.model_copy() for m in matches]
+
+class RankedScheme:
+    """
+    Lightweight scoring result carried through ranking and normalization. Explanation
+    text and the SchemeMatch model are only built for the schemes that are returned.
+    """
+    __slots__ = ("scheme", "score", "matched_factors", "is_primary", "is_core_match",
+                 "sort_priority", "confidence", "recommendation_level")
+
+    def __init__(self, scheme: CompiledScheme, score: int, matched_factors: List[str],
+                 is_primary: bool, is_core_match: bool, sort_priority: int):
+        self.scheme = scheme
+        self.score = score
+        self.matched_factors = matched_factors
+        self.is_primary = is_primary
+        self.is_core_match = is_core_match
+        self.sort_priority = sort_priority
+        self.confidence = "Low"
+        self.recommendation_level = "primary"
+
+def _simple_reason(profile: Dict[str, Any], scheme: CompiledScheme, matched_factors: List[str]) -> str:
+    # Type based reasons (and the general label) are resolved when the catalog compiles
+    if scheme.simple_reason is not None:
+        return scheme.simple_reason
+    if "Occupation" in matched_factors and profile.get("occupation") and profile["occupation"] != "unknown":
+        return SIMPLE_REASON_OCCUPATION.format(occupation=profile["occupation"])
+    if "Income Level" in matched_factors or "Income (No Limit)" in matched_factors:
+        return SIMPLE_REASON_INCOME
+    return SIMPLE_REASON_DEFAULT
+
+def _build_match(profile: Dict[str, Any], item: RankedScheme) -> SchemeMatch:
+    scheme = item.scheme
+    match = SchemeMatch(
+        name=scheme.name,
+        score=item.score,
+        confidence=item.confidence,
+        # Map the normalized backend confidence directly to frontend eligibilityScore expectation ("high", "medium", "low")
+        eligibilityScore=item.confidence.lower(),
         # Generate explanations via service
-        reason = generate_explanation(profile, scheme, matched_factors)
+        reason=generate_explanation(profile, scheme, item.matched_factors),
+        simple_reason=_simple_reason(profile, scheme, item.matched_factors),
+        documents=list(scheme.documents),
+        benefit=scheme.benefit_summary,
+        steps=list(scheme.apply_steps),
+        matched_factors=item.matched_factors,
+        target_groups=list(scheme.target_groups),
+        estimated_value=scheme.estimated_value,
+        official_url=scheme.official_url,
+        sample_form_url=scheme.sample_form_url,
+        recommendation_level=item.recommendation_level
+    )
+    match._catalog_position = scheme.position
+    return match
+
+def _rank_schemes(catalog: CatalogSnapshot, profile: Dict[str, Any]) -> List[SchemeMatch]:
+    if catalog.columnar is not None:
+        # Already in ranking order, so only the rows the final pick reads get materialized
+        return _pick_matches(profile, (RankedScheme(*row) for row in catalog.columnar.rank(profile)))
+    return _rank_scored(profile, _score_python(catalog.index, profile))
+
+def _rank_scored(profile: Dict[str, Any], scored: Iterable[ScoredScheme]) -> List[SchemeMatch]:
+    ranked: List[RankedScheme] = []
+    user_cat = profile.get("category", "general")
+    
+    for scheme, score, matched_factors, is_primary, is_state_specific in scored:
+        scheme_type = scheme.scheme_type
         
-        # Determine simple reason based on occupation priority
-        simple_reason = "This scheme matches your profile."
-        if "general" in scheme_targets or scheme_type in ["insurance", "general"]:
-            simple_reason = "Available to all eligible citizens."
-        elif scheme_type == "education":
-            simple_reason = "This scholarship helps students pay school or college fees."
-        elif scheme_type == "training":
-            simple_reason = "This program offers skill training for employment."
-        elif scheme_type == "farmer_support":
-            simple_reason = "This scheme provides direct support to farmers for agriculture."
-        elif scheme_type == "financial_support":
-            simple_reason = "This scheme offers financial assistance for your needs."
-        elif scheme_type == "housing":
-            simple_reason = "This scheme helps with housing and accommodation."
-        elif scheme_type == "health":
-            simple_reason = "This scheme provides health and medical benefits."
-        elif scheme_type == "pension":
-            simple_reason = "This provides regular pension or retirement benefits."
-        elif scheme_type == "women_specific":
-            simple_reason = "This is a dedicated welfare scheme for women."
-        elif "Occupation" in matched_factors and profile.get("occupation") and profile["occupation"] != "unknown":
-            simple_reason = f"You are a {profile['occupation']}, so this scheme suits you."
-        elif "Income Level" in matched_factors or "Income (No Limit)" in matched_factors:
-            simple_reason = "Based on your income, this scheme is a good fit."
+        # Priority for sorting (the per-type part is precomputed on the scheme)
+        sort_priority = -1 if is_state_specific else scheme.base_priority
             
-        # Determine estimated value
-        estimated_value = None
-        benefit_text = scheme.get("benefit_summary", "")
-        if "Rs" in benefit_text or "lakh" in benefit_text or "₹" in benefit_text:
-            # Simple heuristic
-            estimated_value = benefit_text.split('.')[0]
-        
-        # Minimum Score Filter: 40
-        if score >= 40:
-            # Type-based overrides for Confidence
-            if scheme_type == "education":
-                confidence = "High" if score >= 65 else ("Medium" if score >= 50 else "Low")
-            elif scheme_type == "training":
-                confidence = "Medium" if score >= 60 else "Low"
-            elif scheme_type in ["insurance", "general"]:
-                confidence = "Low"
-            elif user_cat == "student" and not is_primary:
-                confidence = "Low"
-            else:
-                if is_primary and score >= 85:
-                    confidence = "High"
-                elif score >= 80:
-                    confidence = "High"
-                elif score >= 60:
-                    confidence = "Medium"
-                else:
-                    confidence = "Low"
-                    
-            # Priority for sorting
-            if is_state_specific:
-                sort_priority = -1
-            elif "general" in scheme_targets or scheme_type in ["insurance", "general"]:
-                sort_priority = 4
-            elif scheme_type == "education":
-                sort_priority = 1
-            elif scheme_type == "financial_support" and user_cat == "student":
-                sort_priority = 2
-            elif scheme_type == "training":
-                sort_priority = 3
-            else:
-                sort_priority = 2
-                
-            # CORE SCORING CORRECTION (Issue 1) - Enforce confidence floor 
-            # If scheme_type matches user category, prevent normalization downgrades.
-            is_core_match = False
-            if (user_cat == "student" and scheme_type == "education") or \
-               (user_cat == "farmer" and scheme_type == "farmer_support") or \
-               (user_cat == "senior" and scheme_type == "pension"):
-               is_core_match = True
-               
-            if is_core_match:
-               score = max(score, 75)
-               confidence = "High"
-               
-            ranked.append({
-                "match": SchemeMatch(
-                    name=scheme.get("name", "Unknown Scheme"),
-                    score=score,
-                    confidence=confidence,
-                    eligibilityScore="low", # populated later
-                    reason=reason,
-                    simple_reason=simple_reason,
-                    documents=scheme.get("documents", []),
-                    benefit=scheme.get("benefit_summary", ""),
-                    steps=scheme.get("apply_steps", []),
-                    matched_factors=matched_factors,
-                    target_groups=scheme_targets,
-                    estimated_value=estimated_value,
-                    official_url=scheme.get("official_url"),
-                    sample_form_url=scheme.get("sample_form_url", None)
-                ),
-                "is_primary": is_primary,
-                "is_core_match": is_core_match,
-                "scheme_type": scheme_type,
-                "score": score,
-                "sort_priority": sort_priority,
-                "is_state_specific": is_state_specific
-            })
+        # CORE SCORING CORRECTION (Issue 1) - Enforce confidence floor 
+        # If scheme_type matches user category, prevent normalization downgrades.
+        is_core_match = False
+        if (user_cat == "student" and scheme_type == "education") or \
+           (user_cat == "farmer" and scheme_type == "farmer_support") or \
+           (user_cat == "senior" and scheme_type == "pension"):
+           is_core_match = True
+           
+        if is_core_match:
+           score = max(score, 75)
+           
+        ranked.append(RankedScheme(scheme, score, matched_factors, is_primary, is_core_match, sort_priority))
             
     # Sort ascending by sort_priority, then descending by raw score
-    ranked.sort(key=lambda x: (x.get("sort_priority", 4), -x["score"]))
-    
-    # 4. Final Normalization Pass
-    final_results = []
+    ranked.sort(key=lambda x: (x.sort_priority, -x.score))
+    return _pick_matches(profile, ranked)
+
+def _pick_matches(profile: Dict[str, Any], ranked: Iterable[RankedScheme]) -> List[SchemeMatch]:
+    """
+    Assigns confidences to the ranked schemes in order and picks the ones to return.
+    Confidence caps only count schemes ranked ahead, so the pass stops at the last pick.
+    """
+    user_cat = profile.get("category", "general")
     
+    # 4. Final Normalization Pass (confidence caps count every scheme ranked ahead, not just the returned ones)
     MAX_HIGH_MATCHES = 2
     MAX_MEDIUM_MATCHES = 2
     high_assigned = 0
     medium_assigned = 0
+    output_schemes = []
     
     query_text = profile.get("raw_query", "").lower()
-    explicit_training_keywords = ["job", "employment", "skill training", "unemployment", "skill"]
-    has_explicit_training = any(kw in query_text for kw in explicit_training_keywords)
+    has_explicit_training = any(kw in query_text for kw in EXPLICIT_TRAINING_KEYWORDS)
     
-    for rank_idx, item in enumerate(ranked):
-        match_obj = item["match"]
-        scheme_type = item.get("scheme_type", "general")
-        score = item["score"]
-        is_primary_flag = item["is_primary"]
+    for item in ranked:
+        scheme_type = item.scheme.scheme_type
+        score = item.score
+        is_primary_flag = item.is_primary
         
-        # Override recommendation level explicitly based on rules
-        if "insurance" in match_obj.name.lower() or "general" in item["match"].target_groups:
-             match_obj.recommendation_level = "secondary"
-        elif "training" in match_obj.name.lower() or "kaushalya" in match_obj.name.lower():
-             match_obj.recommendation_level = "secondary"
+        # Override recommendation level explicitly based on rules (insurance, training and general schemes)
+        if item.scheme.always_secondary:
+             item.recommendation_level = "secondary"
         elif is_primary_flag:
-             match_obj.recommendation_level = "primary"
+             item.recommendation_level = "primary"
         else:
-             match_obj.recommendation_level = "secondary"
+             item.recommendation_level = "secondary"
 
         # Apply Type Priority Capping
         confidence_cap = None
@@ -348,7 +559,7 @@ def match_schemes(profile: Dict[str, Any]) -> List[SchemeMatch]:
             raw_conf = "Low"
             
         # Hard overrides
-        if item.get("is_core_match") and confidence_cap not in ["Low", "Medium"]:
+        if item.is_core_match and confidence_cap not in ["Low", "Medium"]:
              raw_conf = "High" 
         elif scheme_type == "education" and user_cat == "student" and score >= 60:
              raw_conf = "High"
@@ -356,62 +567,38 @@ def match_schemes(profile: Dict[str, Any]) -> List[SchemeMatch]:
         # Apply strict distribution max caps
         if raw_conf == "High":
             if high_assigned < MAX_HIGH_MATCHES:
-                match_obj.confidence = "High"
+                item.confidence = "High"
                 high_assigned += 1
             elif medium_assigned < MAX_MEDIUM_MATCHES:
-                match_obj.confidence = "Medium"
+                item.confidence = "Medium"
                 medium_assigned += 1
             else:
-                match_obj.confidence = "Low"
+                item.confidence = "Low"
         elif raw_conf == "Medium":
             if medium_assigned < MAX_MEDIUM_MATCHES:
-                match_obj.confidence = "Medium"
+                item.confidence = "Medium"
                 medium_assigned += 1
             else:
-                match_obj.confidence = "Low"
+                item.confidence = "Low"
         else:
-            match_obj.confidence = "Low"
+            item.confidence = "Low"
             
-        # Map the normalized backend confidence directly to frontend eligibilityScore expectation ("high", "medium", "low")
-        match_obj.eligibilityScore = match_obj.confidence.lower()
-             
-        final_results.append({
-            "match": match_obj,
-            "sort_priority": item["sort_priority"],
-            "scheme_type": scheme_type,
-            "score": score
-        })
-        
-    # Final Sort: priority first, then score
-    final_results.sort(key=lambda x: (x.get("sort_priority", 4), -x["score"]))
-    
-    output_schemes = []
-    
-    for item in final_results:
-        match_obj = item["match"]
-        score = item["score"]
-        scheme_type = item.get("scheme_type", "general")
-        targets = getattr(match_obj, "target_groups", [])
-        
-        is_general = "general" in targets or scheme_type in ["general", "insurance"]
-        
-        # 3. Label general schemes
-        if is_general:
-            match_obj.simple_reason = f"Also Available Scheme: {match_obj.simple_reason}"
+        # Final pick, in the same priority / score order
+        is_general = item.scheme.is_general
             
         # 2. & 4. & 5. Filter logic: don't force 5, only include general if they add value
         if len(output_schemes) < 3:
              # Always try to hit at least top 3 if score >= 40 
              if score >= 40:
-                  output_schemes.append(match_obj)
+                  output_schemes.append(_build_match(profile, item))
         else:
              # After top 3, only include highly relevant schemes
              # If it's general, only include if score is very high (> 80) to avoid irrelevant spam
              if is_general and score > 80:
-                  output_schemes.append(match_obj)
+                  output_schemes.append(_build_match(profile, item))
              # If it's a core scheme, include if score >= 50
              elif not is_general and score >= 50:
-                  output_schemes.append(match_obj)
+                  output_schemes.append(_build_match(profile, item))
                   
         if len(output_schemes) >= 5:
              break
@@ -0,0 +1,47 @@
+from typing import Any, Optional
+
+# All user facing sentences used for scheme matches. Everything that depends only on
+# the scheme is resolved once per scheme when the catalog compiles (see CompiledScheme);
+# requests only fill in profile values, so a translated table costs nothing extra.
+
+GENERAL_PREFIX = "Also Available Scheme: "
+
+SIMPLE_REASON_GENERAL = "Available to all eligible citizens."
+SIMPLE_REASON_BY_TYPE = {
+    "education": "This scholarship helps students pay school or college fees.",
+    "training": "This program offers skill training for employment.",
+    "farmer_support": "This scheme provides direct support to farmers for agriculture.",
+    "financial_support": "This scheme offers financial assistance for your needs.",
+    "housing": "This scheme helps with housing and accommodation.",
+    "health": "This scheme provides health and medical benefits.",
+    "pension": "This provides regular pension or retirement benefits.",
+    "women_specific": "This is a dedicated welfare scheme for women.",
+}
+SIMPLE_REASON_OCCUPATION = "You are a {occupation}, so this scheme suits you."
+SIMPLE_REASON_INCOME = "Based on your income, this scheme is a good fit."
+SIMPLE_REASON_DEFAULT = "This scheme matches your profile."
+
+REASON_OCCUPATION = "you are a {occupation}"
+REASON_INCOME_LIMIT = "your income is below the ₹{limit} limit"
+REASON_INCOME_NO_LIMIT = "your income meets the requirements"
+REASON_INCOME_UNKNOWN = "you meet the financial requirements"
+REASON_AGE = "your age ({age}) is eligible"
+REASON_STATE = "you live in {state}"
+EXPLANATION_PREFIX = "You likely qualify because "
+EXPLANATION_DEFAULT = "You appear to be eligible based on the available scheme guidelines."
+
+
+def static_simple_reason(scheme_type: Any, is_general: bool) -> Optional[str]:
+    """
+    The simple reason when the scheme type alone decides it, already labelled for
+    general schemes. None means it depends on the matched factors.
+    """
+    if is_general:
+        return GENERAL_PREFIX + SIMPLE_REASON_GENERAL
+    return SIMPLE_REASON_BY_TYPE.get(scheme_type) if isinstance(scheme_type, str) else None
+
+
+def income_reason(income_limit: Any) -> str:
+    if income_limit:
+        return REASON_INCOME_LIMIT.format(limit=income_limit)
+    return REASON_INCOME_NO_LIMIT
@@ -0,0 +1,285 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Spoken-number normalization: rewrites number words in a lowercased transcript as digits
+# ("fifty thousand" -> "50000", "2 lakh" -> "200000", "pachas hazaar" -> "50000",
+# "sixty five years old" -> "65 years old") so the digit-based income and age finders
+# in query_scanner can read them.
+
+# Word kinds
+UNIT, TEEN, TENS, WORD, HUNDRED, SCALE, FRACTION, HALF_MORE, AND, DIGITS = range(10)
+
+ENGLISH = {
+    "one": (UNIT, 1), "two": (UNIT, 2), "three": (UNIT, 3), "four": (UNIT, 4), "five": (UNIT, 5),
+    "six": (UNIT, 6), "seven": (UNIT, 7), "eight": (UNIT, 8), "nine": (UNIT, 9),
+    "ten": (TEEN, 10), "eleven": (TEEN, 11), "twelve": (TEEN, 12), "thirteen": (TEEN, 13),
+    "fourteen": (TEEN, 14), "fifteen": (TEEN, 15), "sixteen": (TEEN, 16), "seventeen": (TEEN, 17),
+    "eighteen": (TEEN, 18), "nineteen": (TEEN, 19),
+    "twenty": (TENS, 20), "thirty": (TENS, 30), "forty": (TENS, 40), "fourty": (TENS, 40),
+    "fifty": (TENS, 50), "sixty": (TENS, 60), "seventy": (TENS, 70), "eighty": (TENS, 80), "ninety": (TENS, 90),
+    "hundred": (HUNDRED, 100), "thousand": (SCALE, 10 ** 3),
+    "lakh": (SCALE, 10 ** 5), "lakhs": (SCALE, 10 ** 5), "lac": (SCALE, 10 ** 5), "lacs": (SCALE, 10 ** 5),
+    "crore": (SCALE, 10 ** 7), "crores": (SCALE, 10 ** 7),
+    "and": (AND, 0),
+}
+
+# Hindi numbers up to 99 are single words; common romanizations
+HINDI_NUMBERS = {
+    1: "ek", 2: "do", 3: "teen tin", 4: "char chaar", 5: "paanch panch", 6: "chhe chhah che", 7: "saat",
+    8: "aath", 9: "nau", 10: "das", 11: "gyarah gyara", 12: "barah bara", 13: "terah tera",
+    14: "chaudah chauda", 15: "pandrah pandra", 16: "solah sola", 17: "satrah satra", 18: "atharah athara",
+    19: "unnis unees", 20: "bees bis", 21: "ikkis", 22: "bais baees", 23: "teis", 24: "chaubis chaubees",
+    25: "pachis pachees", 26: "chhabbis", 27: "sattais", 28: "atthais athais", 29: "untis", 30: "tees tis",
+    31: "iktis ikattis", 32: "battis", 33: "taintis", 34: "chautis", 35: "paintis paintees", 36: "chhattis",
+    37: "saintis", 38: "adtis", 39: "untalis", 40: "chalis chaalis chalees", 41: "iktalis", 42: "bayalis",
+    43: "taintalis", 44: "chavalis", 45: "paintalis paintalees", 46: "chhiyalis", 47: "saintalis",
+    48: "adtalis", 49: "unchas", 50: "pachas pachaas", 51: "ikyavan", 52: "bavan", 53: "tirpan",
+    54: "chauvan", 55: "pachpan", 56: "chhappan", 57: "sattavan", 58: "atthavan", 59: "unsath",
+    60: "saath sath", 61: "iksath", 62: "basath", 63: "tirsath", 64: "chausath", 65: "painsath",
+    66: "chhiyasath", 67: "sadsath", 68: "adsath", 69: "unhattar", 70: "sattar", 71: "ikhattar",
+    72: "bahattar", 73: "tihattar", 74: "chauhattar", 75: "pachhattar", 76: "chhihattar", 77: "satattar",
+    78: "athattar", 79: "unasi", 80: "assi", 81: "ikyasi", 82: "bayasi", 83: "tirasi", 84: "chaurasi",
+    85: "pachasi", 86: "chhiyasi", 87: "sattasi", 88: "athasi", 89: "navasi", 90: "nabbe", 91: "ikyanave",
+    92: "banave", 93: "tiranave", 94: "chauranave", 95: "pachanave", 96: "chhiyanave", 97: "sattanave",
+    98: "atthanave", 99: "ninyanave",
+}
+HINDI = {
+    "sau": (HUNDRED, 100), "hazaar": (SCALE, 10 ** 3), "hazar": (SCALE, 10 ** 3), "hajar": (SCALE, 10 ** 3),
+    "hajaar": (SCALE, 10 ** 3), "laakh": (SCALE, 10 ** 5), "karod": (SCALE, 10 ** 7), "karor": (SCALE, 10 ** 7),
+    "dedh": (FRACTION, 1.5), "dhai": (FRACTION, 2.5), "sade": (HALF_MORE, 0.5), "saade": (HALF_MORE, 0.5),
+    "sadhe": (HALF_MORE, 0.5), "aur": (AND, 0),
+}
+for _value, _words in HINDI_NUMBERS.items():
+    for _word in _words.split():
+        HINDI[_word] = (UNIT if _value < 10 else WORD, _value)
+
+# Romanized Tamil and Telugu: units, tens (followed by a unit: "aimbathu anju" = 55) and scales
+TAMIL = {
+    "onnu": (UNIT, 1), "ondru": (UNIT, 1), "rendu": (UNIT, 2), "moonu": (UNIT, 3), "munu": (UNIT, 3),
+    "naalu": (UNIT, 4), "nalu": (UNIT, 4), "anju": (UNIT, 5), "ainthu": (UNIT, 5), "aaru": (UNIT, 6),
+    "ezhu": (UNIT, 7), "ettu": (UNIT, 8), "onbathu": (UNIT, 9), "pathu": (TEEN, 10),
+    "iruvathu": (TENS, 20), "muppathu": (TENS, 30), "naarpathu": (TENS, 40), "narpathu": (TENS, 40),
+    "aimbathu": (TENS, 50), "ambathu": (TENS, 50), "arubathu": (TENS, 60), "aruvathu": (TENS, 60),
+    "ezhupathu": (TENS, 70), "enbathu": (TENS, 80), "thonnooru": (TENS, 90),
+    "nooru": (HUNDRED, 100), "aayiram": (SCALE, 10 ** 3), "ayiram": (SCALE, 10 ** 3),
+    "latcham": (SCALE, 10 ** 5), "laksham": (SCALE, 10 ** 5), "kodi": (SCALE, 10 ** 7),
+}
+TELUGU = {
+    "okati": (UNIT, 1), "moodu": (UNIT, 3), "naalugu": (UNIT, 4), "aidu": (UNIT, 5), "edu": (UNIT, 7),
+    "enimidi": (UNIT, 8), "tommidi": (UNIT, 9), "padi": (TEEN, 10),
+    "iravai": (TENS, 20), "muppai": (TENS, 30), "nalabhai": (TENS, 40), "nalabai": (TENS, 40),
+    "yabhai": (TENS, 50), "yabai": (TENS, 50), "aravai": (TENS, 60), "debbai": (TENS, 70),
+    "enabhai": (TENS, 80), "enabai": (TENS, 80), "tombhai": (TENS, 90), "tombai": (TENS, 90),
+    "vanda": (HUNDRED, 100), "veyyi": (SCALE, 10 ** 3), "velu": (SCALE, 10 ** 3), "veyyilu": (SCALE, 10 ** 3),
+    "laksha": (SCALE, 10 ** 5), "lakshalu": (SCALE, 10 ** 5), "koti": (SCALE, 10 ** 7), "kotlu": (SCALE, 10 ** 7),
+}
+
+LEXICON: Dict[str, Tuple[int, float]] = {**ENGLISH, **HINDI, **TAMIL, **TELUGU}
+
+# Number words that are also everyday words or names ("mere saath", "tera", "what can I do",
+# "velu", "koti reddy", "padi"); they only count inside a number with a hundred/scale word or
+# an unambiguous number word
+AMBIGUOUS = frozenset({
+    "do", "teen", "tin", "char", "che", "nau", "bara", "tera", "sola", "bees", "bis", "tis", "saath", "sath",
+    "edu", "and", "aur", "velu", "koti", "kodi", "padi",
+})
+
+
+def _trie_pattern(words: List[str]) -> str:
+    """Regex alternation of `words` factored as a character trie, so matching never retries shared prefixes."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(branches) + ")?"
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return emit(trie)
+
+
+_WORD = "(?:" + _trie_pattern(sorted(LEXICON)) + r")(?![^\W\d_])"
+_DIGITS = r"\d+(?:\.\d+)?(?![\d,])"
+_TOKEN = f"(?:{_DIGITS}|{_WORD})"
+# A run of number tokens separated by spaces or hyphens; only runs with a word in them are parsed
+_RUN_RE = re.compile(rf"(?<![\w.,]){_TOKEN}(?:[\s-]*{_TOKEN})*")
+_TOKEN_RE = re.compile(f"({_DIGITS})|({_WORD})")
+_LETTER_RE = re.compile(r"[^\W\d_]")
+
+MONTHLY_RE = re.compile(
+    r"\b(?:(?:per|a|every|each|har|prati)\s+(?:month|mahina|mahine|maheena)|monthly|mahina|mahine|maheena|mahana"
+    r"|maadham|maatham|masam|maasam|nelaku|nelaki)\b"
+)
+YEARLY_RE = re.compile(
+    r"\b(?:(?:per|a|every|each|har|prati)\s+(?:year|annum|saal)|yearly|annual|annually|saalana|salana"
+    r"|varusham|varsham|samvatsaram)\b"
+)
+# Lakh-style digit grouping ("2,00,000", "1,50,00,000"), which the income finder would read as "00,000"
+_INDIAN_GROUPING_RE = re.compile(r"(?<![\d,])\d{1,2}(?:,\d{2})+,\d{3}(?![\d,])")
+# Income bands as typed or picked in the profile editor ("₹1–2 lakh", "Below ₹1 lakh", "Above ₹10 lakh")
+_CURRENCY_RE = re.compile(r"₹|\brs\b\.?|\binr\b|\brupees?\b")
+_RANGE_RE = re.compile(r"\s*(?:[–—-]|\bto\b)\s*")
+_ABOVE_RE = re.compile(r"\b(?:above|over|more than|greater than|se zyada|se adhik)\b|\+")
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+_DIGIT_GROUPING_RE = re.compile(r"(?<=\d),(?=\d)")
+# How many words on either side of an income (on its line) are looked at for period words.
+# Queries reach the extractor without punctuation, so clause breaks can't bound the search.
+PERIOD_WORDS = 4
+PERIOD_WINDOW = 80
+
+
+def _parse(tokens: List[Tuple[int, float, str]], i: int) -> Optional[Tuple[int, float, bool]]:
+    """
+    The longest number starting at tokens[i]: (end token index, value, counts), or None.
+    `counts` is False when the number is a lone digit string or only made of ambiguous words.
+    """
+    total = 0.0
+    group: Optional[float] = None   # value below the current scale word
+    state = "start"                 # start, tens, small, hundred, multiplier (fraction/sade/decimal pending)
+    has_hundred = False
+    has_multiplier = False
+    has_word = False
+    unambiguous = False
+    needs_multiplier = False
+    last_scale = float("inf")
+    best = None
+
+    for j in range(i, len(tokens)):
+        kind, value, word = tokens[j]
+        empty = state == "start"
+        if kind == DIGITS:
+            if not empty:
+                break
+            group = value
+            state = "small"
+            needs_multiplier = value != int(value)
+        elif kind in (UNIT, TEEN, WORD, TENS):
+            if state == "half":
+                if kind == TENS:
+                    break
+                group = value + 0.5
+                state = "small"
+            elif kind == UNIT and state == "tens":
+                group += value
+                state = "small"
+            elif empty or state == "hundred":
+                group = (group or 0) + value
+                state = "tens" if kind == TENS else "small"
+            else:
+                break
+        elif kind == FRACTION or kind == HALF_MORE:
+            if not empty:
+                break
+            group = value if kind == FRACTION else None
+            state = "small" if kind == FRACTION else "half"
+            needs_multiplier = True
+        elif kind == HUNDRED:
+            # A hundred or scale word needs a number before it: a bare "sau", "velu" or "koti" is a word
+            if group is None or state not in ("tens", "small") or has_hundred or group >= 100:
+                break
+            group *= 100
+            state = "hundred"
+            has_hundred = has_multiplier = True
+            needs_multiplier = False
+        elif kind == SCALE:
+            if state == "half" or value >= last_scale or group is None:
+                break
+            total += group * value
+            group = None
+            state = "start"
+            has_hundred = False
+            has_multiplier = True
+            needs_multiplier = False
+            last_scale = value
+        else:  # AND joins parts of one number ("one lakh and fifty thousand")
+            if state not in ("start", "hundred") or not (total or group) or tokens[j - 1][0] == AND:
+                break
+            continue
+
+        if kind != DIGITS:
+            has_word = True
+            if word not in AMBIGUOUS and value >= 10:
+                unambiguous = True
+        if state != "half" and not needs_multiplier and (total or group):
+            best = (j + 1, total + (group or 0), has_word and (has_multiplier or unambiguous))
+    return best
+
+
+def normalize_numbers(text: str) -> str:
+    """Rewrites spoken numbers in lowercased `text` as digit strings; everything else is kept as-is."""
+    if "," in text:
+        text = _INDIAN_GROUPING_RE.sub(lambda m: m.group().replace(",", ""), text)
+    out = []
+    last = 0
+    for run in _RUN_RE.finditer(text):
+        chunk = run.group()
+        if not _LETTER_RE.search(chunk):
+            continue  # digits only
+        tokens = []
+        spans = []
+        for m in _TOKEN_RE.finditer(chunk):
+            if m.group(1):
+                tokens.append((DIGITS, float(m.group(1)), m.group(1)))
+            else:
+                kind, value = LEXICON[m.group(2)]
+                tokens.append((kind, value, m.group(2)))
+            spans.append(m.span())
+        i = 0
+        while i < len(tokens):
+            parsed = _parse(tokens, i)
+            if parsed is None:
+                i += 1
+                continue
+            end, value, counts = parsed
+            if counts and value >= 10 and value == int(value):
+                start = run.start() + spans[i][0]
+                out.append(text[last:start])
+                out.append(str(int(value)))
+                last = run.start() + spans[end - 1][1]
+            i = end
+    if not out:
+        return text
+    out.append(text[last:])
+    return "".join(out)
+
+
+def income_multiplier(text: str, start: int, end: int) -> int:
+    """12 when the words around the income at text[start:end] say it is monthly (and not yearly), else 1."""
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    if line_end < 0:
+        line_end = len(text)
+    before = text[max(line_start, start - PERIOD_WINDOW):start].split()[-PERIOD_WORDS:]
+    after = text[end:min(line_end, end + PERIOD_WINDOW)].split()[:PERIOD_WORDS]
+    nearby = " ".join(before + [text[start:end]] + after)
+    # "15000/month" arrives as "15000 month"
+    period = after[0] if after else None
+    if (period == "month" or MONTHLY_RE.search(nearby)) and not (period == "year" or YEARLY_RE.search(nearby)):
+        return 12
+    return 1
+
+
+def parse_income(text: str) -> Optional[int]:
+    """
+    Yearly income for a typed income or income band: "80,000", "fifty thousand", "2.5 lakh",
+    "15000 per month", "₹1–2 lakh" (the top of the band, so every income in it meets the same
+    scheme limits), "Below ₹1 lakh" (1 lakh) or "Above ₹10 lakh" (just over 10 lakh). None if
+    there is no number.
+    """
+    text = _DIGIT_GROUPING_RE.sub("", _CURRENCY_RE.sub(" ", text.lower()))
+    # In a range only the top counts, and it carries the scale word for both ends
+    top = _RANGE_RE.split(text)[-1]
+    numbers = _NUMBER_RE.findall(normalize_numbers(top.strip()))
+    if not numbers:
+        return None
+    value = float(numbers[-1])
+    if _ABOVE_RE.search(text):
+        value += 1
+    return int(value) * income_multiplier(text, 0, len(text))
@@ -1,18 +1,32 @@
+import time
+_PROCESS_START = time.perf_counter()
+
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from app.api import endpoints
-from app.services.scheme_matching import load_schemes_cache
+from app.services.scheme_matching import load_schemes_cache, load_local_snapshot, start_catalog_refresh, catalog_registry
+from app.db.query_log import query_log_writer
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    # Serve from the local snapshot right away; Supabase is fetched (and re-checked
+    # every CATALOG_REFRESH_INTERVAL seconds) in the background
     try:
-        load_schemes_cache()
+        if not load_local_snapshot():
+            load_schemes_cache()
         print("Schemes cache loaded successfully on startup.")
     except Exception as e:
         print(f"Failed to load schemes cache: {e}")
+    # Also when startup had to wait for Supabase or failed, so the catalog still catches up
+    start_catalog_refresh()
+    query_log_writer.start()
+    print(f"[Startup]: ready to serve {(time.perf_counter() - _PROCESS_START) * 1000:.0f} ms after process start")
     yield
+    catalog_registry.stop()
+    # Flush pending query logs before shutting down
+    query_log_writer.stop()
 
 app = FastAPI(
     title="VaaniSetu Backend",
@@ -35,6 +49,27 @@ async def global_exception_handler(request: Request, exc: Exception):
     }
     return JSONResponse(status_code=200, content=fallback_content)
 
+class FirstRequestTimer:
+    """Prints how long after process start the first successful response went out."""
+
+    def __init__(self, app):
+        self.app = app
+        self.done = False
+
+    async def __call__(self, scope, receive, send):
+        if self.done or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start" and message["status"] < 400 and not self.done:
+                self.done = True
+                print(f"[Startup]: first request served {(time.perf_counter() - _PROCESS_START) * 1000:.0f} ms after process start")
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+app.add_middleware(FirstRequestTimer)
+
 # Configure CORS for Frontend
 app.add_middleware(
     CORSMiddleware,
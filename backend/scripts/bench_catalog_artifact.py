@@ -0,0 +1,84 @@
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.catalog_artifact import CatalogArtifact, write_artifact
+from app.services.catalog_registry import CatalogSnapshot
+from scripts.synthetic_catalog import synthetic_schemes, load_fallback_schemes
+
+ROUNDS = 5
+
+
+def best_ms(fn):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def rows_bytes(load):
+    tracemalloc.start()
+    rows = load()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def columnar_bytes(snapshot):
+    # Memory the numpy engine's columns own in this process (views over the artifact own none)
+    columnar = snapshot.columnar
+    arrays = [columnar.targets.bits, columnar.states.bits, columnar.occupations.bits, columnar.scheme_types.bits,
+              columnar.income_limit, columnar.min_age, columnar.max_age, columnar.base_priority,
+              columnar.has_occupations, columnar.occupation_all, columnar.is_national]
+    return sum(a.nbytes for a in arrays if a.flags.owndata)
+
+
+def read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def bench(label, rows, workdir):
+    json_path = os.path.join(workdir, f"{label}.json")
+    artifact_path = os.path.join(workdir, f"{label}.bin")
+    # Same layout as data/fallback_schemes.json
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=4, ensure_ascii=False)
+    write_artifact(rows, artifact_path)
+
+    def from_json():
+        return CatalogSnapshot(read_json(json_path), version=1, source="fallback", columnar=True)
+
+    def from_artifact():
+        artifact = CatalogArtifact(artifact_path)
+        return CatalogSnapshot(artifact.rows(), version=1, source="fallback", digest=artifact.content_hash,
+                               columnar=True, artifact=artifact)
+
+    parse_ms = best_ms(lambda: read_json(json_path))
+    map_ms = best_ms(lambda: CatalogArtifact(artifact_path).rows())
+    json_ms = best_ms(from_json)
+    artifact_ms = best_ms(from_artifact)
+    json_rows = rows_bytes(lambda: read_json(json_path))
+    artifact_rows = rows_bytes(lambda: CatalogArtifact(artifact_path).rows())
+    print(f"{label:>8} | {os.path.getsize(json_path) / 1024:8.0f} {os.path.getsize(artifact_path) / 1024:8.0f} KiB"
+          f" | {parse_ms:8.1f} {map_ms:8.1f} ms | {json_ms:8.1f} {artifact_ms:8.1f} ms"
+          f" | {json_rows / 1e6:7.1f} {artifact_rows / 1e6:7.1f} MB"
+          f" | {columnar_bytes(from_json()) / 1e6:7.1f} {columnar_bytes(from_artifact()) / 1e6:7.1f} MB")
+
+
+if __name__ == "__main__":
+    print("schemes  |     file size (json, artifact) | rows (json, mmap) | snapshot (json, artifact) | rows memory | columns memory")
+    with tempfile.TemporaryDirectory() as workdir:
+        bench("fallback", load_fallback_schemes(), workdir)
+        for n in (10000, 50000):
+            bench(str(n), synthetic_schemes(n), workdir)
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import scheme_matching
+from app.services.catalog import SchemeIndex, compile_schemes
+from app.services.columnar import ColumnarCatalog
+from scripts.synthetic_catalog import synthetic_schemes, SAMPLE_PROFILES
+
+ROUNDS = 10
+
+
+def run(index, columnar):
+    # Ranks directly (no match cache), so both engines really run
+    catalog = SimpleNamespace(index=index, columnar=columnar)
+    results = [[m.model_dump() for m in scheme_matching._rank_schemes(catalog, p)] for p in SAMPLE_PROFILES]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for profile in SAMPLE_PROFILES:
+            scheme_matching._rank_schemes(catalog, profile)
+    return results, (time.perf_counter() - start) * 1000 / (ROUNDS * len(SAMPLE_PROFILES))
+
+
+if __name__ == "__main__":
+    for n in (1000, 10000, 100000):
+        compiled = compile_schemes(synthetic_schemes(n))
+        index = SchemeIndex(compiled)
+        expected, python_ms = run(index, None)
+        actual, numpy_ms = run(index, ColumnarCatalog(compiled))
+        assert expected == actual, f"numpy engine output differs at {n} schemes"
+        print(f"{n:>7} schemes | python {python_ms:8.3f} ms/request | numpy {numpy_ms:8.3f} ms/request")
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import tracemalloc
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import scheme_matching
+from app.services.catalog import compile_schemes
+from app.services.catalog_registry import CatalogSnapshot
+from scripts.synthetic_catalog import synthetic_schemes, SAMPLE_PROFILES, load_fallback_schemes
+
+ROUNDS = 50
+
+
+def measure_alloc(build):
+    """Bytes still allocated by `build()` (compiled records reuse the raw text strings)."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def bench(n):
+    if n is None:
+        raw, raw_bytes = measure_alloc(load_fallback_schemes)
+    else:
+        raw, raw_bytes = measure_alloc(lambda: synthetic_schemes(n))
+    compiled, compiled_bytes = measure_alloc(lambda: compile_schemes(raw))
+
+    catalog = CatalogSnapshot(raw, version=1, source="bench")
+
+    # One-time cost paid when a catalog version is installed
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        compile_schemes(raw)
+    compile_ms = (time.perf_counter() - start) * 1000 / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for profile in SAMPLE_PROFILES:
+            # Bypasses the match cache so every call ranks
+            scheme_matching._rank_schemes(catalog, profile)
+    match_ms = (time.perf_counter() - start) * 1000 / (ROUNDS * len(SAMPLE_PROFILES))
+
+    label = "fallback" if n is None else str(n)
+    print(f"{label:>8} schemes | raw dicts {raw_bytes / 1024:9.1f} KiB | compiled records {compiled_bytes / 1024:9.1f} KiB"
+          f" | match_schemes {match_ms:7.3f} ms | compile once {compile_ms:7.3f} ms")
+
+
+if __name__ == "__main__":
+    for n in (None, 1000, 10000):
+        bench(n)
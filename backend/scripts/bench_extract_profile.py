@@ -0,0 +1,91 @@
+import os
+import re
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.profile_extraction import FILLER_RE, STATE_KEYWORDS, _exact_state, _extract_canonical
+from app.services.query_scanner import FEMALE_MARKERS, MALE_MARKERS, QueryFeatures, canonical_query
+
+# Worst cases for the regexes extract_profile used to run: lazy `.*?` scans that restart at
+# every "income" / digit / "age", and long digit runs the reverse income pattern backtracks
+# through. Each is repeated up to the transcript size.
+TRANSCRIPTS = {
+    "income words": "income ",
+    "short numbers": "12 ",
+    "age, no numbers": "village age ",
+    "digit run": "7",
+    "multi-line": "my income is not fixed, age not known\n",
+    # Number words for the spoken-number stage (extract_profile column only)
+    "spoken numbers": "income one lakh and fifty thousand per month, age sixty five, do teen ",
+    "realistic": "I am a farmer from tamil nadu, my husband died last year and the crop failed, "
+                 "we have two children who study in the village school and I work daily wage sometimes. ",
+}
+SIZES_KB = (1, 5, 10)
+ROUNDS = 5
+# Stop timing the legacy passes on a transcript once one size takes longer than this
+LEGACY_BUDGET_MS = 500
+
+
+def legacy_features(query):
+    """The regex and substring passes extract_profile ran before QueryFeatures."""
+    query_lower = query.lower()
+    query_clean = re.sub(r'[^\w\s]', '', query_lower).strip()
+    state = None
+    for s in STATE_KEYWORDS:
+        if s == query_clean or f" {s} " in f" {query_clean} ":
+            state = s
+            break
+    income = re.search(r'income.*?(\d{1,2}(?:,\d{3})+|\d+k|\d{2,})', query_lower)
+    if not income:
+        income = re.search(r'(\d{1,2}(?:,\d{3})+|\d+k|\d{2,}).*?income', query_lower)
+    age = re.search(r'(\d{1,3})\s*years?\s*old', query_lower)
+    if not age:
+        age = re.search(r'age.*?\b(\d{1,3})\b', query_lower)
+    female = any(w in query_lower for w in [" woman", "female", "girl", "widow", "lady", "aurat"])
+    male = any(w in query_lower for w in [" man", "male", "boy", "aadmi"])
+    return state, income and income.group(1), age and age.group(1), female, male
+
+
+def scanner_features(query):
+    features = QueryFeatures(query)
+    income = features.find_income()
+    return (_exact_state(features), income and features.text[income[0]:income[1]], features.find_age(),
+            features.has_any(FEMALE_MARKERS), features.has_any(MALE_MARKERS))
+
+
+def uncached_extract_profile(query):
+    """extract_profile without its result cache, which would answer every round after the first."""
+    return _extract_canonical(canonical_query(query, FILLER_RE), settings.SPOKEN_NUMBERS)
+
+
+def best_ms(fn, query):
+    best = None
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn(query)
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'transcript':<16} {'size':>6} | {'legacy passes':>13} {'scanner':>9} | {'extract_profile':>15} {'per KB':>8}")
+    for label, unit in TRANSCRIPTS.items():
+        legacy_ms = 0.0
+        for kb in SIZES_KB:
+            query = (unit * (kb * 1024 // len(unit) + 1))[:kb * 1024]
+            if legacy_ms < LEGACY_BUDGET_MS:
+                assert legacy_features(query) == scanner_features(query), label
+                legacy_ms = best_ms(legacy_features, query)
+                legacy = f"{legacy_ms:10.1f} ms"
+            else:
+                # The regexes grow faster than quadratically here; a larger size would take minutes
+                legacy = f"{'skipped':>13}"
+            scanner_ms = best_ms(scanner_features, query)
+            full_ms = best_ms(uncached_extract_profile, query)
+            print(f"{label:<16} {kb:>4}KB | {legacy} {scanner_ms:6.2f} ms"
+                  f" | {full_ms:12.2f} ms {full_ms / kb:5.2f} ms")
@@ -0,0 +1,79 @@
+import os
+import re
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.profile_extraction import (
+    OCCUPATION_KEYWORDS, CATEGORY_KEYWORDS,
+    OCCUPATION_INDEX, CATEGORY_INDEX, STATE_INDEX,
+    fuzzy_match, fuzzy_match_state
+)
+
+# Misspellings from test_fuzzy.py and test_state.py
+queries = [
+    "I am a framer from andhra prasesh with low income",
+    "I am a student from Andhra Pradesh",
+    "I am a framer from andhra prasesh",
+    "I live in Madhya Pradesh",
+    "What about madhya prasesh",
+    "I live nowhere",
+]
+ROUNDS = 200
+
+
+def split(query):
+    words = re.sub(r'[^\w\s]', '', query.lower()).split()
+    return " ".join(words), words
+
+
+def first_label(vocabulary, words):
+    for label, keywords in vocabulary.items():
+        if fuzzy_match(words, keywords):
+            return label
+    return None
+
+
+def difflib_path(query):
+    query_str, words = split(query)
+    return (first_label(OCCUPATION_KEYWORDS, words),
+            first_label(CATEGORY_KEYWORDS, words),
+            fuzzy_match_state(words))
+
+
+def index_path(query):
+    query_str, words = split(query)
+    return (OCCUPATION_INDEX.first_match(query_str, words),
+            CATEGORY_INDEX.first_match(query_str, words),
+            STATE_INDEX.closest(words))
+
+
+def clear_caches():
+    for index in (OCCUPATION_INDEX, CATEGORY_INDEX, STATE_INDEX):
+        index.lookup.cache_clear()
+
+
+def timed(fn, warm=True):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        if not warm:
+            clear_caches()
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) * 1e6 / (ROUNDS * len(queries))
+
+
+if __name__ == "__main__":
+    for q in queries:
+        expected, actual = difflib_path(q), index_path(q)
+        assert expected == actual, f"{q!r}: difflib={expected} index={actual}"
+        print(f"{q!r} -> {actual}")
+
+    difflib_us = timed(difflib_path)
+    cold_us = timed(index_path, warm=False)
+    warm_us = timed(index_path)
+    print(f"\ndifflib scan:        {difflib_us:8.1f} us/query")
+    print(f"index (cold cache):  {cold_us:8.1f} us/query ({difflib_us / cold_us:.1f}x)")
+    print(f"index (warm cache):  {warm_us:8.1f} us/query ({difflib_us / warm_us:.1f}x)")
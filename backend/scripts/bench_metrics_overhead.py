@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from main import app
+from app.api import endpoints
+from app.core import metrics
+from app.db.query_log import QueryLogWriter
+from app.models.schemas import FullAnalysisRequest
+
+QUERIES = [
+    "I am a farmer from Tamil Nadu earning 40000 per year",
+    "student girl from kerala age 19",
+    "widow aged 65 from bihar",
+    "I run a small tea shop in Pune",
+    "daily wage construction worker",
+    "hello there friend",
+]
+ROUNDS = 200
+CALLS = 200000
+
+
+def per_call_ns(fn, *args):
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        fn(*args)
+    return (time.perf_counter() - start) * 1e9 / CALLS
+
+
+def timed_stage(histogram):
+    started = time.perf_counter()
+    histogram.observe(time.perf_counter() - started)
+
+
+def observations():
+    return sum(sum(h.snapshot()[0]) for h in metrics.STAGE_LATENCY.values())
+
+
+def handler_ms():
+    """The /full-analysis handler called directly, i.e. the work metrics are added to."""
+    requests = [FullAnalysisRequest(query=q) for q in QUERIES]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for request in requests:
+            endpoints.full_analysis(request)
+    return (time.perf_counter() - start) * 1000 / (ROUNDS * len(requests))
+
+
+def end_to_end_ms(client):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            client.post("/api/full-analysis", json={"query": query})
+    return (time.perf_counter() - start) * 1000 / (ROUNDS * len(QUERIES))
+
+
+if __name__ == "__main__":
+    # Log rows stay in memory; endpoint prints go to /dev/null
+    endpoints.query_log_writer = QueryLogWriter(None, max_queue=10 ** 7)
+    sys.stdout = open(os.devnull, "w")
+    with TestClient(app) as client:
+        end_to_end_ms(client)
+        before = observations()
+        handler = handler_ms()
+        per_request = (observations() - before) / (ROUNDS * len(QUERIES))
+        end_to_end = end_to_end_ms(client)
+
+    stage_ns = per_call_ns(timed_stage, metrics.Histogram())
+    counter_ns = per_call_ns(metrics.REQUESTS_BY_LANGUAGE.inc, "en")
+    cost_ns = per_request * stage_ns + 2 * counter_ns
+    sys.stdout = sys.__stdout__
+
+    print(f"timed stage {stage_ns:.0f} ns x {per_request:.0f} + counters {2 * counter_ns:.0f} ns = {cost_ns / 1000:.2f} us per request")
+    print(f"handler     {handler:.3f} ms | overhead {cost_ns / (handler * 1e6) * 100:.2f}%")
+    print(f"end to end  {end_to_end:.3f} ms | overhead {cost_ns / (end_to_end * 1e6) * 100:.2f}%")
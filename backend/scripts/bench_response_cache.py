@@ -0,0 +1,64 @@
+import os
+import sys
+import time
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+from main import app
+from app.api import endpoints
+from app.core.cache import LRUCache
+from app.db.query_log import QueryLogWriter
+from app.models.schemas import FullAnalysisRequest
+
+QUERIES = [
+    "I am a farmer from Tamil Nadu earning 40000 per year",
+    "student girl from kerala age 19",
+    "widow aged 65 from bihar",
+    "I run a small tea shop in Pune",
+    "daily wage construction worker",
+    "hello there friend",
+]
+ROUNDS = 300
+
+
+def handler_rps():
+    requests = [FullAnalysisRequest(query=q) for q in QUERIES]
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for request in requests:
+            endpoints.full_analysis(request)
+    return ROUNDS * len(requests) / (time.perf_counter() - start)
+
+
+def http_rps(client):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for query in QUERIES:
+            client.post("/api/full-analysis", json={"query": query})
+    return ROUNDS * len(QUERIES) / (time.perf_counter() - start)
+
+
+def measure(client, response_cache_size):
+    endpoints._RESPONSE_CACHE = LRUCache(response_cache_size)
+    # Warm up: the match cache (and the response cache, if enabled) now hold every query
+    http_rps(client)
+    results = handler_rps(), http_rps(client)
+    endpoints.query_log_writer._queue.queue.clear()
+    return results
+
+
+if __name__ == "__main__":
+    # Log rows stay in memory; endpoint prints go to /dev/null
+    endpoints.query_log_writer = QueryLogWriter(None, max_queue=10 ** 7)
+    sys.stdout = open(os.devnull, "w")
+    with TestClient(app) as client:
+        before_handler, before_http = measure(client, 0)
+        after_handler, after_http = measure(client, 1024)
+    sys.stdout = sys.__stdout__
+
+    print("cache hits, requests/s       | handler only | through ASGI")
+    print(f"match cache only (before)    | {before_handler:12.0f} | {before_http:12.0f}")
+    print(f"response byte cache          | {after_handler:12.0f} | {after_http:12.0f}")
+    print(f"speedup                      | {after_handler / before_handler:11.2f}x | {after_http / before_http:11.2f}x")
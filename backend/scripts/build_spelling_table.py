@@ -0,0 +1,70 @@
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.profile_extraction import FILLER_RE, INDEXES, SPELLING_TABLE_PATH
+from app.services.query_scanner import QueryFeatures, canonical_query
+from scripts.query_corpus import load_queries
+
+# Offline job: counts the words and n-grams of logged queries, resolves each frequent one
+# against the occupation, category and state vocabularies with the same fuzzy scan
+# extract_profile uses, and writes the token -> canonical table extract_profile preloads.
+# Tokens that match nothing are kept too (with no hits), so common words skip the scan.
+
+
+def count_ngrams(queries):
+    """{index name: Counter of the n-grams that index looks up}."""
+    counts = {name: Counter() for name in INDEXES}
+    for query in queries:
+        ngrams = QueryFeatures(canonical_query(query, FILLER_RE)).ngrams
+        for name, index in INDEXES.items():
+            for word_count in index.word_counts:
+                counts[name].update(ngrams[word_count])
+    return counts
+
+
+def build_table(queries, min_count=2, max_tokens=50000):
+    counts = count_ngrams(queries)
+    table = {"queries": len(queries), "min_count": min_count, "indexes": {}}
+    clusters = {}
+    for name, index in INDEXES.items():
+        frequent = [text for text, n in counts[name].most_common(max_tokens) if n >= min_count]
+        tokens = index.export_table(sorted(frequent))
+        table["indexes"][name] = {"fingerprint": index.fingerprint(), "tokens": tokens}
+        # canonical label -> misspellings seen in traffic (fuzzy hits; exact keywords score 1.0)
+        clusters[name] = {}
+        for text, hits in tokens.items():
+            exact = {label for label, score, _ in hits if score == 1.0}
+            for label in sorted({label for label, _, _ in hits} - exact):
+                clusters[name].setdefault(label, []).append((counts[name][text], text))
+    return table, clusters
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the misspelling table extract_profile preloads from logged queries.")
+    parser.add_argument("corpus", nargs="?",
+                        help="JSON/JSONL export of user_queries or a query spool directory (default: Supabase, else the built-in sample)")
+    parser.add_argument("--min-count", type=int, default=2, help="only keep tokens seen at least this many times")
+    parser.add_argument("--max-tokens", type=int, default=50000, help="most frequent tokens kept per vocabulary")
+    parser.add_argument("--output", default=SPELLING_TABLE_PATH)
+    args = parser.parse_args()
+
+    queries = load_queries(args.corpus)
+    table, clusters = build_table(queries, args.min_count, args.max_tokens)
+    for name, by_label in clusters.items():
+        print(f"{name}:")
+        for label in sorted(by_label):
+            spellings = ", ".join(f"{text} ({n})" for n, text in sorted(by_label[label], reverse=True))
+            print(f"  {label} <- {spellings}")
+
+    tmp_path = f"{args.output}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp_path, args.output)
+    sizes = ", ".join(f"{len(section['tokens'])} {name}" for name, section in table["indexes"].items())
+    print(f"Wrote {os.path.relpath(args.output)} from {len(queries)} queries ({sizes} tokens)")
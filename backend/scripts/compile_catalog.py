@@ -0,0 +1,180 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import uuid
+from typing import Any, Dict, List, Optional
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.catalog import SCHEME_TYPES
+from app.services.catalog_artifact import build_artifact, validate_rows
+from app.services.catalog_registry import content_hash
+
+# Single entry point for catalog maintenance: merge the scheme sources, apply overrides,
+# normalize, validate against SchemeBase, then write the fallback JSON, the compiled
+# artifact and the content hash. The same inputs always give byte-identical outputs.
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FALLBACK_PATH = os.path.join(BACKEND_DIR, "data", "fallback_schemes.json")
+ARTIFACT_PATH = os.path.join(BACKEND_DIR, settings.CATALOG_ARTIFACT_PATH)
+HASH_PATH = os.path.join(BACKEND_DIR, "data", "fallback_schemes.sha256")
+# Key order of the rows in the fallback JSON
+FIELD_ORDER = (
+    "id", "name", "official_url", "sample_form_url", "category", "eligible_occupations",
+    "income_limit", "min_age", "max_age", "states", "documents", "benefit_summary",
+    "apply_steps", "target_groups", "scheme_type",
+)
+ID_NAMESPACE = uuid.UUID("6f1c2a1e-7d0b-4c39-9a52-3f0e8b7d2c41")
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _name_key(name: Any) -> str:
+    return re.sub(r"\s+", " ", str(name or "")).strip().casefold()
+
+
+def _clean_list(values: Optional[List[Any]], lower: bool) -> Optional[List[Any]]:
+    """Strips (and lowercases) string items, drops empty ones and repeats, keeps the order."""
+    if values is None:
+        return None
+    cleaned = []
+    for v in values:
+        if isinstance(v, str):
+            v = re.sub(r"\s+", " ", v).strip()
+            if lower:
+                v = v.lower()
+            if not v:
+                continue
+        if v not in cleaned:
+            cleaned.append(v)
+    return cleaned
+
+
+def normalize_scheme(row: Dict[str, Any]) -> Dict[str, Any]:
+    row = dict(row)
+    for field in ("name", "category"):
+        if isinstance(row.get(field), str):
+            row[field] = re.sub(r"\s+", " ", row[field]).strip()
+    for field in ("benefit_summary", "official_url", "sample_form_url"):
+        if isinstance(row.get(field), str):
+            row[field] = row[field].strip()
+    for field in ("states", "eligible_occupations", "target_groups"):
+        row[field] = _clean_list(row.get(field), lower=True)
+    for field in ("documents", "apply_steps"):
+        row[field] = _clean_list(row.get(field), lower=False)
+    if not row.get("states"):
+        row["states"] = ["all"]
+    if isinstance(row.get("scheme_type"), str):
+        row["scheme_type"] = re.sub(r"[\s-]+", "_", row["scheme_type"].strip().lower())
+    if not row.get("id"):
+        # Stable across runs, so Supabase and the fallback agree on ids
+        row["id"] = str(uuid.uuid5(ID_NAMESPACE, _name_key(row.get("name"))))
+    ordered = {field: row[field] for field in FIELD_ORDER if field in row}
+    ordered.update((k, v) for k, v in row.items() if k not in ordered)
+    return ordered
+
+
+def merge_sources(sources: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Concatenates the sources, de-duplicating by normalized name: a later row replaces an
+    earlier one in place, so catalog order (which decides ranking ties) is kept.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for rows in sources:
+        for row in rows:
+            key = _name_key(row.get("name"))
+            if key in merged:
+                print(f"Duplicate scheme {row.get('name')!r}: keeping the later definition")
+            merged[key] = row
+    return list(merged.values())
+
+
+def apply_overrides(rows: List[Dict[str, Any]], overrides: Dict[str, Dict[str, Any]]) -> None:
+    """`overrides` maps a field to {scheme name: value}, e.g. {"official_url": {"PM Kisan Samman Nidhi": "..."}}."""
+    by_name = {_name_key(row.get("name")): row for row in rows}
+    for field, values in overrides.items():
+        for name, value in values.items():
+            row = by_name.get(_name_key(name))
+            if row is None:
+                raise ValueError(f"Override for unknown scheme {name!r} ({field})")
+            row[field] = value
+
+
+def check_catalog(rows: List[Dict[str, Any]]) -> None:
+    validate_rows(rows)
+    errors = []
+    ids = {}
+    for pos, row in enumerate(rows):
+        if row["scheme_type"] not in SCHEME_TYPES:
+            errors.append(f"#{pos} {row['name']!r}: unknown scheme_type {row['scheme_type']!r}")
+        if row["id"] in ids:
+            errors.append(f"#{pos} {row['name']!r}: id {row['id']} already used by #{ids[row['id']]}")
+        ids[row["id"]] = pos
+    if errors:
+        raise ValueError(f"{len(errors)} invalid scheme(s):\n  " + "\n  ".join(errors))
+
+
+def compile_catalog(sources: List[str], overrides: Optional[str] = None) -> Dict[str, bytes]:
+    """Returns {output path: bytes} for the fallback JSON, the artifact and the hash file."""
+    rows = merge_sources([_read_json(path) for path in sources])
+    if overrides:
+        apply_overrides(rows, _read_json(overrides))
+    rows = [normalize_scheme(row) for row in rows]
+    check_catalog(rows)
+
+    catalog_json = json.dumps(rows, indent=4).encode("utf-8")
+    digest = content_hash(rows)
+    return {
+        FALLBACK_PATH: catalog_json,
+        ARTIFACT_PATH: build_artifact(rows, source_digest=hashlib.sha256(catalog_json).hexdigest()),
+        HASH_PATH: f"{digest}\n".encode("ascii"),
+    }
+
+
+def _current(path: str) -> Optional[bytes]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Validate and compile the scheme catalog into the fallback JSON, the binary artifact and its content hash."
+    )
+    parser.add_argument("sources", nargs="*", default=[FALLBACK_PATH],
+                        help="scheme JSON files, later ones win on duplicate names (default: data/fallback_schemes.json)")
+    parser.add_argument("--overrides", help='JSON of {field: {scheme name: value}} applied after merging, e.g. official URLs')
+    parser.add_argument("--check", action="store_true",
+                        help="only verify that the committed outputs are up to date (exit 1 if not)")
+    args = parser.parse_args()
+
+    try:
+        outputs = compile_catalog(args.sources, args.overrides)
+    except ValueError as e:
+        print(f"Catalog is invalid, nothing written: {e}")
+        sys.exit(1)
+
+    if args.check:
+        # The artifact is a build output and may be absent; the JSON and hash are committed
+        stale = [path for path, data in outputs.items()
+                 if path != ARTIFACT_PATH and _current(path) != data]
+        for path in stale:
+            print(f"Out of date: {os.path.relpath(path)}")
+        sys.exit(1 if stale else 0)
+
+    for path, data in outputs.items():
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        print(f"Wrote {os.path.relpath(path)} ({len(data)} bytes)")
+    print(f"Catalog content hash {outputs[HASH_PATH].decode().strip()}")
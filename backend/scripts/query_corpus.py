@@ -0,0 +1,120 @@
+import glob
+import json
+import os
+import sys
+from typing import Any, List, Optional
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Replay corpus for the offline query tools: logged user queries, from an export or Supabase
+
+# Voice transcripts in the styles seen in production, used when no export or database is available
+SAMPLE_QUERIES = [
+    "I am a farmer from Tamil Nadu, my income is fifty thousand",
+    "main kisan hoon uttar pradesh se, income pachas hazaar hai",
+    "my income is 2 lakh per year and I am a student",
+    "I am sixty five years old, living in Kerala",
+    "meri age painsath saal hai, bihar",
+    "widow from Rajasthan, monthly income is eight thousand rupees",
+    "I earn fifteen thousand per month, income from tailoring, Gujarat",
+    "income dedh lakh, farmer in Maharashtra",
+    "I am a daily wage worker, income one lakh twenty thousand",
+    "naan oru vivasayi, income aimbathu aayiram, tamil nadu",
+    "nenu rythu, income yabhai veyyilu, andhra pradesh",
+    "I am seventy years old and need pension",
+    "student age nineteen from Delhi",
+    "my family income is 2,00,000",
+    "income 40k, shop owner in Karnataka",
+    "I am 45 years old woman, income 80000",
+    "retired teacher, age sixty two, Punjab",
+    "girl student, income of 5 lakh, West Bengal",
+    "income saade teen lakh, business in Telangana",
+    "I am a labour, income is teen hazaar per month",
+    "mere saath do bachche hain, income bees hazaar mahine ka",
+    "age is 17, studying in Assam",
+    "what can I do for my mother, she is sixty eight",
+    "I need help",
+    "farmer income twenty five thousand a month from Odisha",
+    "vendor from Bihar, income around ninety thousand",
+    "I am a widow, age fifty eight, income very low",
+    "low income family from Jharkhand",
+    "income 1.5 lakh, agriculture, Madhya Pradesh",
+    "college student with income of twelve thousand monthly",
+    "I am a framer from andhra prasesh with low income",
+    "farmar from madhya prasesh, income 60000",
+    "I am a framer in Rajastan",
+    "studnet from kerela looking for scholarship",
+    "widdow from andhra prasesh, age sixty",
+]
+
+
+def _query_text(row: Any) -> Optional[str]:
+    if isinstance(row, str):
+        return row
+    if isinstance(row, dict):
+        return row.get("query_text") or row.get("query")
+    return None
+
+
+def _read_export(path: str) -> List[str]:
+    """Query texts from a JSON list, a JSONL export or a query spool segment (or a directory of them)."""
+    if os.path.isdir(path):
+        queries = []
+        # e.g. the query spool directory (sealed, active and replaying segments)
+        for segment in sorted(glob.glob(os.path.join(path, "segment-*"))):
+            queries.extend(_read_export(segment))
+        return queries
+
+    with open(path, "r", encoding="utf-8") as f:
+        content = f.read()
+    try:
+        rows = json.loads(content)
+        rows = rows if isinstance(rows, list) else [rows]
+    except ValueError:
+        rows = []
+        for line in content.splitlines():
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue  # Torn line in a spool segment
+    queries = []
+    for row in rows:
+        # Spool records hold a batch: {"user_queries": [...], "analysis_results": [...]}
+        for item in row.get("user_queries", [row]) if isinstance(row, dict) else [row]:
+            text = _query_text(item)
+            if text:
+                queries.append(text)
+    return queries
+
+
+def _read_supabase(limit: int) -> List[str]:
+    from app.db.supabase import supabase_client
+    if not supabase_client:
+        return []
+    queries: List[str] = []
+    page = 1000
+    offset = 0
+    while len(queries) < limit:
+        res = supabase_client.table("user_queries").select("query_text").range(offset, offset + page - 1).execute()
+        rows = res.data or []
+        queries.extend(row["query_text"] for row in rows if row.get("query_text"))
+        offset += page
+        if len(rows) < page:
+            break
+    return queries[:limit]
+
+
+def load_queries(path: Optional[str] = None, limit: int = 100000) -> List[str]:
+    """
+    Query texts from `path` if given, else the Supabase `user_queries` table, else
+    SAMPLE_QUERIES.
+    """
+    if path:
+        return _read_export(path)[:limit]
+    try:
+        queries = _read_supabase(limit)
+    except Exception as e:
+        print(f"Could not read user_queries from Supabase ({e}), using the sample corpus")
+        queries = []
+    return queries or list(SAMPLE_QUERIES)
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.profile_extraction import extract_profile
+from scripts.query_corpus import load_queries
+
+# Replays logged queries through extract_profile with and without spoken-number parsing and
+# counts the follow-up turns each leaves: the follow_up_question /full-analysis asks when
+# occupation and category are both unresolved, and a question for an income or age the
+# transcript did not yield.
+
+
+def follow_ups(profile):
+    """(follow_up_question, income question, age question) for one extracted profile."""
+    # Same condition as the follow_up_question in /full-analysis (endpoints._match)
+    asks_profile = profile["occupation"] == "unknown" and profile["category"] == "general"
+    return asks_profile, profile["income"] == "unknown", profile["age"] is None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure follow-up turns saved by spoken-number parsing on a replay corpus.")
+    parser.add_argument("corpus", nargs="?",
+                        help="JSON/JSONL export of user_queries or a query spool directory (default: Supabase, else the built-in sample)")
+    parser.add_argument("--show", type=int, default=10, help="print this many queries whose profile changed")
+    args = parser.parse_args()
+
+    queries = load_queries(args.corpus)
+    totals = {False: [0, 0, 0], True: [0, 0, 0]}
+    changed = []
+    for query in queries:
+        profiles = {}
+        for spoken in (False, True):
+            profiles[spoken] = extract_profile(query, spoken_numbers=spoken)
+            for i, asked in enumerate(follow_ups(profiles[spoken])):
+                totals[spoken][i] += asked
+        if profiles[False] != profiles[True]:
+            changed.append((query, profiles[False], profiles[True]))
+
+    print(f"{len(queries)} queries, {len(changed)} with a different profile\n")
+    print(f"{'follow-up turns':<22} {'digits only':>12} {'spoken numbers':>15} {'change':>8}")
+    labels = ("profile question", "income question", "age question")
+    for i, label in enumerate(labels):
+        before, after = totals[False][i], totals[True][i]
+        print(f"{label:<22} {before:>12} {after:>15} {after - before:>+8}")
+    before, after = sum(totals[False]), sum(totals[True])
+    reduction = (before - after) / before * 100 if before else 0.0
+    print(f"{'total':<22} {before:>12} {after:>15} {after - before:>+8} ({reduction:.1f}% fewer)")
+    print(f"{'per query':<22} {before / max(1, len(queries)):>12.2f} {after / max(1, len(queries)):>15.2f}")
+
+    for query, old, new in changed[:args.show]:
+        diff = ", ".join(f"{k} {old[k]!r} -> {new[k]!r}" for k in ("income", "age", "category") if old[k] != new[k])
+        print(f"\n{query!r}\n    {diff}")
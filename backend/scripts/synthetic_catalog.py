@@ -0,0 +1,52 @@
+import json
+import os
+import random
+import sys
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.profile_extraction import STATE_KEYWORDS
+
+FALLBACK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "fallback_schemes.json")
+TARGET_GROUPS = ["general", "student", "farmer", "women", "senior", "business", "worker"]
+SCHEME_TYPES = ["education", "training", "farmer_support", "financial_support", "housing", "health", "pension", "women_specific", "general", "employment", "business"]
+OCCUPATIONS = ["all", "farmer", "student", "widow", "worker", "business", "senior", "labour"]
+
+
+def load_fallback_schemes():
+    with open(FALLBACK_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def synthetic_schemes(n: int, seed: int = 42):
+    """
+    Builds a catalog of `n` schemes for benchmarks: the real fallback schemes first,
+    then randomized state and district variants of them.
+    """
+    rnd = random.Random(seed)
+    base = load_fallback_schemes()
+    schemes = base[:n]
+    while len(schemes) < n:
+        s = json.loads(json.dumps(rnd.choice(base)))
+        s["name"] = f"{s['name']} - Variant {len(schemes)}"
+        s["states"] = ["all"] if rnd.random() < 0.1 else [rnd.choice(STATE_KEYWORDS).title()]
+        s["target_groups"] = rnd.sample(TARGET_GROUPS, rnd.randint(1, 2))
+        s["scheme_type"] = rnd.choice(SCHEME_TYPES)
+        s["eligible_occupations"] = rnd.sample(OCCUPATIONS, rnd.randint(1, 3))
+        s["income_limit"] = rnd.choice([None, 50000, 100000, 250000, 800000])
+        s["min_age"] = rnd.choice([None, None, 18, 21, 60])
+        s["max_age"] = rnd.choice([None, None, 35, 40, 59])
+        schemes.append(s)
+    return schemes
+
+
+# Representative profiles as produced by extract_profile
+SAMPLE_PROFILES = [
+    {"occupation": "farmer", "income": 50000, "state": "tamil nadu", "age": None, "gender": None, "category": "farmer", "raw_query": "I am a farmer from Tamil Nadu with low income"},
+    {"occupation": "student", "income": "unknown", "state": "andhra pradesh", "age": 19, "gender": "female", "category": "student", "raw_query": "I am a 19 year old girl studying in college"},
+    {"occupation": "senior", "income": "unknown", "state": "rajasthan", "age": 67, "gender": "male", "category": "senior", "raw_query": "retired man from rajasthan 67 years old"},
+    {"occupation": "worker", "income": 90000, "state": "unknown", "age": 30, "gender": None, "category": "worker", "raw_query": "daily wage worker looking for a job"},
+    {"occupation": "unknown", "income": "unknown", "state": "kerala", "age": None, "gender": None, "category": "general", "raw_query": "tailor from kerala"},
+    {"occupation": "unknown", "income": "unknown", "state": "bihar", "age": 28, "gender": "female", "category": "women", "raw_query": "pregnant woman from bihar"},
+]
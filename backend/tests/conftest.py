@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Add the parent directory to sys.path so we can import from app
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Query logs written while the tests exercise the app go to a scratch spool, not backend/data/spool
+os.environ.setdefault("QUERY_SPOOL_DIR", tempfile.mkdtemp(prefix="vaanisetu-spool-"))
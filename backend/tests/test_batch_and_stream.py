@@ -0,0 +1,98 @@
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from main import app
+from app.api import endpoints
+from app.db.query_log import QueryLogWriter
+
+client = TestClient(app)
+
+QUERIES = [
+    ("I am a farmer from Kerala", "kerala"),
+    ("Student from Goa looking for scholarship", "goa"),
+    ("Widow from Bihar with low income", "bihar"),
+    ("Retired teacher from Punjab, 65 years old", "punjab"),
+]
+
+
+class _RecordingClient:
+    """Supabase stand-in that records (table, row count) for every bulk write."""
+
+    def __init__(self):
+        self.writes = []
+        self._table = None
+
+    def table(self, name):
+        self._table = name
+        return self
+
+    def insert(self, rows):
+        self.writes.append((self._table, len(rows)))
+        return self
+
+    upsert = insert
+
+    def execute(self):
+        return self
+
+
+def _events(body):
+    response = client.post("/api/full-analysis/stream", json=body)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_events_come_in_order():
+    events = _events({"query": "I am a farmer from Tamil Nadu with low income"})
+    names = [e["event"] for e in events]
+    count = events[1]["scheme_count"]
+    assert count > 0
+    assert names == ["profile", "speech"] + ["scheme"] * count + ["summary", "done"]
+    assert events[0]["profile"]["state"] == "tamil nadu"
+
+
+def test_stream_error_replaces_the_remaining_events(monkeypatch):
+    def failing_match(*args, **kwargs):
+        raise RuntimeError("matching failed")
+
+    monkeypatch.setattr(endpoints, "_match", failing_match)
+    events = _events({"query": "I am a farmer from Tamil Nadu"})
+    assert [e["event"] for e in events] == ["profile", "error"]
+    assert events[1]["detail"] == "matching failed"
+
+
+def test_batch_keeps_input_order_and_isolates_failures(monkeypatch):
+    analyze = endpoints._analyze
+
+    def flaky_analyze(request, *args, **kwargs):
+        if request.query == QUERIES[0][0]:
+            time.sleep(0.1)  # Finishes after the items behind it
+        if request.query == "explode":
+            raise RuntimeError("item failed")
+        return analyze(request, *args, **kwargs)
+
+    monkeypatch.setattr(endpoints, "_analyze", flaky_analyze)
+    body = [{"query": q} for q, _ in QUERIES[:2]] + [{"query": "explode"}] + [{"query": q} for q, _ in QUERIES[2:]]
+    response = client.post("/api/full-analysis/batch", json=body)
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == list(range(len(body)))
+    assert results[2] == {"index": 2, "result": None, "error": "item failed"}
+    states = [r["result"]["profile"]["state"] for r in results[:2] + results[3:]]
+    assert states == [state for _, state in QUERIES]
+    assert all(r["error"] is None for r in results[:2] + results[3:])
+
+
+def test_batch_is_logged_with_one_bulk_write_per_table(monkeypatch):
+    recorder = _RecordingClient()
+    writer = QueryLogWriter(recorder, flush_size=1000, flush_interval=60)
+    monkeypatch.setattr(endpoints, "query_log_writer", writer)
+    writer.start()
+    response = client.post("/api/full-analysis/batch", json=[{"query": q} for q, _ in QUERIES])
+    assert response.status_code == 200
+    schemes = sum(len(r["result"]["schemes"]) for r in response.json()["results"])
+    writer.stop()
+    assert recorder.writes == [("user_queries", len(QUERIES)), ("analysis_results", schemes)]
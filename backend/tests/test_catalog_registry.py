@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from app.services.catalog_registry import CatalogRegistry
+from app.services.scheme_matching import _read_fallback_schemes
+
+ROWS = _read_fallback_schemes()
+
+
+def _failing_fetch():
+    raise ConnectionError("supabase unreachable")
+
+
+def test_status_follows_the_served_snapshot():
+    registry = CatalogRegistry()
+    assert registry.status == "disconnected"
+    registry.install(ROWS[:5], "fallback")
+    assert registry.status == "fallback"
+    assert registry.refresh(lambda: ROWS[:6])
+    assert registry.status == "connected"
+
+
+def test_failed_fetch_keeps_a_supabase_snapshot_connected():
+    registry = CatalogRegistry()
+    registry.refresh(lambda: ROWS[:6])
+    assert not registry.refresh(_failing_fetch)
+    assert registry.status == "connected"
+    assert registry.current().version == 1
+    assert registry.failures == 1
+
+
+def test_same_content_from_supabase_is_connected():
+    registry = CatalogRegistry()
+    registry.install(ROWS[:5], "fallback")
+    before = registry.current()
+    assert not registry.refresh(lambda: list(ROWS[:5]))
+    assert registry.status == "connected"
+    assert registry.current().version == before.version
+    assert registry.current().index is before.index
+
+
+@pytest.mark.parametrize("rows", [[None], ["not a scheme"]])
+def test_rows_that_fail_to_install_keep_the_current_snapshot(rows):
+    registry = CatalogRegistry()
+    registry.install(ROWS[:5], "fallback")
+    assert not registry.refresh(lambda: rows)
+    assert registry.status == "fallback"
+    assert registry.current().version == 1
+
+
+def test_refresh_thread_survives_an_install_error():
+    registry = CatalogRegistry()
+    swapped = threading.Event()
+    registry.on_swap(lambda snapshot: swapped.set())
+    fetches = iter([[None], ROWS[:6]])
+    registry.start_refresh(lambda: next(fetches, ROWS[:6]), interval=0.01)
+    try:
+        assert swapped.wait(2)
+        assert registry.status == "connected"
+        assert registry.failures == 1
+    finally:
+        registry.stop()
@@ -0,0 +1,77 @@
+import itertools
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import scheme_matching
+from app.services.catalog import SchemeIndex, compile_schemes
+from app.services.catalog_artifact import CatalogArtifact, write_artifact
+from app.services.columnar import ColumnarCatalog
+from scripts.synthetic_catalog import synthetic_schemes, SAMPLE_PROFILES, TARGET_GROUPS
+
+# Rows the synthetic catalog never produces
+EDGE_ROWS = [
+    {"name": "Bare Scheme"},
+    {"name": "No Limits", "income_limit": None, "min_age": None, "max_age": None, "states": ["all"],
+     "eligible_occupations": [], "target_groups": ["general"], "scheme_type": "general"},
+    {"name": "Zero Limits", "income_limit": 0, "min_age": 0, "max_age": 0, "states": ["All"],
+     "eligible_occupations": ["all"], "target_groups": ["farmer"], "scheme_type": "farmer_support"},
+    {"name": "Kerala Widows", "states": ["Kerala"], "eligible_occupations": ["widow"], "target_groups": ["women"],
+     "scheme_type": "women_specific", "income_limit": 100000, "min_age": 18},
+    {"name": "National Students", "states": ["india"], "eligible_occupations": None, "target_groups": ["student"],
+     "scheme_type": "education", "max_age": 25},
+    {"name": "Untyped", "states": ["bihar", "kerala"], "target_groups": ["senior", "general"]},
+]
+
+
+def _profiles(seed, count):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        yield {
+            "category": rnd.choice(TARGET_GROUPS),
+            "occupation": rnd.choice(["farmer", "student", "widow", "worker", "unknown", None]),
+            "income": rnd.choice([None, "unknown", 0, 40000, 100000, 250001]),
+            "age": rnd.choice([None, 0, 17, 25, 45, 70]),
+            "state": rnd.choice(["kerala", "Bihar", "tamil nadu", "unknown", None]),
+            "gender": rnd.choice(["female", "male", None]),
+            "raw_query": rnd.choice(["", "looking for a job"]),
+        }
+
+
+def _ranked(schemes, columnar, profile):
+    catalog = SimpleNamespace(index=SchemeIndex(schemes), columnar=columnar)
+    return [m.model_dump() for m in scheme_matching._rank_schemes(catalog, profile)]
+
+
+@pytest.mark.parametrize("rows", [
+    EDGE_ROWS + synthetic_schemes(50),
+    synthetic_schemes(3000)[::-1] + EDGE_ROWS,
+], ids=["fallback", "synthetic"])
+def test_numpy_engine_matches_python_engine(rows):
+    schemes = compile_schemes(rows)
+    columnar = ColumnarCatalog(schemes)
+    for profile in itertools.chain(SAMPLE_PROFILES, _profiles(len(rows), 300)):
+        assert _ranked(schemes, columnar, profile) == _ranked(schemes, None, profile), profile
+
+
+def test_artifact_backed_engine_scores_on_the_mapping(tmp_path):
+    # The artifact only holds rows that validate against SchemeBase
+    required = {"category": "Scheme", "eligible_occupations": [], "states": ["all"], "documents": [],
+                "benefit_summary": "", "apply_steps": [], "scheme_type": "general"}
+    edge_rows = [{**required, **{k: v for k, v in row.items() if v is not None or k not in required}}
+                 for row in EDGE_ROWS]
+    rows = edge_rows + synthetic_schemes(500)
+    path = str(tmp_path / "catalog.bin")
+    write_artifact(rows, path)
+    artifact = CatalogArtifact(path)
+    assert artifact.rows() == rows
+    schemes = compile_schemes(artifact.rows())
+    columnar = ColumnarCatalog(schemes, artifact)
+    for array in (columnar.targets.bits, columnar.states.bits, columnar.occupations.bits, columnar.scheme_types.bits,
+                  columnar.income_limit, columnar.min_age, columnar.max_age, columnar.base_priority,
+                  columnar.has_occupations, columnar.occupation_all, columnar.is_national):
+        # Read-only views over the memory map, not per-process copies
+        assert not array.flags.owndata and not array.flags.writeable
+    for profile in itertools.chain(SAMPLE_PROFILES, _profiles(0, 300)):
+        assert _ranked(schemes, columnar, profile) == _ranked(schemes, None, profile), profile
@@ -0,0 +1,79 @@
+import json
+import threading
+import time
+
+from app.api import endpoints
+from app.models.schemas import FullAnalysisRequest
+from app.services.catalog_registry import CatalogSnapshot
+from app.services.scheme_matching import match_schemes
+
+VARIANTS = [
+    "I am a farmer from Kerala with low income",
+    "i am a FARMER, from kerala with low income!!",
+    "Um, I am a farmer from Kerala, with low income.",
+    "  I am a farmer   from Kerala with low income",
+]
+
+
+def test_concurrent_variants_share_one_extraction(monkeypatch):
+    extracted = []
+    extract = endpoints._extract
+
+    def slow_extract(request):
+        extracted.append(request.query)
+        time.sleep(0.2)  # Keeps the leader in flight while the others arrive
+        return extract(request)
+
+    monkeypatch.setattr(endpoints, "_extract", slow_extract)
+    bodies = {}
+
+    def run(query):
+        response = endpoints.full_analysis(FullAnalysisRequest(query=query))
+        bodies[query] = json.loads(response.body)
+
+    threads = [threading.Thread(target=run, args=(query,)) for query in VARIANTS]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert len(extracted) == 1
+    for body in bodies.values():
+        body.pop("processing_time_ms")
+    assert len({json.dumps(body, sort_keys=True) for body in bodies.values()}) == 1
+    assert bodies[VARIANTS[0]]["profile"]["state"] == "kerala"
+
+
+def test_different_queries_are_not_coalesced(monkeypatch):
+    extracted = []
+    extract = endpoints._extract
+
+    def counting_extract(request):
+        extracted.append(request.query)
+        return extract(request)
+
+    monkeypatch.setattr(endpoints, "_extract", counting_extract)
+    endpoints.full_analysis(FullAnalysisRequest(query="I am a student from Goa"))
+    endpoints.full_analysis(FullAnalysisRequest(query="I am a student from Goa", state_hint="Kerala"))
+    endpoints.full_analysis(FullAnalysisRequest(query="I am a student from Goa", language="hi"))
+    assert len(extracted) == 3
+
+
+def test_summary_cache_tells_apart_schemes_sharing_a_name():
+    # Supabase rows are not de-duplicated by name
+    rows = [
+        {"name": "Mukhyamantri Sahayata Yojana", "eligible_occupations": ["farmer"], "states": ["punjab"],
+         "documents": [], "apply_steps": [], "target_groups": ["farmer"], "scheme_type": "farmer_support",
+         "benefit_summary": "Rs 5000 per acre for wheat farmers."},
+        {"name": "Mukhyamantri Sahayata Yojana", "eligible_occupations": ["student"], "states": ["kerala"],
+         "documents": [], "apply_steps": [], "target_groups": ["student"], "scheme_type": "education",
+         "benefit_summary": "Free college tuition."},
+    ]
+    catalog = CatalogSnapshot(rows, version=10_000, source="test")
+    farmer = {"occupation": "farmer", "category": "farmer", "state": "punjab", "income": "unknown", "age": 40}
+    student = {"occupation": "student", "category": "student", "state": "kerala", "income": "unknown", "age": 19}
+    for profile, benefit in ((farmer, "wheat farmers"), (student, "college tuition")):
+        schemes = match_schemes(profile, catalog)
+        assert [s.name for s in schemes] == ["Mukhyamantri Sahayata Yojana"]
+        assert benefit in endpoints._benefits_summary(schemes, catalog)
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from app.services.keyword_index import FuzzyKeywordIndex
+from app.services.profile_extraction import (
+    CATEGORY_KEYWORDS, OCCUPATION_KEYWORDS, STATE_KEYWORDS, fuzzy_match, fuzzy_match_state,
+)
+
+MISSPELLINGS = [
+    "framer", "farmar", "andhra prasesh", "madhya prasesh", "studnet", "colege", "widw", "pensoin",
+    "kerela", "tamilnadu", "tamil nadoo", "utar pradesh", "west bengol", "biharr", "retird", "buzurgh",
+    "daily wag", "start-up", "singel mother", "vyapaar", "enterpreneur", "labor", "kisaan", "odisa",
+]
+# Never seen by any index (nor close to a keyword)
+UNSEEN = ["xyzzy", "qwerty", "zzz", "a", "12345", "नमस्ते", "blockchain developer", "mars colony"]
+
+
+def _typos(word, rnd):
+    """Deletion, transposition, substitution and insertion variants of `word`."""
+    if len(word) < 2:
+        return []
+    i = rnd.randrange(len(word) - 1)
+    letter = rnd.choice("aeiourst")
+    return [word[:i] + word[i + 1:], word[:i] + word[i + 1] + word[i] + word[i + 2:],
+            word[:i] + letter + word[i + 1:], word[:i] + letter + word[i:]]
+
+
+def _tokens():
+    rnd = random.Random(5)
+    keywords = [kw for vocabulary in (OCCUPATION_KEYWORDS, CATEGORY_KEYWORDS) for kws in vocabulary.values() for kw in kws]
+    keywords += STATE_KEYWORDS
+    tokens = list(keywords) + MISSPELLINGS + UNSEEN
+    for kw in keywords:
+        tokens += _typos(kw, rnd)
+    return tokens
+
+
+def _queries():
+    rnd = random.Random(6)
+    tokens = _tokens()
+    queries = [[token] for token in tokens]
+    queries += [f"i am a {token} from {rnd.choice(tokens)}".split() for token in tokens]
+    queries += [rnd.sample(tokens, 3) for _ in range(300)]
+    return [" ".join(q).split() for q in queries]
+
+
+def _difflib(words):
+    def first_label(vocabulary):
+        for label, keywords in vocabulary.items():
+            if fuzzy_match(words, keywords):
+                return label
+        return None
+    return first_label(OCCUPATION_KEYWORDS), first_label(CATEGORY_KEYWORDS), fuzzy_match_state(words)
+
+
+def _fresh_indexes():
+    return (FuzzyKeywordIndex(OCCUPATION_KEYWORDS, threshold=0.8), FuzzyKeywordIndex(CATEGORY_KEYWORDS, threshold=0.8),
+            FuzzyKeywordIndex({state: [state] for state in STATE_KEYWORDS}, threshold=0.86))
+
+
+def _indexed(indexes, words):
+    occupation, category, state = indexes
+    query_str = " ".join(words)
+    return occupation.first_match(query_str, words), category.first_match(query_str, words), state.closest(words)
+
+
+QUERIES = _queries()
+EXPECTED = [_difflib(words) for words in QUERIES]
+
+
+@pytest.mark.parametrize("passes", [1, 2], ids=["cold", "warm"])
+def test_index_matches_difflib(passes):
+    indexes = _fresh_indexes()
+    for _ in range(passes):
+        for words, expected in zip(QUERIES, EXPECTED):
+            assert _indexed(indexes, words) == expected, words
+
+
+def test_spelling_table_falls_back_to_the_scan_for_unseen_tokens():
+    indexes = _fresh_indexes()
+    # Table built from half of the traffic; the other half (and UNSEEN) is scanned on demand
+    seen = QUERIES[::2]
+    for index in indexes:
+        texts = {" ".join(words[i:i + n]) for words in seen for n in index.word_counts for i in range(len(words) - n + 1)}
+        index.load_table(index.export_table(sorted(texts)))
+        index.lookup.cache_clear()
+    for words, expected in zip(QUERIES, EXPECTED):
+        assert _indexed(indexes, words) == expected, words
+    assert all(index.lookup.cache_info().misses for index in indexes)
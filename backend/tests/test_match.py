@@ -0,0 +1,68 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.spoken_numbers import parse_income
+
+client = TestClient(app)
+
+# As EditProfilePanel sends it
+PROFILE = {"occupation": "Farmer", "state": "Punjab", "age": 40, "gender": "Male", "income": "₹2–5 lakh"}
+
+
+def _match(profile, previous=None):
+    body = {"profile": profile}
+    if previous is not None:
+        body["previous"] = previous
+    response = client.post("/api/match", json=body)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("band, income", [
+    ("Below ₹1 lakh", 100000),
+    ("₹1–2 lakh", 200000),
+    ("₹2–5 lakh", 500000),
+    ("₹5–10 lakh", 1000000),
+    ("Above ₹10 lakh", 1000001),
+    ("80,000", 80000),
+    ("15000 per month", 180000),
+    ("unknown", None),
+])
+def test_income_bands(band, income):
+    assert parse_income(band) == income
+
+
+def test_income_edit_changes_ranking():
+    before = _match(PROFILE)
+    after = _match(dict(PROFILE, income="Below ₹1 lakh"), previous=PROFILE)
+    assert before["profile"]["income"] == 500000
+    assert after["profile"]["income"] == 100000
+    assert after["changed_factors"] == ["income"]
+    assert [s["name"] for s in after["schemes"]] != [s["name"] for s in before["schemes"]]
+
+
+def test_diff_mode_matches_full_match():
+    edited = dict(PROFILE, state="Tamil Nadu", age="65 years")
+    diff = _match(edited, previous=PROFILE)
+    full = _match(edited)
+    assert diff["changed_factors"] == ["category", "age", "state"]
+    assert full["changed_factors"] is None
+    assert diff["schemes"] == full["schemes"]
+    assert diff["profile"] == full["profile"]
+
+
+def test_profile_is_normalized():
+    profile = _match({"occupation": "Labourer", "state": "Bihar", "age": "25 years", "income": "80,000"})["profile"]
+    assert profile == {"occupation": "worker", "income": 80000, "state": "bihar", "age": 25,
+                       "gender": None, "category": "worker"}
+
+
+@pytest.mark.parametrize("profile", [
+    {"occupation": "farmer", "age": [1]},
+    {"occupation": "farmer", "age": True},
+    {"occupation": "farmer", "age": 2.5},
+    {"occupation": "farmer", "income": {"amount": 1}},
+])
+def test_unusable_values_are_rejected(profile):
+    assert client.post("/api/match", json={"profile": profile}).status_code == 422
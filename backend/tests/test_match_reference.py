@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import random
+
+import pytest
+
+from app.services.catalog_registry import CatalogSnapshot
+from app.services.scheme_matching import FALLBACK_PATH, _read_fallback_schemes, match_schemes
+
+# Frozen rankings recorded with the original per-scheme loop in match_schemes. Regenerate
+# (python -m tests.test_match_reference, from backend/) only when the ranking rules change on purpose.
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "match_reference.json")
+
+# Rows the fallback catalog does not have: missing fields, None and 0 limits, "all" /
+# national states, empty or missing occupation and target lists, name-based type overrides
+EDGE_ROWS = [
+    {"name": "Bare Scheme"},
+    {"name": "No Limits", "income_limit": None, "min_age": None, "max_age": None, "states": ["all"],
+     "eligible_occupations": [], "target_groups": ["general"], "scheme_type": "general",
+     "benefit_summary": "Rs 1000 for everyone."},
+    {"name": "Zero Limits", "income_limit": 0, "min_age": 0, "max_age": 0, "states": ["All"],
+     "eligible_occupations": ["all"], "target_groups": ["farmer"], "scheme_type": "farmer_support"},
+    {"name": "Kerala Widow Pension", "states": ["Kerala"], "eligible_occupations": ["widow"],
+     "target_groups": ["women"], "scheme_type": "women_specific", "income_limit": 100000, "min_age": 18},
+    {"name": "National Students", "states": ["india"], "eligible_occupations": None, "target_groups": ["student"],
+     "scheme_type": "education", "max_age": 25},
+    {"name": "Untyped", "states": ["bihar", "kerala"], "target_groups": ["senior", "general"]},
+    {"name": "Crop Bima", "states": ["national"], "target_groups": [], "eligible_occupations": ["farmer"],
+     "scheme_type": "farmer_support"},
+    {"name": "Skill Training Mission", "states": None, "target_groups": ["worker", "student"],
+     "eligible_occupations": ["worker", "all"], "scheme_type": "training", "income_limit": 250000},
+]
+
+STATES = ["kerala", "bihar", "tamil nadu", "punjab", "goa", "uttar pradesh"]
+TARGET_GROUPS = ["general", "student", "farmer", "women", "senior", "business", "worker"]
+SCHEME_TYPES = ["education", "training", "farmer_support", "financial_support", "housing", "health",
+                "pension", "women_specific", "general", "employment", "business", "insurance"]
+OCCUPATIONS = ["all", "farmer", "student", "widow", "worker", "business", "senior", "labour"]
+
+
+def synthetic_rows(n: int = 400, seed: int = 7):
+    """A catalog whose rows draw every field, including missing and empty ones, at random."""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        row = {"name": f"Scheme {i}" + rnd.choice(["", "", " Bima", " Pension Yojana"])}
+        options = {
+            "states": [["all"], ["All India"], [rnd.choice(STATES).title()], rnd.sample(STATES, 2), [], None],
+            "target_groups": [rnd.sample(TARGET_GROUPS, rnd.randint(1, 2)), [], None],
+            "scheme_type": SCHEME_TYPES,
+            "eligible_occupations": [rnd.sample(OCCUPATIONS, rnd.randint(1, 3)), [], ["all"], None],
+            "income_limit": [None, 0, 50000, 100000, 250000, 800000],
+            "min_age": [None, 0, 18, 60],
+            "max_age": [None, 0, 35, 59],
+        }
+        for field, values in options.items():
+            # Each field is missing from about one row in eight
+            if rnd.random() >= 0.125:
+                row[field] = rnd.choice(values)
+        row["benefit_summary"] = rnd.choice(["Rs 5000 per year.", "Free training.", ""])
+        rows.append(row)
+    return EDGE_ROWS + rows
+
+
+def sample_profiles(count: int = 150, seed: int = 11):
+    rnd = random.Random(seed)
+    profiles = []
+    for _ in range(count):
+        profiles.append({
+            "occupation": rnd.choice(["farmer", "student", "widow", "worker", "unknown", None]),
+            "income": rnd.choice([None, "unknown", 0, 40000, 100000, 250001]),
+            "state": rnd.choice(STATES[:3] + ["Bihar", "unknown", None]),
+            "age": rnd.choice([None, 0, 17, 25, 45, 70]),
+            "gender": rnd.choice(["female", "male", None]),
+            "category": rnd.choice(TARGET_GROUPS),
+            "raw_query": rnd.choice(["", "looking for a job", "skill training please"]),
+        })
+    return profiles
+
+
+def catalog_rows(name: str):
+    return _read_fallback_schemes() + EDGE_ROWS if name == "fallback" else synthetic_rows()
+
+
+def summarize(matches):
+    """Compact, diffable form of one ranking plus a digest of the full response models."""
+    dumps = [m.model_dump() for m in matches]
+    return {
+        "ranking": [[d["name"], d["score"], d["confidence"], d["recommendation_level"], d["matched_factors"]]
+                    for d in dumps],
+        "digest": hashlib.sha256(json.dumps(dumps, sort_keys=True).encode("utf-8")).hexdigest()[:16],
+    }
+
+
+def write_reference(catalogs):
+    # One profile's ranking per line, so regenerated files diff line by line
+    with open(REFERENCE_PATH, "w", encoding="utf-8") as f:
+        f.write('{"fallback_digest": "%s", "catalogs": {\n' % _file_digest(FALLBACK_PATH))
+        f.write(",\n".join(
+            json.dumps(name) + ": [\n" + ",\n".join(json.dumps(entry) for entry in entries) + "\n]"
+            for name, entries in catalogs.items()
+        ))
+        f.write("\n}}\n")
+
+
+def _reference():
+    with open(REFERENCE_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def test_reference_covers_the_current_fallback_catalog():
+    assert _reference()["fallback_digest"] == _file_digest(FALLBACK_PATH), \
+        "data/fallback_schemes.json changed: regenerate tests/data/match_reference.json"
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids=["python", "numpy"])
+@pytest.mark.parametrize("name", ["fallback", "synthetic"])
+def test_rankings_match_the_frozen_reference(name, columnar):
+    expected = _reference()["catalogs"][name]
+    # Versions of their own, so neither engine is answered from the other's match cache
+    version = 30_000 + 2 * ["fallback", "synthetic"].index(name) + columnar
+    catalog = CatalogSnapshot(catalog_rows(name), version=version, source="test", columnar=columnar)
+    profiles = sample_profiles()
+    assert len(profiles) == len(expected)
+    for profile, reference in zip(profiles, expected):
+        assert summarize(match_schemes(dict(profile), catalog)) == reference, profile
+
+
+if __name__ == "__main__":
+    catalogs = {}
+    for version, catalog_name in enumerate(("fallback", "synthetic"), start=1):
+        snapshot = CatalogSnapshot(catalog_rows(catalog_name), version=version, source="reference")
+        catalogs[catalog_name] = [summarize(match_schemes(dict(p), snapshot)) for p in sample_profiles()]
+    write_reference(catalogs)
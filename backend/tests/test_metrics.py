@@ -0,0 +1,114 @@
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.core import metrics
+from app.services.scheme_matching import _read_fallback_schemes, catalog_registry, match_schemes
+
+client = TestClient(app)
+ROWS = _read_fallback_schemes()
+FARMER = {"occupation": "farmer", "state": "kerala", "income": 40000, "age": 45, "category": "farmer"}
+
+SAMPLE = re.compile(r'^(\w+)(?:\{(.*)\})? (\S+)$')
+
+
+@pytest.fixture(autouse=True)
+def fallback_catalog(monkeypatch):
+    """Serves the fallback rows, and puts the previously served snapshot back afterwards."""
+    monkeypatch.setattr(catalog_registry, "_snapshot", catalog_registry.current())
+    catalog_registry.install(ROWS, "fallback")
+
+
+def _scrape():
+    response = client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    samples, types = {}, {}
+    for line in response.text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            types[name] = kind
+            continue
+        if line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, line
+        samples[(match.group(1), match.group(2) or "")] = float(match.group(3))
+    return samples, types
+
+
+def test_metrics_exposition_is_well_formed():
+    assert client.post("/api/full-analysis", json={"query": "I am a farmer from Kerala"}).status_code == 200
+    samples, types = _scrape()
+    assert types["vaanisetu_stage_latency_seconds"] == "histogram"
+    assert types["vaanisetu_requests_by_language_total"] == "counter"
+    assert types["vaanisetu_cache_entries"] == "gauge"
+    for stage in metrics.STAGES:
+        buckets = [samples[("vaanisetu_stage_latency_seconds_bucket", f'stage="{stage}",le="{bound}"')]
+                   for bound in metrics.LATENCY_BUCKETS]
+        total = samples[("vaanisetu_stage_latency_seconds_bucket", f'stage="{stage}",le="+Inf"')]
+        assert buckets == sorted(buckets) and buckets[-1] <= total
+        assert samples[("vaanisetu_stage_latency_seconds_count", f'stage="{stage}"')] == total
+    assert samples[("vaanisetu_catalog_schemes", "")] == len(ROWS)
+    assert samples[("vaanisetu_catalog_version", "")] == catalog_registry.current().version
+
+
+def test_request_counters_follow_the_requests():
+    before, _ = _scrape()
+    for language in ("hi", "hi", "xx"):
+        client.post("/api/full-analysis", json={"query": "I am a student from Goa", "language": language})
+    after, _ = _scrape()
+
+    def delta(label):
+        key = ("vaanisetu_requests_by_language_total", f'language="{label}"')
+        return after[key] - before.get(key, 0)
+
+    # Unknown languages are folded into "other" instead of adding a series
+    assert (delta("hi"), delta("other"), delta("en")) == (2, 1, 0)
+    assert ("vaanisetu_requests_by_language_total", 'language="xx"') not in after
+
+
+def test_counter_keeps_allowed_labels_and_folds_the_rest():
+    counter = metrics.Counter(allowed=("en", "hi"))
+    for label in ("en", "en", "bn", "hi", "fr"):
+        counter.inc(label)
+    assert counter.snapshot() == {"en": 2, "hi": 1, "other": 2}
+    open_counter = metrics.Counter()
+    for label in ("a", "b", "a"):
+        open_counter.inc(label)
+    assert open_counter.snapshot() == {"a": 2, "b": 1}
+
+
+def test_histogram_buckets_by_upper_bound():
+    histogram = metrics.Histogram(buckets=(0.1, 1.0))
+    for seconds in (0.05, 0.1, 0.5, 1.0, 3.0):
+        histogram.observe(seconds)
+    counts, total = histogram.snapshot()
+    assert counts == [2, 2, 1]
+    assert total == pytest.approx(4.65)
+
+
+def test_catalog_swap_invalidates_the_match_cache():
+    names = [m.name for m in match_schemes(dict(FARMER))]
+    assert names
+    assert client.get("/api/health").json()["match_cache"]["size"] > 0
+
+    catalog_registry.install([row for row in ROWS if row["name"] != names[0]], "supabase")
+    assert client.get("/api/health").json()["match_cache"]["size"] == 0
+    assert names[0] not in [m.name for m in match_schemes(dict(FARMER))]
+
+
+def test_health_reports_cache_hits_and_misses():
+    # A version of its own, so no earlier test has cached this profile
+    catalog_registry.install(ROWS[:-1], "supabase")
+    before = client.get("/api/health").json()
+    for _ in range(3):
+        match_schemes(dict(FARMER))
+    after = client.get("/api/health").json()
+    assert after["match_cache"]["misses"] - before["match_cache"]["misses"] == 1
+    assert after["match_cache"]["hits"] - before["match_cache"]["hits"] == 2
+    assert after["catalog"]["version"] == catalog_registry.current().version
+    assert after["catalog"]["schemes"] == len(ROWS) - 1
+    assert after["cache_loaded"] is True
@@ -0,0 +1,70 @@
+import pytest
+
+from app.services.profile_extraction import FILLER_RE, extract_profile
+from app.services.query_scanner import canonical_query
+
+
+def _profile(query):
+    profile = extract_profile(query, spoken_numbers=False)
+    profile.pop("raw_query")
+    return profile
+
+
+@pytest.mark.parametrize("query", [
+    "I am a farmer from Punjab",
+    "I am a farmer from Punjab.",
+    "I AM A FARMER FROM PUNJAB!!!",
+    "i am a FARMER, from punjab!!",
+    "um, I am, uh, a farmer from Punjab",
+    "I am a farmer from Punjab, please",
+    "  I am a   farmer from\tPunjab  ",
+])
+def test_variants_share_one_canonical_text(query):
+    assert canonical_query(query, FILLER_RE) == "i am a farmer from punjab"
+    assert _profile(query) == {"occupation": "farmer", "income": "unknown", "state": "punjab", "age": None,
+                               "gender": None, "category": "farmer"}
+
+
+def test_canonical_text_keeps_digit_separators_and_lines():
+    assert canonical_query("Income: 2,00,000/-\nAge 2.5?", FILLER_RE) == "income 2,00,000\nage 2.5"
+
+
+# Behaviour that changed when extraction started reading the canonical text
+# (before -> after), pinned so later changes to canonical_query are deliberate.
+@pytest.mark.parametrize("query, field, value", [
+    # Hyphens split words, so hyphenated states match (was "unknown")
+    ("Andhra-Pradesh farmer", "state", "andhra pradesh"),
+    ("Widow from West-Bengal", "state", "west bengal"),
+    ("Student; age: 19; Tamil-Nadu", "state", "tamil nadu"),
+    # ... and hyphenated ages parse (was None)
+    ("I am 25-years-old unemployed", "age", 25),
+    # A comma before a marker now counts as a word boundary (was None)
+    ("Farmer,man from Bihar", "gender", "male"),
+    # A gender marker at the very start counts as a word of its own (was None)
+    ("man from bihar", "gender", "male"),
+    ("Woman farmer from Kerala", "gender", "female"),
+    # "age" after a comma is a word of its own and marks a senior (was "unknown")
+    ("0,age", "occupation", "senior"),
+])
+def test_canonicalization_changes(query, field, value):
+    assert _profile(query)[field] == value
+
+
+@pytest.mark.parametrize("query, field, value", [
+    ("I live in Goa, need help", "state", "goa"),
+    ("farmer from Delhi!", "state", "delhi"),
+    ("Tailor from Kerala (age 32 years old)", "age", 32),
+    ("age: 30, farmer", "age", 30),
+    ("my income 50,000, farmer from kerala", "income", 50000),
+    ("income 15000/month", "income", 15000),
+    ("I am a man from bihar", "gender", "male"),
+    (" man from bihar", "gender", "male"),
+    (" woman from kerala", "gender", "female"),
+    # Stripping a leading filler must not cost the marker its leading space
+    ("um woman farmer from kerala", "gender", "female"),
+    ("Haan ji, man from bihar", "gender", "male"),
+    ("please woman from kerala", "gender", "female"),
+    ("Uh, man from bihar", "gender", "male"),
+])
+def test_unchanged_by_canonicalization(query, field, value):
+    assert _profile(query)[field] == value
@@ -0,0 +1,86 @@
+import random
+import re
+
+import pytest
+
+from app.services.profile_extraction import STATE_KEYWORDS, _exact_state
+from app.services.query_scanner import FEMALE_MARKERS, MALE_MARKERS, QueryFeatures
+
+
+def legacy_features(query):
+    """The regex and substring passes extract_profile ran before QueryFeatures."""
+    query_lower = query.lower()
+    query_clean = re.sub(r'[^\w\s]', '', query_lower).strip()
+    state = None
+    for s in STATE_KEYWORDS:
+        if s == query_clean or f" {s} " in f" {query_clean} ":
+            state = s
+            break
+    income = re.search(r'income.*?(\d{1,2}(?:,\d{3})+|\d+k|\d{2,})', query_lower)
+    if not income:
+        income = re.search(r'(\d{1,2}(?:,\d{3})+|\d+k|\d{2,}).*?income', query_lower)
+    age = re.search(r'(\d{1,3})\s*years?\s*old', query_lower)
+    if not age:
+        age = re.search(r'age.*?\b(\d{1,3})\b', query_lower)
+    female = any(w in query_lower for w in [" woman", "female", "girl", "widow", "lady", "aurat"])
+    male = any(w in query_lower for w in [" man", "male", "boy", "aadmi"])
+    return state, income and income.group(1), age and age.group(1), female, male
+
+
+def scanner_features(query):
+    features = QueryFeatures(query)
+    income = features.find_income()
+    return (_exact_state(features), income and features.text[income[0]:income[1]], features.find_age(),
+            features.has_any(FEMALE_MARKERS), features.has_any(MALE_MARKERS))
+
+
+TOKENS = [
+    "income", "Income", "INCOME", "age", "aged", "years", "year", "old", "yearsold", "Years Old",
+    # Numbers: lone digits, runs, digit grouping, k suffixes
+    "0", "5", "12", "60", "123", "1234", "999999", "2,00,000", "50,000", "1,2", "12,34", "1,000,", ",000",
+    "50k", "5K", "k", "2.5", "x1", "a5", "5a", "7_", "_7",
+    # Non-ASCII digits: Arabic-Indic and Devanagari are \d, superscripts are not
+    "٣٤", "१२३", "२५", "²", "5²",
+    # Separators and irregular spacing
+    ",", ".", "-", "_", "!", "(", ")", ":", "/", "\n", "\r\n", "\t", "  ", " \n ",
+    # States and markers, with odd spacing and punctuation
+    "tamil nadu", "Tamil  Nadu", "tamil\tnadu", "tamil\nnadu", "kerala,", "uttar pradesh", "west-bengal",
+    "delhi!", "goa", "andhra", "pradesh", "jammu and kashmir",
+    "woman", "man", "girl", "male", "lady", "boy", "aadmi", "widow",
+    "i am", "my", "is", "per", "month", "rs", "₹", "farmer", "student",
+]
+SEPARATORS = ["", " ", " ", " ", "\n", ",", "  ", "\t"]
+
+
+def _fuzzed_queries(seed, count):
+    rnd = random.Random(seed)
+    for _ in range(count):
+        size = rnd.randint(0, 14)
+        yield "".join(rnd.choice(TOKENS) + rnd.choice(SEPARATORS) for _ in range(size))
+
+
+@pytest.mark.parametrize("query", [
+    "",
+    "I am a farmer from Tamil Nadu, my income is 50,000",
+    "income\n50000",
+    "my income is 1,2,000 and age 12,345",
+    "50k income",
+    "income of 2,00,000 and 5K",
+    "age ٣٤ years",
+    "I am ٣٤ years old",
+    "age: १२३",
+    "age 5² and 60",
+    "25 years  \n old",
+    "aged 1234 but 12 years old",
+    "a woman from west bengal",
+    "tamil  nadu",
+    "income 7 \n income 88",
+])
+def test_matches_legacy_regexes(query):
+    assert scanner_features(query) == legacy_features(query)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_legacy_regexes_on_fuzzed_queries(seed):
+    for query in _fuzzed_queries(seed, 2000):
+        assert scanner_features(query) == legacy_features(query), repr(query)
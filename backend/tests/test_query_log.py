@@ -0,0 +1,164 @@
+import json
+import threading
+import time
+
+from app.db.query_log import QueryLogWriter
+from app.db.spool import QuerySpool
+
+
+class _SlowClient:
+    """Writes block until `release` is set, then fail."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def table(self, name):
+        return self
+
+    def insert(self, rows):
+        return self
+
+    upsert = insert
+
+    def execute(self):
+        self.release.wait()
+        raise ConnectionError("database unavailable")
+
+
+class _RecordingClient:
+    """Records (table, rows) for every bulk write; fails while `down` is set."""
+
+    def __init__(self, down=False):
+        self.writes = []
+        self.down = down
+        self._table = None
+
+    def table(self, name):
+        self._table = name
+        return self
+
+    def upsert(self, rows):
+        self._rows = rows
+        return self
+
+    insert = upsert
+
+    def execute(self):
+        if self.down:
+            raise ConnectionError("database unavailable")
+        self.writes.append((self._table, [row["id"] for row in self._rows]))
+        return self
+
+
+def _writer(tmp_path, client, flush_size=1, flush_interval=0.01, spool=True, max_queue=10):
+    return QueryLogWriter(client, flush_size=flush_size, flush_interval=flush_interval, max_queue=max_queue,
+                          spool=QuerySpool(str(tmp_path)) if spool else None, replay_interval=60)
+
+
+def _spooled_ids(tmp_path):
+    return [q["id"] for path in sorted(tmp_path.glob("segment-*")) for line in path.read_text().splitlines()
+            for q in json.loads(line)["user_queries"]]
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+def test_rows_are_on_disk_before_enqueue_returns(tmp_path):
+    writer = _writer(tmp_path, None)  # Worker never started
+    assert writer.enqueue({"id": 1}, [{"id": 10, "query_id": 1}])
+    assert writer.enqueue_many([{"id": 2}, {"id": 3}], [])
+    assert _spooled_ids(tmp_path) == [1, 2, 3]
+    assert writer.stats()["queue_depth"] == 3
+
+    # The process dies without stopping the writer: its segment is recovered and replayed
+    writer.spool._file.close()
+    spool = QuerySpool(str(tmp_path))
+    spool.recover()
+    client = _RecordingClient()
+    assert spool.replay(client) == 3
+    assert client.writes == [("user_queries", [1, 2, 3]), ("analysis_results", [10])]
+    assert list(tmp_path.glob("segment-*")) == []
+
+
+def test_a_batch_is_uploaded_with_one_upsert_per_table(tmp_path):
+    client = _RecordingClient()
+    writer = _writer(tmp_path, client, flush_size=3, flush_interval=60)
+    writer.start()
+    writer.enqueue({"id": 1}, [{"id": 10}])
+    writer.enqueue_many([{"id": 2}, {"id": 3}], [{"id": 20}, {"id": 30}])
+    assert _wait_for(lambda: writer.stats()["written"] == 3)
+    assert client.writes == [("user_queries", [1, 2, 3]), ("analysis_results", [10, 20, 30])]
+    assert list(tmp_path.glob("segment-*")) == []
+    writer.stop()
+
+
+def test_flush_interval_closes_a_partial_batch(tmp_path):
+    client = _RecordingClient()
+    writer = _writer(tmp_path, client, flush_size=100, flush_interval=0.05)
+    writer.start()
+    writer.enqueue({"id": 1}, [])
+    assert _wait_for(lambda: writer.stats()["written"] == 1)
+    writer.stop()
+    assert client.writes == [("user_queries", [1])]
+
+
+def test_segments_are_kept_until_supabase_accepts_them(tmp_path):
+    client = _RecordingClient(down=True)
+    writer = _writer(tmp_path, client)
+    writer.start()
+    writer.enqueue({"id": 1}, [])
+    writer.enqueue({"id": 2}, [])
+    writer.stop()
+    assert writer.stats()["written"] == 0
+    assert writer.spool.stats()["replay_failures"] >= 1
+    assert _spooled_ids(tmp_path) == [1, 2]
+    assert writer.spool.pending_segments()
+
+    # Next start, with the database back: leftovers are uploaded and only then deleted
+    client.down = False
+    restarted = _writer(tmp_path, client)
+    restarted.start()
+    assert _wait_for(lambda: restarted.stats()["written"] == 2)
+    restarted.stop()
+    assert sorted(i for _, ids in client.writes for i in ids) == [1, 2]
+    assert list(tmp_path.glob("segment-*")) == []
+
+
+def test_stop_does_not_block_on_a_full_queue(tmp_path):
+    client = _SlowClient()
+    writer = _writer(tmp_path, client, spool=False, max_queue=1)
+    writer.start()
+    writer.enqueue({"id": 1}, [])
+    time.sleep(0.05)  # The worker is now stuck in the insert
+    assert writer.enqueue({"id": 2}, [])
+    assert not writer.enqueue({"id": 3}, [])  # Dropped: no spool to overflow to
+    assert writer.stats()["dropped"] == 1
+
+    started = time.monotonic()
+    writer.stop(timeout=0.1)
+    assert time.monotonic() - started < 1
+    client.release.set()
+
+
+def test_spool_is_sealed_only_after_the_worker_exits(tmp_path):
+    client = _SlowClient()
+    writer = _writer(tmp_path, client)
+    writer.start()
+    writer.enqueue({"id": 1}, [])
+    time.sleep(0.05)  # The worker is now stuck uploading the first batch
+    writer.enqueue({"id": 2}, [])
+
+    writer.stop(timeout=0.05)
+    assert writer.stats()["running"]
+    assert len(list(tmp_path.glob("*.active"))) == 1
+
+    client.release.set()
+    writer.stop(timeout=5)
+    assert not writer.stats()["running"]
+    assert not list(tmp_path.glob("*.active"))
+    assert len(writer.spool.pending_segments()) == 2
+    assert writer.spool.spooled == 2
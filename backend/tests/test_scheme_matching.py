@@ -0,0 +1,25 @@
+from types import SimpleNamespace
+
+from app.services import scheme_matching
+from app.services.catalog import SchemeIndex, compile_schemes
+from app.services.scheme_matching import _read_fallback_schemes
+
+PROFILE = {"occupation": "farmer", "income": 50000, "state": "kerala", "age": 40, "gender": "male",
+           "category": "farmer", "raw_query": "farmer from kerala"}
+
+
+def _ranked(index):
+    return [(m.name, m.score) for m in scheme_matching._rank_schemes(SimpleNamespace(index=index, columnar=None), PROFILE)]
+
+
+def test_factor_columns_are_not_shared_between_indexes_of_one_version():
+    rows = _read_fallback_schemes()
+    # Same version, different candidate lists for the same profile
+    forward = SchemeIndex(compile_schemes(rows), version=7)
+    backward = SchemeIndex(compile_schemes(rows[::-1]), version=7)
+    scheme_matching._FACTOR_CACHE.clear()
+    expected_backward = _ranked(backward)
+    scheme_matching._FACTOR_CACHE.clear()
+    expected_forward = _ranked(forward)
+    assert _ranked(backward) == expected_backward
+    assert _ranked(forward) == expected_forward
@@ -0,0 +1,65 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+from app.services.scheme_matching import _read_fallback_schemes, catalog_registry
+
+client = TestClient(app)
+ROWS = _read_fallback_schemes()
+
+
+@pytest.fixture(autouse=True)
+def fallback_catalog(monkeypatch):
+    """Serves the fallback rows, and puts the previously served snapshot back afterwards."""
+    monkeypatch.setattr(catalog_registry, "_snapshot", catalog_registry.current())
+    catalog_registry.install(ROWS, "fallback")
+
+
+def test_matching_etag_gets_an_empty_304():
+    first = client.get("/api/schemes")
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and len(first.json()) == len(ROWS)
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        cached = client.get("/api/schemes", headers={"If-None-Match": if_none_match})
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["etag"] == etag
+    assert client.get("/api/schemes", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_etag_changes_after_a_catalog_swap():
+    etag = client.get("/api/schemes").headers["etag"]
+    catalog_registry.install(ROWS[:-1], "supabase")
+    swapped = client.get("/api/schemes", headers={"If-None-Match": etag})
+    assert swapped.status_code == 200
+    assert swapped.headers["etag"] != etag
+    assert len(swapped.json()) == len(ROWS) - 1
+    # Same content again: the ETag comes back
+    catalog_registry.install(ROWS, "supabase")
+    assert client.get("/api/schemes").headers["etag"] == etag
+
+
+@pytest.mark.parametrize("limit", [1, 7, len(ROWS), 500])
+def test_cursor_pages_cover_the_listing_without_gaps_or_duplicates(limit):
+    listing = [row["id"] for row in client.get("/api/schemes").json()]
+    assert listing == sorted(listing)
+    seen = []
+    params = {"limit": limit, "fields": "name"}
+    while True:
+        page = client.get("/api/schemes", params=params)
+        assert page.status_code == 200
+        assert all(set(row) == {"id", "name"} for row in page.json())
+        seen += [row["id"] for row in page.json()]
+        cursor = page.headers.get("x-next-cursor")
+        if cursor is None:
+            assert "link" not in page.headers
+            break
+        assert f"cursor={cursor}" in page.headers["link"] and "fields=name" in page.headers["link"]
+        params["cursor"] = cursor
+    assert seen == listing
+
+
+def test_unknown_field_is_rejected():
+    response = client.get("/api/schemes", params={"fields": "name,colour"})
+    assert response.status_code == 400
+    assert "colour" in response.json()["detail"]
@@ -0,0 +1,82 @@
+import pytest
+
+from app.services.profile_extraction import extract_profile
+from app.services.spoken_numbers import income_multiplier, normalize_numbers
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("fifty thousand", "50000"),
+    ("2 lakh", "200000"),
+    ("2.5 lakh", "250000"),
+    ("pachas hazaar", "50000"),
+    ("dedh lakh", "150000"),
+    ("saade teen lakh", "350000"),
+    ("one lakh and fifty thousand", "150000"),
+    ("one lakh twenty thousand", "120000"),
+    ("five hundred thousand", "500000"),
+    ("ek sau bees", "120"),
+    ("aimbathu aayiram", "50000"),
+    ("yabhai veyyilu", "50000"),
+    ("padi velu", "10000"),
+    ("rendu kodi", "20000000"),
+    ("sixty five years old", "65 years old"),
+    ("2,00,000", "200000"),
+    # A doubled "and" ends the number
+    ("one lakh and and fifty", "100000 and and 50"),
+])
+def test_numbers_are_rewritten(text, expected):
+    assert normalize_numbers(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    # Scale and hundred words need a number before them
+    "my name is velu and my income is low",
+    "koti reddy from andhra, income unknown",
+    "kodi farm income",
+    "income sau percent nahi pata",
+    "thousand",
+    "lakh",
+    # Everyday words and names that are also number words
+    "padi income",
+    "mere saath do bachche hain",
+    "what can i do",
+    "tera naam kya hai",
+    # Lone digits
+    "5 people",
+])
+def test_words_are_left_alone(text):
+    assert normalize_numbers(text) == text
+
+
+@pytest.mark.parametrize("query", [
+    "my name is velu and my income is low",
+    "koti reddy from andhra, income unknown",
+    "kodi farm income",
+    "padi income",
+    "income sau percent nahi pata",
+])
+def test_names_and_words_are_not_incomes(query):
+    assert extract_profile(query, spoken_numbers=True)["income"] == "unknown"
+
+
+@pytest.mark.parametrize("query, income", [
+    ("I am a farmer from Tamil Nadu, my income is fifty thousand", 50000),
+    ("main kisan hoon, income pachas hazaar hai", 50000),
+    ("widow from Rajasthan, monthly income is eight thousand rupees", 96000),
+    ("I earn fifteen thousand per month, income from tailoring", 180000),
+    ("income bees hazaar mahine ka", 240000),
+    ("my income is 2 lakh per year", 200000),
+    ("my family income is 2,00,000", 200000),
+    ("income: 15000/month", 180000),
+    # The rent is monthly, the income is not
+    ("my income is 15000, i pay rent 2000 per month", 15000),
+])
+def test_incomes(query, income):
+    assert extract_profile(query, spoken_numbers=True)["income"] == income
+
+
+def test_monthly_needs_period_word_near_the_number():
+    text = "income 15000 per month"
+    assert income_multiplier(text, 7, 12) == 12
+    text = "income 15000 per year but rent per month"
+    assert income_multiplier(text, 7, 12) == 1
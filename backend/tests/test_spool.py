@@ -0,0 +1,44 @@
+import os
+
+from app.db.spool import QuerySpool
+
+
+class _Table:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def upsert(self, rows):
+        self.rows.extend(rows)
+        return self
+
+    def execute(self):
+        return None
+
+
+class _Client:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        return _Table(self.rows)
+
+
+def test_recovers_segment_named_after_a_reused_pid(tmp_path):
+    # After a restart the dead writer's PID is often ours again
+    path = tmp_path / f"segment-123-{os.getpid()}.active"
+    path.write_text('{"user_queries": [{"id": 1}], "analysis_results": []}\n')
+    spool = QuerySpool(str(tmp_path))
+    spool.recover()
+    assert spool.pending_segments() == [str(tmp_path / f"segment-123-{os.getpid()}.jsonl")]
+    assert spool.replay(_Client()) == 1
+
+
+def test_keeps_segments_a_live_spool_is_writing(tmp_path):
+    writer = QuerySpool(str(tmp_path))
+    writer.append([{"id": 1}], [])
+    QuerySpool(str(tmp_path)).recover()
+    assert writer.pending_segments() == []
+    writer.append([{"id": 2}], [])
+    client = _Client()
+    assert writer.replay(client) == 2
+    assert client.rows == [{"id": 1}, {"id": 2}]
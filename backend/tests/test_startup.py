@@ -0,0 +1,18 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+
+def _boom():
+    raise RuntimeError("disk unreadable")
+
+
+@pytest.mark.parametrize("local_snapshot", [lambda: True, lambda: False, _boom], ids=["snapshot", "no-snapshot", "raises"])
+def test_catalog_refresh_starts_on_every_startup_path(monkeypatch, local_snapshot):
+    started = []
+    monkeypatch.setattr(main, "load_local_snapshot", local_snapshot)
+    monkeypatch.setattr(main, "load_schemes_cache", lambda: None)
+    monkeypatch.setattr(main, "start_catalog_refresh", lambda: started.append(True))
+    with TestClient(main.app):
+        assert started == [True]